@@ -0,0 +1,165 @@
+"""
+의미 기반 답변 캐시
+
+표현만 다른 같은 질문("수강신청 언제야?" / "수강신청 기간 알려줘")에 대해
+검색과 LLM 호출을 다시 하지 않도록, 질문 임베딩의 코사인 유사도가
+임계값 이상인 이전 답변을 재사용합니다.
+임베딩 유사도로는 숫자만 다른 질문("1학기"/"2학기", 학년도, 금액)을 구분하지 못하므로
+질문에 들어 있는 숫자가 모두 같을 때만 적중으로 봅니다 (chunk_dedup과 같은 규칙).
+LRU + TTL로 항목을 정리하며, 벡터 DB가 바뀌면 clear()로 전체 무효화합니다.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+_NUMBERS = re.compile(r'\d+')
+
+
+class SemanticAnswerCache:
+    """질문 임베딩 유사도 기반 LRU + TTL 답변 캐시"""
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 3600,
+                 threshold: float = 0.92):
+        """
+        초기화
+
+        Args:
+            max_entries: 최대 캐시 항목 수 (초과 시 가장 오래 사용하지 않은 항목 삭제)
+            ttl_seconds: 항목 유효 시간 (초)
+            threshold: 캐시 적중으로 볼 최소 코사인 유사도
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._lock = threading.Lock()
+        # 슬롯 번호 → (만료 시각, 원본 질문, 질문의 숫자, 값), 순서가 LRU 순서
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._free_slots = list(range(max_entries - 1, -1, -1))
+        self._vectors: Optional[np.ndarray] = None  # (max_entries, dim) 정규화 벡터
+        self._active = np.zeros(max_entries, dtype=bool)
+
+    @staticmethod
+    def _normalize(vector: List[float]) -> np.ndarray:
+        """단위 벡터로 정규화"""
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm > 0 else array
+
+    def _remove(self, slot: int) -> None:
+        """슬롯 비우기 (락을 잡은 상태에서 호출)"""
+        del self._entries[slot]
+        self._active[slot] = False
+        self._free_slots.append(slot)
+
+    def _purge_expired(self, now: float) -> None:
+        """만료된 항목 삭제 (락을 잡은 상태에서 호출)"""
+        expired = [slot for slot, (expires_at, _, _, _) in self._entries.items()
+                   if expires_at <= now]
+        for slot in expired:
+            self._remove(slot)
+        self.expirations += len(expired)
+
+    def get(self, vector: List[float], question: str) -> Optional[Any]:
+        """
+        유사한 질문의 캐시된 값 조회
+
+        유사도가 임계값 이상인 항목 중 질문의 숫자가 같은 가장 유사한 항목을 사용합니다.
+
+        Args:
+            vector: 질문 임베딩
+            question: 원본 질문 (숫자 비교용)
+
+        Returns:
+            캐시된 값, 없으면 None
+        """
+        query = self._normalize(vector)
+        numbers = _NUMBERS.findall(question)
+
+        with self._lock:
+            self._purge_expired(time.time())
+
+            if not self._entries:
+                self.misses += 1
+                return None
+
+            similarities = self._vectors @ query
+            similarities[~self._active] = -np.inf
+            candidates = np.flatnonzero(similarities >= self.threshold)
+
+            for slot in candidates[np.argsort(-similarities[candidates])]:
+                slot = int(slot)
+                if self._entries[slot][2] == numbers:
+                    self._entries.move_to_end(slot)
+                    self.hits += 1
+                    return self._entries[slot][3]
+
+            self.misses += 1
+            return None
+
+    def put(self, vector: List[float], question: str, value: Any) -> None:
+        """
+        질문과 값 저장
+
+        Args:
+            vector: 질문 임베딩
+            question: 원본 질문 (숫자 비교용)
+            value: 저장할 값
+        """
+        if self.max_entries <= 0:
+            return
+
+        normalized = self._normalize(vector)
+
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, normalized.shape[0]),
+                                         dtype=np.float32)
+
+            if not self._free_slots:
+                self._purge_expired(time.time())
+            if not self._free_slots:
+                lru_slot = next(iter(self._entries))
+                self._remove(lru_slot)
+                self.evictions += 1
+
+            slot = self._free_slots.pop()
+            self._vectors[slot] = normalized
+            self._active[slot] = True
+            self._entries[slot] = (time.time() + self.ttl_seconds, question,
+                                   _NUMBERS.findall(question), value)
+
+    def clear(self) -> None:
+        """전체 무효화 (벡터 DB가 바뀌었을 때 호출)"""
+        with self._lock:
+            self._entries.clear()
+            self._active[:] = False
+            self._free_slots = list(range(self.max_entries - 1, -1, -1))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        캐시 통계
+
+        Returns:
+            hits, misses, hit_rate, evictions, expirations, entries
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'entries': len(self._entries),
+            }
@@ -0,0 +1,126 @@
+"""
+IVF 근사 검색 recall / 지연 스윕
+
+군집 구조가 있는 합성 임베딩(기본 100만 청크)으로 ivf 백엔드를 만든 뒤
+nlist(빌드 파라미터) × nprobe(검색 파라미터) 조합별로
+정확 검색(flat) 대비 recall@k와 질의 지연을 측정합니다. GPU 없이 CPU만 사용합니다.
+
+100만 × 384차원 float32 행렬은 약 1.5GB이며, 생성 중에는 그 두 배 정도의 메모리가 필요합니다.
+실제 임베딩 차원(1536)으로 돌리려면 --dim 1536 (약 12GB 필요).
+
+사용 예 (backend 디렉토리에서):
+    python benchmarks/bench_ann_sweep.py --chunks 1000000 --dim 384 \\
+        --nlist 1000,4000 --nprobe 1,4,8,16,32,64
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_vector_backends import NoEmbeddings
+from vector_backends import open_vectorstore
+
+
+def make_corpus(rng: np.random.Generator, n_chunks: int, dim: int,
+                n_topics: int, block_rows: int = 100_000) -> np.ndarray:
+    """주제 중심 + 잡음으로 만든 정규화 벡터 (실제 문서 임베딩처럼 군집을 이룸)"""
+    centers = rng.standard_normal((n_topics, dim), dtype=np.float32)
+    centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+    vectors = np.empty((n_chunks, dim), dtype=np.float32)
+    for start in range(0, n_chunks, block_rows):
+        n = min(block_rows, n_chunks - start)
+        block = centers[rng.integers(0, n_topics, n)] + \
+            rng.standard_normal((n, dim), dtype=np.float32) * (1.0 / np.sqrt(dim))
+        vectors[start:start + n] = block / np.linalg.norm(block, axis=1, keepdims=True)
+    return vectors
+
+
+def fill(path: str, vectors: np.ndarray, precision: str, batch_size: int = 50_000) -> float:
+    """ivf 벡터스토어 생성 시간 측정 (기본 nlist로 색인 저장)"""
+    start = time.perf_counter()
+    store = open_vectorstore("ivf", path, NoEmbeddings(), precision)
+    for i in range(0, len(vectors), batch_size):
+        ids = [f"chunk-{j}" for j in range(i, min(i + batch_size, len(vectors)))]
+        store.upsert_embeddings(ids=ids, embeddings=vectors[i:i + batch_size],
+                                metadatas=[{} for _ in ids], documents=ids)
+    store.persist()
+    return time.perf_counter() - start
+
+
+def search_rows(store, queries: np.ndarray, k: int):
+    """질의별 결과 행 번호와 지연(ms, 정렬됨)"""
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        hits = store.search_vector(query, k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append([row for row, _ in hits])
+    return sorted(latencies), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IVF recall/지연 스윕")
+    parser.add_argument('--chunks', type=int, default=1_000_000)
+    parser.add_argument('--dim', type=int, default=384)
+    parser.add_argument('--topics', type=int, default=5000, help="합성 코퍼스의 주제(군집) 수")
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--precision', default="float32", choices=["float32", "float16", "int8"])
+    parser.add_argument('--nlist', default="auto",
+                        help="쉼표로 구분한 nlist 값들 (auto = 약 4 * sqrt(N))")
+    parser.add_argument('--nprobe', default="1,2,4,8,16,32,64")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    vectors = make_corpus(rng, args.chunks, args.dim, args.topics)
+    queries = vectors[rng.choice(args.chunks, args.queries)] + \
+        (0.5 / np.sqrt(args.dim)) * rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+    print(f"🧪 청크 {args.chunks:,}개 × {args.dim}차원 (주제 {args.topics}개), "
+          f"질의 {args.queries}개, k={args.k}, {args.precision} "
+          f"- 코퍼스 생성 {time.perf_counter() - start:.1f}s")
+
+    workdir = tempfile.mkdtemp(prefix="bench_ann_sweep_")
+    try:
+        print(f"  저장 (기본 nlist 색인 포함): {fill(workdir, vectors, args.precision):.1f}s")
+        del vectors
+
+        exact_store = open_vectorstore("flat", workdir, NoEmbeddings(), args.precision)
+        exact_store.rescore_factor = args.chunks  # 압축 정밀도에서도 정확 검색 기준
+        exact_latencies, exact = search_rows(exact_store, queries, args.k)
+        print(f"  전수 검색 | p50 {exact_latencies[len(exact_latencies) // 2]:7.2f}ms "
+              f"p99 {exact_latencies[int(len(exact_latencies) * 0.99)]:7.2f}ms")
+
+        nlists = [None if n == "auto" else int(n) for n in args.nlist.split(',')]
+        for nlist in nlists:
+            start = time.perf_counter()
+            store = open_vectorstore("ivf", workdir, NoEmbeddings(), args.precision,
+                                     {'nlist': nlist})
+            build_time = time.perf_counter() - start
+            sizes = np.diff(store._ivf.list_offsets)
+            print(f"  nlist {store._ivf.nlist:6d} | 로드/빌드 {build_time:6.1f}s | "
+                  f"리스트 크기 평균 {sizes.mean():.0f} 최대 {sizes.max()}")
+
+            for nprobe in [int(n) for n in args.nprobe.split(',')]:
+                store.nprobe = nprobe
+                latencies, results = search_rows(store, queries, args.k)
+                recall = np.mean([len(set(a) & set(b)) / args.k
+                                  for a, b in zip(results, exact)])
+                print(f"    nprobe {nprobe:4d} | recall@{args.k} {recall:.3f} | "
+                      f"p50 {latencies[len(latencies) // 2]:7.2f}ms "
+                      f"p99 {latencies[int(len(latencies) * 0.99)]:7.2f}ms | "
+                      f"조회 비율 {min(1.0, nprobe / store._ivf.nlist) * 100:5.1f}%")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
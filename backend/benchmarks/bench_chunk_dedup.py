@@ -0,0 +1,73 @@
+"""
+보일러플레이트 청크 중복 제거 벤치마크
+
+메뉴/푸터 문구가 섞인 합성 크롤링 페이지를 청크로 나눈 뒤 MinHash + LSH 중복 제거의
+처리 시간, 합쳐진 청크 수, 절약한 임베딩 토큰 수를 측정합니다.
+같은 본문이지만 숫자(학년도, 날짜)만 다른 공지가 합쳐지지 않는지도 확인합니다.
+
+사용 예 (backend 디렉토리에서):
+    python benchmarks/bench_chunk_dedup.py --pages 5000
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain.schema import Document
+
+from bench_chunker import make_document
+from chunk_dedup import ChunkDeduplicator, print_dedup_report
+from korean_chunker import KoreanSentenceChunker
+
+MENU = ("대학소개 총장실 대학현황 입학안내 수시모집 정시모집 편입학 학사안내 학사일정 수강신청 "
+        "성적 졸업 장학안내 교내장학 국가장학 대학생활 기숙사 학생식당 동아리 도서관 커뮤니티 "
+        "공지사항 학사공지 장학공지 자유게시판 ")
+FOOTER = ("동양대학교 경북 영주시 풍기읍 동양대로 145 (36040) 대표전화 054-630-1114 "
+          "팩스 054-630-1009 개인정보처리방침 이메일무단수집거부 찾아오시는 길 "
+          "Copyright DONGYANG UNIVERSITY All rights reserved. ")
+
+
+def make_page(rng: random.Random, i: int) -> str:
+    """메뉴 + 본문 + 푸터 (clean_html처럼 공백 압축, 메뉴는 가끔 한 항목씩 다름)"""
+    menu = MENU * 4
+    if rng.random() < 0.3:
+        menu = menu.replace("동아리 ", "")
+    return re.sub(r'\s+', ' ', f"{menu} {make_document(rng, i)} {FOOTER * 4}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="보일러플레이트 청크 중복 제거 벤치마크")
+    parser.add_argument('--pages', type=int, default=5000)
+    parser.add_argument('--threshold', type=float, default=0.9)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    pages = [Document(page_content=make_page(rng, i), metadata={'source': f"page{i}"})
+             for i in range(args.pages)]
+    # 숫자만 다른 공지 (합쳐지면 안 됨)
+    notice = "{year}학년도 {semester}학기 수강신청 일정을 다음과 같이 안내합니다. " * 8
+    pages += [Document(page_content=notice.format(year=2024, semester=semester),
+                       metadata={'source': f"notice{semester}"}) for semester in (1, 2)]
+
+    chunks = KoreanSentenceChunker().split_documents(pages)
+    deduplicator = ChunkDeduplicator(threshold=args.threshold)
+
+    start = time.perf_counter()
+    kept, report = deduplicator.deduplicate(chunks)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n🧪 페이지 {len(pages):,}개 → 청크 {len(chunks):,}개, 임계값 {args.threshold}")
+    print_dedup_report(report)
+    print(f"  처리 시간 {elapsed:.2f}s ({len(chunks) / elapsed:,.0f} 청크/s)")
+    notices = [doc for doc in kept if doc.metadata['source'].startswith("notice")]
+    print(f"  숫자만 다른 공지 {len(notices)}/2개 유지")
+
+
+if __name__ == "__main__":
+    main()
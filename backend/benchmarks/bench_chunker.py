@@ -0,0 +1,138 @@
+"""
+청커 벤치마크
+
+기존 RecursiveCharacterTextSplitter(500자, 겹침 100자)와 한국어 문장 단위 토큰 청커의
+처리 속도(청크/초, 문서/초), 청크 수, 청크 토큰 수 분포, 문장 중간에서 끝나는 청크 비율을
+비교합니다. 데이터 파일을 주지 않으면 OCR 표와 목록이 섞인 합성 공지를,
+줄바꿈이 남은 원문 형태와 clean_html처럼 공백을 압축한 형태로 각각 측정합니다.
+
+사용 예 (backend 디렉토리에서):
+    python benchmarks/bench_chunker.py --docs 5000
+    python benchmarks/bench_chunker.py --data-path data/111_cleaned.jsonl
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain.schema import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from data.records import iter_records
+from korean_chunker import KoreanSentenceChunker
+from tokenizer import count_tokens_batch
+
+SENTENCES = [
+    "{n}학년도 1학기 수강신청 일정을 다음과 같이 안내합니다.",
+    "신청 기간은 2024. {m}. {d}.(화) 10:00부터 {d2}일 17:00까지입니다.",
+    "기간 내에 신청하지 않은 학생은 정정 기간에만 신청할 수 있습니다.",
+    "장학금 신청 서류는 학생지원팀에 방문하여 제출해야 합니다.",
+    "자세한 사항은 학사지원팀(054-630-{n})으로 문의하시기 바랍니다.",
+    "기숙사 입사 신청은 포털에서 가능하며 선발 결과는 개별 통보됩니다",
+    "졸업 요건을 충족하지 못한 경우 졸업 유예를 신청할 수 있어요.",
+    "성적 이의신청은 성적 공개 후 3일 이내에만 가능합니다!",
+]
+LIST_ITEMS = ["대상: 재학생 전원", "방법: 포털 로그인 후 신청 메뉴 선택",
+              "제출 서류: 신청서 1부, 성적증명서 1부", "유의사항: 중복 신청 불가"]
+
+
+def make_document(rng: random.Random, i: int) -> str:
+    """본문 문단 + 목록 + (절반은) OCR 표가 들어간 합성 공지"""
+    def sentence():
+        return rng.choice(SENTENCES).format(n=rng.randrange(1000, 9999), m=rng.randrange(1, 13),
+                                            d=rng.randrange(1, 20), d2=rng.randrange(20, 29))
+
+    parts = []
+    for _ in range(rng.randrange(2, 6)):
+        parts.append(" ".join(sentence() for _ in range(rng.randrange(2, 8))))
+    marker = rng.choice(["{k}.", "{k})", "①②③④⑤⑥"])
+    items = []
+    for k, item in enumerate(rng.sample(LIST_ITEMS, 3), 1):
+        prefix = marker[k - 1] if len(marker) > 3 else marker.format(k=k)
+        items.append(f"{prefix} {item}")
+    parts.append("\n".join(items))
+    if rng.random() < 0.5:
+        rows = "\n".join(f"| {rng.randrange(1, 5)}학년 | 2024.{rng.randrange(1, 13):02d}."
+                         f"{rng.randrange(1, 29):02d} | {rng.choice(LIST_ITEMS)} |"
+                         for _ in range(rng.randrange(3, 12)))
+        parts.append("=" * 60 + "\n📸 이미지에서 추출된 텍스트\n" + "=" * 60 +
+                     f"\n## 이미지 1\n| 구분 | 일정 | 비고 |\n|---|---|---|\n{rows}")
+    return f"공지 {i}\n\n" + "\n\n".join(parts)
+
+
+def load_document_sets(args):
+    """(이름, Document 리스트) 리스트"""
+    if args.data_path:
+        return [(os.path.basename(args.data_path),
+                 [Document(page_content=f"제목: {item['title']}\n\n{item['content']}",
+                           metadata={'source': item['url']})
+                  for item in iter_records(args.data_path)])]
+    rng = random.Random(0)
+    texts = [make_document(rng, i) for i in range(args.docs)]
+    return [
+        ("원문 (줄바꿈 유지)",
+         [Document(page_content=text, metadata={'source': f"doc{i}"})
+          for i, text in enumerate(texts)]),
+        ("clean_html 결과 (공백 압축)",
+         [Document(page_content=re.sub(r'\s+', ' ', text), metadata={'source': f"doc{i}"})
+          for i, text in enumerate(texts)]),
+    ]
+
+
+# 문장/표의 자연스러운 끝 (줄 끝에서 끝나는 목록 항목도 자연스러운 끝으로 봄)
+_CLEAN_END = re.compile(r'(?:[.!?|)]|니다|세요|어요|아요|해요|까요|습니다|[다요음함됨임])$')
+_LINE_END = re.compile(r'[ \t]*(?:\n|$)')
+
+
+def measure(name, splitter, documents, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        chunks = list(splitter(documents))
+        best = min(best, time.perf_counter() - start)
+
+    texts = {doc.metadata['source']: doc.page_content for doc in documents}
+    mid_sentence = 0
+    for chunk in chunks:
+        end = chunk.metadata['start_index'] + len(chunk.page_content)
+        if not _CLEAN_END.search(chunk.page_content) and \
+                not _LINE_END.match(texts[chunk.metadata['source']], end):
+            mid_sentence += 1
+    tokens = sorted(count_tokens_batch([chunk.page_content for chunk in chunks]))
+    print(f"  {name:34s} {len(chunks) / best:10,.0f} 청크/s {len(documents) / best:8,.0f} 문서/s"
+          f" | 청크 {len(chunks):7,d}개 | 토큰 평균 {sum(tokens) / len(tokens):5.0f}"
+          f" 최대 {tokens[-1]:5d} | 문장 중간 끊김 {mid_sentence / len(chunks):6.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="청커 벤치마크")
+    parser.add_argument('--docs', type=int, default=5000, help="합성 문서 수")
+    parser.add_argument('--data-path', default=None,
+                        help="데이터 파일 (JSONL 또는 JSON 배열, 주면 합성 대신 사용)")
+    parser.add_argument('--chunk-tokens', type=int, default=400)
+    parser.add_argument('--overlap-tokens', type=int, default=60)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    recursive = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=100,
+                                               length_function=len, add_start_index=True)
+    chunker = KoreanSentenceChunker(chunk_tokens=args.chunk_tokens,
+                                    chunk_overlap_tokens=args.overlap_tokens)
+
+    for name, documents in load_document_sets(args):
+        total_chars = sum(len(doc.page_content) for doc in documents)
+        print(f"\n🧪 {name}: 문서 {len(documents):,}개, {total_chars / 1e6:.1f}M자")
+        measure("RecursiveCharacterTextSplitter", recursive.split_documents, documents,
+                args.repeats)
+        measure(f"KoreanSentenceChunker ({args.chunk_tokens}토큰)",
+                chunker.iter_split_documents, documents, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+HTML 정제 벤치마크
+
+합성 학교 홈페이지 HTML(메뉴, 헤더/푸터, 스크립트, 표, 주석, 엔티티, pre, 루비 등)에 대해
+이전 BeautifulSoup 기반 clean_html과 lxml 기반 clean_html(단일 프로세스, 프로세스 풀)의
+처리 속도(문서/초)를 비교하고, 모든 문서의 결과가 글자 하나까지 같은지 확인합니다.
+
+사용 예 (backend 디렉토리에서):
+    python benchmarks/bench_clean_html.py --pages 100000
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+# backend/data 디렉토리를 Python 경로에 추가 (data 스크립트는 data 디렉토리 기준으로 import)
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data'))
+
+from bs4 import BeautifulSoup
+
+from bench_chunker import make_document
+from clean_data import clean_html, iter_clean_html
+
+
+def clean_html_bs4(content: str) -> str:
+    """이전 clean_html (BeautifulSoup 트리 + 줄마다 정규식) - 비교 기준"""
+    soup = BeautifulSoup(content, 'lxml')
+    for tag in soup(['script', 'style', 'nav', 'footer', 'header',
+                     'iframe', 'noscript', 'meta', 'link']):
+        tag.decompose()
+    text = soup.get_text()
+    lines = [line.strip() for line in text.splitlines()]
+    lines = [line for line in lines if line]
+    lines = [line for line in lines if not re.match(r'^(Previous|Next|tab|\||»|«)+\s*(Previous|Next|tab|\||»|«)*$', line)]
+    common_patterns = [
+        r'^목록보기$',
+        r'^인쇄$',
+        r'^좋아요 \d+ 싫어요 \d+$',
+        r'^Read more$',
+        r'^조회 \d+$',
+    ]
+    filtered_lines = []
+    for line in lines:
+        skip = False
+        for pattern in common_patterns:
+            if re.match(pattern, line.strip()):
+                skip = True
+                break
+        if not skip:
+            filtered_lines.append(line)
+    text = '\n'.join(filtered_lines)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return text.strip()
+
+
+MENU_ITEMS = ["대학소개", "입학안내", "학사안내", "장학안내", "대학생활", "커뮤니티", "도서관"]
+# 정제 규칙의 경계를 건드리는 조각들 (공백뿐인 문자열, 제거 대상 태그 중첩, 엔티티 등)
+ODD_FRAGMENTS = [
+    "<pre>  들여쓰기\n\n  유지  </pre>", "<textarea>\r\n</textarea>", "<p>a</p>\r<p>목록보기</p>",
+    "<ruby>漢<rt>한</rt><rp>(</rp></ruby>", "<template><p>템플릿</p></template>",
+    "<!-- 주석 -->", "<?php echo 1 ?>", "&nbsp;&amp;&lt;태그&gt;&#x1F600;", " 줄 구분\x0c",
+    "<header><nav>중첩 메뉴</nav>머리글</header>", "<b>닫히지 않은 <i>태그", "</div></span>짝 없는 닫기",
+    "<noscript><p>스크립트 없음</p></noscript>", "<svg><text>그림 글자</text></svg>",
+    "<p>Previous | Next</p>", "<p>« tab »</p>", "<p>Read more</p>", "<p>조회 123</p>",
+    "<p>좋아요 3 싫어요 0</p>", "<p>인쇄</p>", "\t \t", "<![CDATA[데이터]]>",
+]
+
+
+def make_page(rng: random.Random, i: int) -> str:
+    """합성 게시판 글 페이지"""
+    body = make_document(rng, i)
+    paragraphs = "\n".join(f"<p>{line}</p>" if rng.random() < 0.7 else f"<div>\n  {line}\n</div>"
+                           for line in body.split("\n") if line)
+    menu = "\n".join(f'<li><a href="/m{k}">{item}</a></li>' for k, item in enumerate(MENU_ITEMS))
+    odd = "\n".join(rng.sample(ODD_FRAGMENTS, rng.randrange(0, 5)))
+    return (f"<!DOCTYPE html>\n<html lang=\"ko\">\n<head>\n<meta charset=\"utf-8\">\n"
+            f"<title>공지 {i} | 동양대학교</title>\n<link rel=\"stylesheet\" href=\"/a.css\">\n"
+            f"<style>body {{ color: #333; }}</style>\n"
+            f"<script>var page = {i}; if (a < b) {{ go(); }}</script>\n</head>\n<body>\n"
+            f"<header><h1>동양대학교</h1><nav><ul>{menu}</ul></nav></header>\n"
+            f"<div class=\"board-view\">\n<h2>공지 {i}</h2>\n<span>조회 {rng.randrange(1000)}</span>\n"
+            f"{paragraphs}\n{odd}\n<a href=\"/list\">목록보기</a>\n</div>\n"
+            f"<footer>경북 영주시 풍기읍 동양대로 145 &copy; DONGYANG UNIVERSITY</footer>\n"
+            f"<script src=\"/app.js\"></script>\n</body>\n</html>\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML 정제 벤치마크")
+    parser.add_argument('--pages', type=int, default=100_000)
+    parser.add_argument('--baseline-pages', type=int, default=5_000,
+                        help="이전 구현으로 속도를 잴 페이지 수 (결과 비교는 전체 페이지)")
+    parser.add_argument('--workers', type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument('--chunk-size', type=int, default=64)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    pages = [make_page(rng, i) for i in range(args.pages)]
+    print(f"\n🧪 HTML 페이지 {len(pages):,}개, {sum(map(len, pages)) / 1e6:.1f}M자, "
+          f"CPU {os.cpu_count()}개")
+
+    def run(name, clean, documents):
+        start = time.perf_counter()
+        cleaned = list(clean(documents))
+        elapsed = time.perf_counter() - start
+        print(f"  {name:34s} {len(documents) / elapsed:10,.0f} 문서/s ({elapsed:.2f}s)")
+        return cleaned
+
+    baseline = pages[:args.baseline_pages]
+    run("BeautifulSoup (이전 구현)", lambda docs: map(clean_html_bs4, docs), baseline)
+    run("lxml (단일 프로세스)", lambda docs: map(clean_html, docs), baseline)
+    cleaned = run(f"lxml (프로세스 풀, 전체)",
+                  lambda docs: iter_clean_html(docs, workers=args.workers,
+                                               chunk_size=args.chunk_size), pages)
+
+    start = time.perf_counter()
+    mismatches = [i for i, (page, text) in enumerate(zip(pages, cleaned))
+                  if clean_html_bs4(page) != text]
+    print(f"  결과 비교 {len(pages):,}개: 다른 문서 {len(mismatches)}개 "
+          f"({time.perf_counter() - start:.0f}s)")
+    if mismatches:
+        print(f"  ❌ 첫 번째 다른 문서: {mismatches[0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+/chat 동시 요청 벤치마크 (비동기 aask vs 동기 ask)
+
+가짜 OpenAI 서버(LLM 지연 --chat-latency)를 띄우고 작은 데이터로 RAG 시스템을 만든 뒤
+N개의 /chat 요청을 동시에 보냅니다. 비동기 경로라면 전체 시간이 LLM 지연 1번 정도,
+이벤트 루프를 막는 동기 경로라면 N번에 가깝게 나옵니다.
+요청 중에 /health 응답 시간도 함께 측정합니다.
+
+사용 예 (backend 디렉토리에서):
+    python benchmarks/bench_concurrent_chat.py --clients 20 --chat-latency 1.0 --compare-sync
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_openai_server import start_fake_server
+
+
+def write_sample_data(path: str, n_docs: int = 20) -> None:
+    """벤치마크용 공지 데이터"""
+    topics = ["수강신청", "장학금", "기숙사", "졸업", "등록금"]
+    data = [{
+        'url': f"https://www.dyu.ac.kr/notice/{i}",
+        'title': f"{topics[i % len(topics)]} 안내 {i}",
+        'content': f"{topics[i % len(topics)]} 관련 공지 {i}번입니다. " * 30,
+    } for i in range(n_docs)]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+async def run_clients(base_url: str, path: str, clients: int):
+    """동시 요청 전송 + /health 지연 측정"""
+    import httpx
+
+    health_latencies = []
+    done = asyncio.Event()
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        async def poll_health():
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get("/health")
+                health_latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.05)
+
+        async def ask(i: int) -> float:
+            start = time.perf_counter()
+            response = await client.post(path, json={"question": f"{i}번 공지 수강신청 기간은?"})
+            response.raise_for_status()
+            return time.perf_counter() - start
+
+        poller = asyncio.create_task(poll_health())
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(ask(i) for i in range(clients)))
+        total = time.perf_counter() - start
+        done.set()
+        await poller
+
+    return total, sorted(latencies), max(health_latencies, default=0.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/chat 동시 요청 벤치마크")
+    parser.add_argument('--clients', type=int, default=20)
+    parser.add_argument('--chat-latency', type=float, default=1.0)
+    parser.add_argument('--embed-latency', type=float, default=0.05)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--compare-sync', action='store_true',
+                        help="이벤트 루프 안에서 동기 ask를 호출하는 경로도 측정")
+    args = parser.parse_args()
+
+    server, fake_url = start_fake_server(latency=args.embed_latency, dim=256,
+                                         chat_latency=args.chat_latency)
+    os.environ['OPENAI_BASE_URL'] = fake_url
+    os.environ['OPENAI_API_KEY'] = 'fake'
+
+    import uvicorn
+    import main as api
+    from rag_system import RAGSystem
+
+    workdir = tempfile.mkdtemp(prefix="bench_concurrent_chat_")
+    try:
+        data_path = os.path.join(workdir, "data.json")
+        write_sample_data(data_path)
+        api.rag_system = RAGSystem(
+            data_path=data_path,
+            vectorstore_path=os.path.join(workdir, "vectorstore"),
+            embedding_cache_path=None,
+            answer_cache_size=0,  # 요청마다 실제로 검색 + LLM 호출
+            vector_backend="flat"
+        )
+
+        # 비교용: 예전처럼 async 엔드포인트에서 동기 ask 호출
+        @api.app.post("/chat_sync")
+        async def chat_sync(request: api.ChatRequest):
+            return api.rag_system.ask(request.question)
+
+        api.app.router.on_startup.clear()  # RAG 시스템은 위에서 직접 생성
+        server_config = uvicorn.Config(api.app, port=args.port, log_level="warning")
+        api_server = uvicorn.Server(server_config)
+        threading.Thread(target=api_server.run, daemon=True).start()
+        while not api_server.started:
+            time.sleep(0.05)
+
+        base_url = f"http://127.0.0.1:{args.port}"
+        paths = ["/chat"] + (["/chat_sync"] if args.compare_sync else [])
+        results = {path: asyncio.run(run_clients(base_url, path, args.clients))
+                   for path in paths}
+
+        print(f"\n🧪 동시 요청 {args.clients}개, LLM 지연 {args.chat_latency:.1f}s")
+        for path, (total, latencies, health_max) in results.items():
+            print(f"  {path:10s} | 전체 {total:6.2f}s (LLM 지연의 {total / args.chat_latency:5.1f}배) | "
+                  f"요청 p50 {latencies[len(latencies) // 2]:6.2f}s | "
+                  f"/health 최대 {health_max * 1000:7.1f}ms")
+
+        api_server.should_exit = True
+    finally:
+        server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+크롤러 벤치마크
+
+로컬 가짜 홈페이지 서버(fake_site_server.py)의 게시글 페이지를 iter_crawl_pages로 크롤링해
+소요 시간을 이전 순차 크롤러(페이지마다 2초, 이미지마다 0.5초 대기)의 예상 시간과 비교하고,
+서버가 받은 부하(최대 초당 요청 수, 최대 동시 요청 수)와 429/503 이후 재시도 결과를 확인합니다.
+이어서 일부 페이지를 수정하고 조건부 요청 캐시로 다시 크롤링해 304 응답 수, 다시 받은 본문 크기,
+변경 표시(unchanged)가 수정한 페이지와 일치하는지 확인합니다.
+
+사용 예 (backend 디렉토리에서):
+    python benchmarks/bench_crawler.py --pages 300
+    python benchmarks/bench_crawler.py --pages 100 --max-rate 3 --error-rate 0.05  # 감속 확인
+"""
+
+import argparse
+import bisect
+import os
+import random
+import sys
+import tempfile
+import time
+
+# backend/data 디렉토리를 Python 경로에 추가 (data 스크립트는 data 디렉토리 기준으로 import)
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data'))
+
+from crawl_cache import HttpCache
+from crawl_with_images import iter_crawl_pages
+from fake_site_server import IMAGES_PER_PAGE, start_fake_site
+
+
+def max_requests_per_second(request_times) -> int:
+    """어떤 1초 구간에서든 서버가 받은 최대 요청 수"""
+    times = sorted(request_times)
+    return max((bisect.bisect_right(times, t + 1.0) - i for i, t in enumerate(times)), default=0)
+
+
+def crawl(urls, args, http_cache):
+    """iter_crawl_pages로 전체 크롤링 → (페이지 리스트, 소요 시간)"""
+    start = time.perf_counter()
+    pages = list(iter_crawl_pages(urls, concurrency=args.concurrency,
+                                  per_host_rate=args.per_host_rate,
+                                  per_host_concurrency=args.per_host_concurrency,
+                                  http_cache=http_cache))
+    return pages, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="크롤러 벤치마크")
+    parser.add_argument('--pages', type=int, default=300)
+    parser.add_argument('--latency', type=float, default=0.05, help="서버 응답 지연 (초)")
+    parser.add_argument('--max-rate', type=float, default=0.0,
+                        help="서버가 초당 허용하는 요청 수 (넘으면 429, 0이면 무제한)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="503 응답 확률")
+    parser.add_argument('--changed', type=float, default=0.05,
+                        help="다시 크롤링하기 전에 수정할 페이지 비율 (0이면 다시 크롤링 안 함)")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--per-host-rate', type=float, default=4.0)
+    parser.add_argument('--per-host-concurrency', type=int, default=4)
+    args = parser.parse_args()
+
+    server, base_url = start_fake_site(latency=args.latency, max_rate=args.max_rate,
+                                       error_rate=args.error_rate)
+    handler = server.RequestHandlerClass
+    stats = handler.stats
+    urls = [f"{base_url}/page/{i}" for i in range(args.pages)]
+    print(f"\n🧪 페이지 {len(urls):,}개 (페이지당 이미지 {IMAGES_PER_PAGE}개), "
+          f"서버 지연 {args.latency * 1000:.0f}ms")
+
+    # 이전 순차 크롤러: 모든 요청을 차례로 + 페이지 사이 2초 + 이미지마다 0.5초
+    requests_needed = len(urls) * (1 + IMAGES_PER_PAGE)
+    sequential = (requests_needed * args.latency + 2.0 * (len(urls) - 1)
+                  + 0.5 * len(urls) * IMAGES_PER_PAGE)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        http_cache = HttpCache(os.path.join(temp_dir, 'crawl_cache.sqlite3'))
+        pages, elapsed = crawl(urls, args, http_cache)
+
+        ok = sum('error' not in page for page in pages)
+        images = sum(page['image_count'] for page in pages)
+        in_order = [page['url'] for page in pages] == urls
+        first_bytes = stats['body_bytes']
+        print(f"\n  이전 순차 크롤러 (예상)      {sequential:10.1f}s")
+        print(f"  asyncio 크롤러              {elapsed:10.1f}s ({sequential / elapsed:.1f}배)")
+        print(f"  성공 {ok:,}/{len(urls):,} 페이지 | 이미지 {images:,}개 "
+              f"(기대 {ok * (IMAGES_PER_PAGE - 1):,}개) | URL 순서 유지: {in_order}")
+        print(f"  서버 요청 {stats['requests']:,}회 (429 {stats['throttled']:,}회, "
+              f"503 {stats['errors']:,}회) | 최대 초당 요청 "
+              f"{max_requests_per_second(handler.request_times)}회 | "
+              f"최대 동시 요청 {stats['max_active']}개 | 본문 {first_bytes / 1e6:.1f}MB")
+
+        if args.changed > 0:
+            # 일부 페이지를 수정한 뒤 조건부 요청으로 다시 크롤링
+            changed = set(random.Random(0).sample(range(len(urls)),
+                                                  max(1, int(len(urls) * args.changed))))
+            for index in changed:
+                handler.revisions[index] += 1
+            before = dict(stats)
+            pages, elapsed = crawl(urls, args, http_cache)
+            http_cache.close()
+
+            flagged = {index for index, page in enumerate(pages) if not page['unchanged']}
+            print(f"\n  다시 크롤링 (수정 {len(changed)}개 페이지) {elapsed:10.1f}s")
+            print(f"  304 응답 {stats['not_modified'] - before['not_modified']:,}회 | "
+                  f"본문 {(stats['body_bytes'] - first_bytes) / 1e6:.2f}MB "
+                  f"(처음 {first_bytes / 1e6:.1f}MB) | "
+                  f"변경 표시가 수정한 페이지와 일치: {flagged == changed}")
+        else:
+            http_cache.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
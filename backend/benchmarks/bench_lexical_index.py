@@ -0,0 +1,78 @@
+"""
+어휘(BM25) 색인 벤치마크
+
+합성 한국어 공지 코퍼스로 색인 생성 시간과 검색 지연을 측정합니다.
+
+사용 예 (backend 디렉토리에서):
+    python benchmarks/bench_lexical_index.py --chunks 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexical_index import LexicalIndex
+
+WORDS = [
+    "수강신청", "장학금", "기숙사", "졸업", "학점", "등록금", "휴학", "복학", "계절학기",
+    "성적", "이의신청", "학사지원팀", "컴퓨터공학과", "경영학과", "간호학과", "도서관",
+    "운영시간", "안내", "기간", "방법", "신청", "제출", "서류", "문의", "공지", "변경",
+]
+
+
+def make_vocabulary(rng: random.Random, size: int = 20_000):
+    """자주 쓰는 학사 용어 + 임의 음절 조합 단어"""
+    syllables = [chr(0xAC00 + rng.randrange(11172)) for _ in range(800)]
+    return WORDS + [''.join(rng.choice(syllables) for _ in range(rng.randrange(2, 5)))
+                    for _ in range(size)]
+
+
+def make_chunk(rng: random.Random, vocabulary, i: int) -> str:
+    """약 500자 길이의 합성 청크 (학수번호, 날짜 포함)"""
+    words = [rng.choice(WORDS) if rng.random() < 0.3 else rng.choice(vocabulary)
+             for _ in range(120)]
+    words.insert(rng.randrange(len(words)), f"CSE{rng.randrange(100, 999)}")
+    words.insert(rng.randrange(len(words)), f"2024.{rng.randrange(1, 13):02d}.{rng.randrange(1, 29):02d}")
+    return f"[공지 {i}] " + " ".join(words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="어휘 색인 벤치마크")
+    parser.add_argument('--chunks', type=int, default=100_000)
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = make_vocabulary(rng)
+    texts = [make_chunk(rng, vocabulary, i) for i in range(args.chunks)]
+    ids = [f"chunk-{i}" for i in range(args.chunks)]
+    print(f"🧪 청크 {len(texts):,}개 ({sum(map(len, texts)) / 1e6:.1f}M자)")
+
+    start = time.perf_counter()
+    index = LexicalIndex.build(ids, texts)
+    print(f"  색인 생성: {time.perf_counter() - start:.2f}s "
+          f"(용어 {len(index.vocab):,}개, 포스팅 {len(index.postings):,}개, "
+          f"{(index.postings.nbytes + index.term_freqs.nbytes) / 1e6:.1f}MB)")
+
+    queries = [f"{rng.choice(WORDS)} {rng.choice(vocabulary)} CSE{rng.randrange(100, 999)}"
+               for _ in range(args.queries)]
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, args.k)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    print(f"  검색 지연: 평균 {sum(latencies) / len(latencies):.2f}ms | "
+          f"p50 {latencies[len(latencies) // 2]:.2f}ms | "
+          f"p99 {latencies[int(len(latencies) * 0.99)]:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+멀티 워커 메모리 벤치마크 (serve.py)
+
+가짜 OpenAI 서버와 합성 데이터로 serve.py를 워커 수별로 실행하고,
+모든 워커가 준비되어 몇 번 검색한 뒤 프로세스 트리 전체의 RSS와 PSS를 측정합니다.
+RSS는 공유 페이지를 프로세스마다 중복으로 세고, PSS는 공유 페이지를 나눠 세므로
+실제 사용 메모리는 PSS 합계가 가깝습니다. 벡터를 메모리 매핑으로 공유하면
+워커를 늘려도 PSS 합계는 "워커 1개 + 워커당 작은 증가분"에 가깝게 나옵니다.
+
+Linux(/proc) 전용입니다.
+
+사용 예 (backend 디렉토리에서):
+    python benchmarks/bench_multiworker_memory.py --docs 20000 --workers 1 2 4
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# backend 디렉토리를 Python 경로에 추가
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+from fake_openai_server import start_fake_server
+
+READY_MESSAGE = "FastAPI 서버가 준비되었습니다"
+
+
+def write_sample_data(path: str, n_docs: int) -> None:
+    """청크 1개 분량의 공지 n_docs개"""
+    topics = ["수강신청", "장학금", "기숙사", "졸업", "등록금"]
+    data = [{
+        'url': f"https://www.dyu.ac.kr/notice/{i}",
+        'title': f"{topics[i % len(topics)]} 안내 {i}",
+        'content': f"{topics[i % len(topics)]} 관련 공지 {i}번입니다. " * 15,
+    } for i in range(n_docs)]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def process_tree(root: int):
+    """root와 모든 자손 프로세스 PID"""
+    children = {}
+    for name in os.listdir('/proc'):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f'/proc/{name}/stat') as f:
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(name))
+
+    pids, stack = [], [root]
+    while stack:
+        pid = stack.pop()
+        pids.append(pid)
+        stack.extend(children.get(pid, []))
+    return pids
+
+
+def memory_kb(pid: int):
+    """(RSS, PSS) KB"""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0] in ('Rss:', 'Pss:'):
+                values[parts[0]] = int(parts[1])
+    return values.get('Rss:', 0), values.get('Pss:', 0)
+
+
+def run_server(workers: int, args, env) -> dict:
+    """serve.py 실행 → 준비 대기 → 질의 → 메모리 측정 → 종료"""
+    import requests
+
+    command = [sys.executable, os.path.join(BACKEND_DIR, "serve.py"),
+               "--workers", str(workers), "--port", str(args.port),
+               "--data-path", env['BENCH_DATA_PATH'],
+               "--vectorstore-path", env['BENCH_VECTORSTORE_PATH'],
+               "--vector-backend", args.vector_backend,
+               "--vector-precision", args.vector_precision]
+    process = subprocess.Popen(command, env=env, stdout=subprocess.PIPE,
+                               stderr=subprocess.STDOUT, text=True)
+    ready = []
+
+    def read_output():
+        for line in process.stdout:
+            if READY_MESSAGE in line:
+                ready.append(time.perf_counter())
+            if args.verbose:
+                print(f"    | {line.rstrip()}")
+
+    threading.Thread(target=read_output, daemon=True).start()
+    start = time.perf_counter()
+    try:
+        while len(ready) < workers:
+            if process.poll() is not None:
+                raise RuntimeError("serve.py가 종료되었습니다 (--verbose로 로그 확인)")
+            time.sleep(0.1)
+        startup = ready[-1] - start
+
+        # 워커들이 벡터 파일을 실제로 읽도록 질의
+        for i in range(args.queries):
+            response = requests.post(f"http://127.0.0.1:{args.port}/chat",
+                                     json={"question": f"{i}번 공지 수강신청 기간은?",
+                                           "search_mode": "vector"}, timeout=60)
+            response.raise_for_status()
+
+        pids = process_tree(process.pid)
+        usage = [memory_kb(pid) for pid in pids]
+        return {
+            'processes': len(pids),
+            'startup': startup,
+            'rss_mb': sum(rss for rss, _ in usage) / 1024,
+            'pss_mb': sum(pss for _, pss in usage) / 1024,
+        }
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="멀티 워커 메모리 벤치마크")
+    parser.add_argument('--docs', type=int, default=20000)
+    parser.add_argument('--dim', type=int, default=1536)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--queries', type=int, default=20)
+    parser.add_argument('--vector-backend', default="flat", choices=["flat", "ivf", "chroma"])
+    parser.add_argument('--vector-precision', default="float32")
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    server, fake_url = start_fake_server(latency=0.01, per_item_latency=0.0, dim=args.dim,
+                                         chat_latency=0.01)
+    workdir = tempfile.mkdtemp(prefix="bench_multiworker_")
+    env = dict(os.environ, OPENAI_BASE_URL=fake_url, OPENAI_API_KEY="fake",
+               BENCH_DATA_PATH=os.path.join(workdir, "data.json"),
+               BENCH_VECTORSTORE_PATH=os.path.join(workdir, "vectorstore"))
+    try:
+        write_sample_data(env['BENCH_DATA_PATH'], args.docs)
+
+        # 색인 생성 (측정에서 제외)
+        print(f"🔨 색인 생성 중 ({args.docs}개 문서, {args.dim}차원)...")
+        subprocess.run([sys.executable, os.path.join(BACKEND_DIR, "serve.py"), "--build-only",
+                        "--data-path", env['BENCH_DATA_PATH'],
+                        "--vectorstore-path", env['BENCH_VECTORSTORE_PATH'],
+                        "--vector-backend", args.vector_backend,
+                        "--vector-precision", args.vector_precision],
+                       env=env, check=True, stdout=subprocess.DEVNULL)
+        index_mb = sum(os.path.getsize(os.path.join(env['BENCH_VECTORSTORE_PATH'], name))
+                       for name in os.listdir(env['BENCH_VECTORSTORE_PATH'])) / 2**20
+
+        print(f"\n🧪 {args.vector_backend}/{args.vector_precision}, 색인 파일 {index_mb:.0f}MB")
+        baseline = None
+        for workers in args.workers:
+            result = run_server(workers, args, env)
+            if baseline is None:
+                baseline = result['pss_mb']
+            print(f"  워커 {workers:2d}개 | 프로세스 {result['processes']:2d}개 | "
+                  f"준비 {result['startup']:5.1f}s | RSS 합 {result['rss_mb']:7.0f}MB | "
+                  f"PSS 합 {result['pss_mb']:7.0f}MB | "
+                  f"워커 1개 대비 +{result['pss_mb'] - baseline:6.0f}MB")
+    finally:
+        server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+근사 중복 문서 탐지 벤치마크
+
+정제된 합성 공지에 그대로 다시 게시된 사본과 몇 단어만 바뀐 사본(페이지 목록, 수정 게시)을
+섞은 뒤 remove_near_duplicates의 처리 시간(문서/초)과 정답 대비 정밀도/재현율을 측정합니다.
+
+사용 예 (backend 디렉토리에서):
+    python benchmarks/bench_near_duplicates.py --docs 100000
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+# backend/data 디렉토리를 Python 경로에 추가 (data 스크립트는 data 디렉토리 기준으로 import)
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data'))
+
+from bench_chunker import make_document
+from clean_data import remove_near_duplicates
+
+
+def mutate(rng: random.Random, text: str, rate: float) -> str:
+    """단어의 rate 비율을 다른 단어로 바꾼 사본"""
+    words = text.split(' ')
+    for _ in range(max(1, int(len(words) * rate))):
+        words[rng.randrange(len(words))] = f"변경{rng.randrange(10000)}"
+    return ' '.join(words)
+
+
+def make_corpus(docs: int, duplicate_rate: float):
+    """(문서 리스트, 문서별 원본 번호) - 사본은 원본 번호를, 원본은 자기 번호를 가짐"""
+    rng = random.Random(0)
+    data, origin = [], []
+    for i in range(docs):
+        if data and rng.random() < duplicate_rate:
+            source = rng.randrange(len(data))
+            text = data[source]['content']
+            if rng.random() < 0.5:
+                text = mutate(rng, text, 0.01)
+            data.append({'url': f"https://www.dyu.ac.kr/copy/{i}", 'title': "", 'content': text})
+            origin.append(origin[source])
+        else:
+            text = re.sub(r'\s+', ' ', make_document(rng, i))
+            data.append({'url': f"https://www.dyu.ac.kr/doc/{i}", 'title': "", 'content': text})
+            origin.append(i)
+    return data, origin
+
+
+def main():
+    parser = argparse.ArgumentParser(description="근사 중복 문서 탐지 벤치마크")
+    parser.add_argument('--docs', type=int, default=100_000)
+    parser.add_argument('--duplicate-rate', type=float, default=0.2, help="사본 문서 비율")
+    parser.add_argument('--threshold', type=float, default=0.9)
+    args = parser.parse_args()
+
+    data, origin = make_corpus(args.docs, args.duplicate_rate)
+    origin_of = {item['url']: origin[i] for i, item in enumerate(data)}
+    total_chars = sum(len(item['content']) for item in data)
+    print(f"\n🧪 문서 {len(data):,}개, {total_chars / 1e6:.1f}M자, 원본 {len(set(origin)):,}개")
+
+    start = time.perf_counter()
+    kept = remove_near_duplicates(data, threshold=args.threshold)
+    elapsed = time.perf_counter() - start
+
+    # 제거된 문서가 남은 문서와 같은 원본이면 정답, 원본마다 하나만 남아야 재현율 100%
+    removed = [(url, item['url']) for item in kept for url in item.get('duplicate_urls', [])]
+    correct = sum(origin_of[url] == origin_of[canonical] for url, canonical in removed)
+    expected = len(data) - len(set(origin))
+    print(f"  처리 시간 {elapsed:.2f}s ({len(data) / elapsed:,.0f} 문서/s)")
+    print(f"  제거 {len(removed):,}개 (정답 {expected:,}개) | "
+          f"정밀도 {correct / max(1, len(removed)):.2%} | 재현율 {correct / max(1, expected):.2%}")
+
+
+if __name__ == "__main__":
+    main()
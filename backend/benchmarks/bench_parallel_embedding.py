@@ -0,0 +1,72 @@
+"""
+병렬 배치 임베딩 벤치마크
+
+가짜 임베딩 서버를 상대로 순차(워커 1개)와 병렬 임베딩의
+전체 소요 시간을 비교합니다.
+
+사용 예 (backend 디렉토리에서):
+    python benchmarks/bench_parallel_embedding.py --chunks 6000 --workers 8
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_openai import OpenAIEmbeddings
+
+from fake_openai_server import start_fake_server
+from parallel_embedding import embed_batches_concurrently
+
+
+def make_chunks(count: int):
+    """111_cleaned.json 청크와 비슷한 길이(약 500자)의 합성 청크"""
+    base = "2024학년도 1학기 수강신청 기간은 2월 13일부터 15일까지이며 학사지원팀으로 문의 바랍니다. "
+    return [f"[{i}] " + base * 10 for i in range(count)]
+
+
+def run(embeddings, chunks, batch_size: int, workers: int, tpm) -> float:
+    """임베딩 전체 소요 시간 측정"""
+    batches = [chunks[i:i+batch_size] for i in range(0, len(chunks), batch_size)]
+    start = time.perf_counter()
+    for _ in embed_batches_concurrently(embeddings, batches,
+                                        max_workers=workers,
+                                        tokens_per_minute=tpm):
+        pass
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="병렬 배치 임베딩 벤치마크")
+    parser.add_argument('--chunks', type=int, default=6000)
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--tpm', type=int, default=None, help="분당 토큰 제한")
+    parser.add_argument('--latency', type=float, default=0.3, help="가짜 서버 요청 지연(초)")
+    args = parser.parse_args()
+
+    server, base_url = start_fake_server(latency=args.latency)
+    embeddings = OpenAIEmbeddings(
+        model="text-embedding-3-small",
+        base_url=base_url,
+        api_key="fake"
+    )
+    chunks = make_chunks(args.chunks)
+
+    print(f"🧪 청크 {len(chunks)}개, 배치 {args.batch_size}, 서버 지연 {args.latency}s")
+
+    sequential = run(embeddings, chunks, args.batch_size, 1, args.tpm)
+    print(f"  순차 (워커 1개): {sequential:.2f}s")
+
+    parallel = run(embeddings, chunks, args.batch_size, args.workers, args.tpm)
+    print(f"  병렬 (워커 {args.workers}개): {parallel:.2f}s")
+    print(f"  ⚡ 속도 향상: {sequential / parallel:.1f}배")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
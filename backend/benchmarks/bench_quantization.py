@@ -0,0 +1,110 @@
+"""
+양자화 벡터 저장 벤치마크 (float32 vs float16 vs int8)
+
+무작위 단위 벡터로 flat 백엔드를 정밀도별로 채운 뒤
+검색용 메모리, 질의 지연, float32 정확 검색 대비 recall@k를 비교합니다.
+재채점(rescore) 없이 양자화 점수만 사용했을 때의 recall도 함께 출력합니다.
+
+사용 예 (backend 디렉토리에서):
+    python benchmarks/bench_quantization.py --chunks 50000 --dim 1536
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_vector_backends import NoEmbeddings
+from vector_backends import VECTOR_PRECISIONS, open_vectorstore
+
+
+def fill(path: str, vectors: np.ndarray, precision: str, batch_size: int = 5000) -> float:
+    """정밀도별 flat 벡터스토어 생성 시간 측정"""
+    start = time.perf_counter()
+    store = open_vectorstore("flat", path, NoEmbeddings(), precision)
+    for i in range(0, len(vectors), batch_size):
+        ids = [f"chunk-{j}" for j in range(i, min(i + batch_size, len(vectors)))]
+        store.upsert_embeddings(
+            ids=ids,
+            embeddings=vectors[i:i + batch_size],
+            metadatas=[{} for _ in ids],
+            documents=ids
+        )
+    store.persist()
+    return time.perf_counter() - start
+
+
+def search_ids(store, queries: np.ndarray, k: int):
+    """질의별 결과 행 번호와 지연(ms, 정렬됨) - 모든 정밀도가 같은 순서로 채워짐"""
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        hits = store.search_vector(query, k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append([row for row, _ in hits])
+    return sorted(latencies), results
+
+
+def recall(results, exact, k: int) -> float:
+    """정확 검색 결과 대비 recall@k"""
+    return float(np.mean([len(set(a) & set(b)) / k for a, b in zip(results, exact)]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="양자화 flat 벡터스토어 벤치마크")
+    parser.add_argument('--chunks', type=int, default=50_000)
+    parser.add_argument('--dim', type=int, default=1536)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--rescore-factor', type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((args.chunks, args.dim), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    queries = vectors[rng.choice(args.chunks, args.queries)] + \
+        (0.5 / np.sqrt(args.dim)) * rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+
+    workdir = tempfile.mkdtemp(prefix="bench_quantization_")
+    print(f"🧪 청크 {args.chunks:,}개 × {args.dim}차원, 질의 {args.queries}개, "
+          f"k={args.k}, 재채점 배수 {args.rescore_factor}")
+
+    try:
+        exact = None
+        for precision in VECTOR_PRECISIONS:
+            path = os.path.join(workdir, precision)
+            build_time = fill(path, vectors, precision)
+            store = open_vectorstore("flat", path, NoEmbeddings(), precision)
+            store.rescore_factor = args.rescore_factor
+            memory = store.memory_usage()
+
+            latencies, results = search_ids(store, queries, args.k)
+            if exact is None:
+                exact = results
+
+            line = (f"  {precision:7s} | 생성 {build_time:6.2f}s | "
+                    f"검색 메모리 {memory['search_bytes'] / 1e6:8.1f}MB "
+                    f"(절감 {memory['saved_ratio'] * 100:4.1f}%) | "
+                    f"p50 {latencies[len(latencies) // 2]:6.2f}ms "
+                    f"p99 {latencies[int(len(latencies) * 0.99)]:6.2f}ms | "
+                    f"recall@{args.k} {recall(results, exact, args.k):.3f}")
+
+            if precision != "float32":
+                # 재채점 없이 양자화 점수만으로 순위를 매긴 경우
+                store.rescore_factor = 0
+                _, raw = search_ids(store, queries, args.k)
+                line += f" (재채점 없음 {recall(raw, exact, args.k):.3f})"
+            print(line)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
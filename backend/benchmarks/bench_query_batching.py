@@ -0,0 +1,85 @@
+"""
+질의 임베딩 마이크로 배칭 벤치마크
+
+가짜 OpenAI 서버(요청당 지연 --latency, 동시 처리 한도 --max-concurrency)에
+동시 질의 N개를 보내 요청마다 따로 호출하는 경우와 QueryEmbeddingBatcher로
+묶는 경우의 처리량(QPS), 지연(p50/p99), 임베딩 API 호출 수를 비교합니다.
+
+사용 예 (backend 디렉토리에서):
+    python benchmarks/bench_query_batching.py --clients 50 100 200 --max-concurrency 8
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_openai_server import start_fake_server
+
+
+async def run_clients(embed, clients: int):
+    """동시 질의 전송 후 (전체 시간, 정렬된 지연 목록) 반환"""
+    async def one(i: int) -> float:
+        start = time.perf_counter()
+        await embed(f"{i}번 공지 수강신청 기간은?")
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(one(i) for i in range(clients)))
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="질의 임베딩 배칭 벤치마크")
+    parser.add_argument('--clients', type=int, nargs='+', default=[50, 100, 200])
+    parser.add_argument('--latency', type=float, default=0.1,
+                        help="임베딩 요청당 지연 (초)")
+    parser.add_argument('--max-concurrency', type=int, default=8,
+                        help="가짜 API의 동시 처리 한도 (0이면 무제한)")
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--wait-ms', type=float, default=5.0)
+    args = parser.parse_args()
+
+    server, base_url = start_fake_server(latency=args.latency, dim=256,
+                                         max_concurrency=args.max_concurrency)
+    os.environ['OPENAI_API_KEY'] = 'fake'
+
+    from langchain_openai import OpenAIEmbeddings
+    from query_batcher import QueryEmbeddingBatcher
+
+    stats = server.RequestHandlerClass.stats
+    print(f"\n🧪 임베딩 지연 {args.latency * 1000:.0f}ms, "
+          f"API 동시 처리 한도 {args.max_concurrency or '무제한'}")
+    try:
+        for clients in args.clients:
+            for name in ("direct", "batched"):
+                embeddings = OpenAIEmbeddings(model="text-embedding-3-small",
+                                              base_url=base_url, max_retries=0)
+                batcher = None
+                embed = embeddings.aembed_query
+                if name == "batched":
+                    batcher = QueryEmbeddingBatcher(embeddings,
+                                                    max_batch_size=args.batch_size,
+                                                    max_wait_ms=args.wait_ms)
+                    embed = batcher.aembed_query
+
+                before = stats['requests']
+                total, latencies = asyncio.run(run_clients(embed, clients))
+                api_calls = stats['requests'] - before
+                if batcher is not None:
+                    batcher.close()
+
+                print(f"  {clients:4d}개 {name:8s} | QPS {clients / total:8.1f} | "
+                      f"p50 {latencies[len(latencies) // 2] * 1000:7.1f}ms | "
+                      f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:7.1f}ms | "
+                      f"API 호출 {api_calls:4d}회")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+단일 파일 색인 스냅샷 벤치마크
+
+가짜 OpenAI 서버와 합성 데이터로 벡터 DB를 만든 뒤 스냅샷으로 내보내고,
+RAGSystem 생성 시간(벡터 DB 디렉토리 vs 스냅샷, 체크섬 확인 여부별)과
+스냅샷 크기를 비교합니다. 같은 질문의 검색 결과가 디렉토리와 같은지도 확인합니다.
+
+사용 예 (backend 디렉토리에서):
+    python benchmarks/bench_snapshot.py --docs 30000 --backend ivf --precision int8
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_multiworker_memory import write_sample_data
+from fake_openai_server import start_fake_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="색인 스냅샷 벤치마크")
+    parser.add_argument('--docs', type=int, default=30000)
+    parser.add_argument('--dim', type=int, default=1536)
+    parser.add_argument('--backend', default="flat", choices=["flat", "ivf"])
+    parser.add_argument('--precision', default="float32",
+                        choices=["float32", "float16", "int8"])
+    parser.add_argument('--queries', type=int, default=20)
+    args = parser.parse_args()
+
+    server, fake_url = start_fake_server(latency=0.0, per_item_latency=0.0, dim=args.dim)
+    os.environ['OPENAI_BASE_URL'] = fake_url
+    os.environ['OPENAI_API_KEY'] = 'fake'
+
+    from rag_system import RAGSystem
+
+    workdir = tempfile.mkdtemp(prefix="bench_snapshot_")
+    try:
+        data_path = os.path.join(workdir, "data.json")
+        vectorstore_path = os.path.join(workdir, "vectorstore")
+        snapshot_path = os.path.join(workdir, "index.ragsnap")
+        write_sample_data(data_path, args.docs)
+
+        settings = dict(data_path=data_path, vectorstore_path=vectorstore_path,
+                        embedding_cache_path=None, answer_cache_size=0,
+                        query_batch_size=1, vector_backend=args.backend,
+                        vector_precision=args.precision)
+
+        start = time.perf_counter()
+        source = RAGSystem(**settings)
+        build_time = time.perf_counter() - start
+        start = time.perf_counter()
+        source.export_snapshot(snapshot_path)
+        export_time = time.perf_counter() - start
+
+        def timed(**kwargs):
+            start = time.perf_counter()
+            system = RAGSystem(**settings, **kwargs)
+            return system, time.perf_counter() - start
+
+        directory, directory_time = timed(read_only=True)
+        _, verified_time = timed(snapshot_path=snapshot_path)
+        snapshot, snapshot_time = timed(snapshot_path=snapshot_path, verify_snapshot=False)
+
+        # 같은 질의 벡터로 검색 결과 비교
+        mismatches = 0
+        for i in range(args.queries):
+            query = directory.embeddings.embed_query(f"{i * 7}번 공지 수강신청 기간은?")
+            expected = directory.vectorstore.search_vector(query, k=8)
+            actual = snapshot.vectorstore.search_vector(query, k=8)
+            mismatches += [row for row, _ in expected] != [row for row, _ in actual]
+            mismatches += (directory.lexical_index.search(f"{i}번 공지", k=8) !=
+                           snapshot.lexical_index.search(f"{i}번 공지", k=8))
+
+        print(f"\n🧪 {args.docs}개 문서, {args.dim}차원, {args.backend}/{args.precision}")
+        print(f"  색인 생성 (임베딩 포함)       {build_time:7.2f}s")
+        print(f"  스냅샷 내보내기               {export_time:7.2f}s "
+              f"({os.path.getsize(snapshot_path) / 2**20:.1f}MB)")
+        print(f"  RAGSystem 생성 - 디렉토리      {directory_time:7.2f}s")
+        print(f"  RAGSystem 생성 - 스냅샷+체크섬 {verified_time:7.2f}s")
+        print(f"  RAGSystem 생성 - 스냅샷        {snapshot_time:7.2f}s")
+        print(f"  검색 결과 불일치 {mismatches}/{args.queries * 2}")
+    finally:
+        server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
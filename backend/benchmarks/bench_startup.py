@@ -0,0 +1,98 @@
+"""
+서버 시작 시간 벤치마크
+
+가짜 OpenAI 서버와 합성 데이터로 색인을 만든 뒤 uvicorn으로 main:app을 여러 번
+새로 띄워, 프로세스 시작부터 포트가 열릴 때(/health 응답)까지와
+요청을 받을 준비가 될 때(/ready 200)까지의 시간, /ready의 단계별 소요 시간을 측정합니다.
+
+사용 예 (backend 디렉토리에서):
+    python benchmarks/bench_startup.py --docs 5000 --runs 3
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+# backend 디렉토리를 Python 경로에 추가
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+from bench_multiworker_memory import write_sample_data
+from fake_openai_server import start_fake_server
+
+
+def measure_startup(port: int, env: dict) -> dict:
+    """uvicorn 실행 후 포트 열림/준비 완료 시간 측정"""
+    import requests
+
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    bound, snapshot = None, None
+    try:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError("서버 프로세스가 종료되었습니다")
+            try:
+                response = requests.get(f"{base_url}/ready", timeout=5)
+            except requests.ConnectionError:
+                time.sleep(0.01)
+                continue
+            if bound is None:
+                bound = time.perf_counter() - start
+            snapshot = response.json()
+            if response.status_code == 200 or snapshot['status'] == "failed":
+                break
+            time.sleep(0.01)
+        return {'bound': bound, 'ready': time.perf_counter() - start, 'snapshot': snapshot}
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="서버 시작 시간 벤치마크")
+    parser.add_argument('--docs', type=int, default=5000)
+    parser.add_argument('--dim', type=int, default=1536)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--vector-backend', default="flat", choices=["chroma", "flat", "ivf"])
+    parser.add_argument('--port', type=int, default=8767)
+    args = parser.parse_args()
+
+    server, fake_url = start_fake_server(latency=0.05, per_item_latency=0.0, dim=args.dim)
+    workdir = tempfile.mkdtemp(prefix="bench_startup_")
+    env = dict(os.environ, OPENAI_BASE_URL=fake_url, OPENAI_API_KEY="fake",
+               RAG_DATA_PATH=os.path.join(workdir, "data.json"),
+               RAG_VECTORSTORE_PATH=os.path.join(workdir, "vectorstore"),
+               RAG_VECTOR_BACKEND=args.vector_backend)
+    try:
+        write_sample_data(env['RAG_DATA_PATH'], args.docs)
+        print(f"🔨 색인 생성 중 ({args.docs}개 문서)...")
+        subprocess.run([sys.executable, os.path.join(BACKEND_DIR, "serve.py"), "--build-only",
+                        "--data-path", env['RAG_DATA_PATH'],
+                        "--vectorstore-path", env['RAG_VECTORSTORE_PATH'],
+                        "--vector-backend", args.vector_backend],
+                       env=env, check=True, stdout=subprocess.DEVNULL)
+
+        print(f"\n🧪 {args.vector_backend} 백엔드, {args.docs}개 문서, {args.runs}회 실행")
+        for run in range(args.runs):
+            result = measure_startup(args.port, env)
+            snapshot = result['snapshot']
+            stages = " | ".join(f"{name} {seconds:.2f}s"
+                                for name, seconds in snapshot['timings'].items())
+            print(f"  {run + 1}회 | 포트 열림 {result['bound']:5.2f}s | "
+                  f"준비 완료 {result['ready']:5.2f}s ({snapshot['status']}) | {stages}")
+    finally:
+        server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
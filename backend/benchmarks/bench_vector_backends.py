@@ -0,0 +1,110 @@
+"""
+벡터스토어 백엔드 벤치마크 (Chroma vs NumPy flat)
+
+무작위 단위 벡터로 두 백엔드를 채운 뒤
+로드 시간, 질의 지연, Chroma(HNSW) 결과의 recall@k(정확 검색 대비)를 비교합니다.
+
+사용 예 (backend 디렉토리에서):
+    python benchmarks/bench_vector_backends.py --chunks 20000 --dim 1536
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.embeddings import Embeddings
+
+from vector_backends import open_vectorstore
+
+
+class NoEmbeddings(Embeddings):
+    """벤치마크에서는 벡터를 직접 넣으므로 호출되지 않음"""
+
+    def embed_documents(self, texts):
+        raise NotImplementedError
+
+    def embed_query(self, text):
+        raise NotImplementedError
+
+
+def fill(backend: str, path: str, vectors: np.ndarray, batch_size: int = 1000) -> float:
+    """벡터스토어 생성 시간 측정"""
+    start = time.perf_counter()
+    store = open_vectorstore(backend, path, NoEmbeddings())
+    for i in range(0, len(vectors), batch_size):
+        ids = [f"chunk-{j}" for j in range(i, min(i + batch_size, len(vectors)))]
+        store.upsert_embeddings(
+            ids=ids,
+            embeddings=vectors[i:i + batch_size].tolist(),
+            metadatas=[{'source': f"https://www.dyu.ac.kr/{j}"} for j in range(len(ids))],
+            documents=[f"청크 {chunk_id}" for chunk_id in ids]
+        )
+    store.persist()
+    return time.perf_counter() - start
+
+
+def measure(backend: str, path: str, queries: np.ndarray, k: int):
+    """로드 시간, 질의 지연(ms 리스트), 결과 ID 측정"""
+    start = time.perf_counter()
+    store = open_vectorstore(backend, path, NoEmbeddings())
+    store.count()
+    load_time = time.perf_counter() - start
+
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        docs = store.similarity_search_by_vector(query.tolist(), k=k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append([doc.page_content for doc in docs])
+    return load_time, sorted(latencies), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chroma vs flat 벡터스토어 벤치마크")
+    parser.add_argument('--chunks', type=int, default=20_000)
+    parser.add_argument('--dim', type=int, default=1536)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((args.chunks, args.dim), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    # 저장된 벡터 근처의 질의 (잡음 노름 약 0.5)
+    queries = vectors[rng.choice(args.chunks, args.queries)] + \
+        (0.5 / np.sqrt(args.dim)) * rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+
+    workdir = tempfile.mkdtemp(prefix="bench_vector_backends_")
+    print(f"🧪 청크 {args.chunks:,}개 × {args.dim}차원, 질의 {args.queries}개, k={args.k}")
+
+    try:
+        exact = None
+        for backend in ("flat", "chroma"):
+            path = os.path.join(workdir, backend)
+            build_time = fill(backend, path, vectors)
+            load_time, latencies, results = measure(backend, path, queries, args.k)
+
+            line = (f"  {backend:6s} | 생성 {build_time:6.2f}s | 로드 {load_time * 1000:7.1f}ms | "
+                    f"질의 p50 {latencies[len(latencies) // 2]:6.2f}ms "
+                    f"p99 {latencies[int(len(latencies) * 0.99)]:6.2f}ms")
+            if exact is None:
+                exact = results
+            else:
+                recall = np.mean([len(set(a) & set(b)) / args.k
+                                  for a, b in zip(results, exact)])
+                line += f" | recall@{args.k} {recall:.3f}"
+            print(line)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
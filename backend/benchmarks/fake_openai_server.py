@@ -0,0 +1,230 @@
+"""
+로컬 가짜 OpenAI 서버 (벤치마크/테스트용)
+
+POST /v1/embeddings 요청에 결정적인(같은 입력 → 같은 벡터) 임베딩을
+설정한 지연 시간 후 돌려줍니다. 실제 API 비용 없이 병렬 처리 효과를 측정할 때 사용합니다.
+POST /v1/chat/completions 요청에는 chat_latency 후 고정 답변을 돌려줍니다
+(stream=true이면 같은 시간에 걸쳐 토큰 단위로 전송).
+rate_limit_rate 확률로 임베딩 요청에 429(retry-after-ms 포함)를 돌려줘 클라이언트의 재시도를
+확인할 수 있고, 동시에 처리 중인 임베딩 요청 수의 최댓값을 기록합니다.
+
+사용 예:
+    python benchmarks/fake_openai_server.py --port 9000 --latency 0.3
+    OPENAI_BASE_URL=http://127.0.0.1:9000/v1 OPENAI_API_KEY=fake python main.py
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import threading
+import time
+from array import array
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+
+
+def fake_vector(item, dim: int) -> List[float]:
+    """입력(문자열 또는 토큰 배열)에 대한 결정적 단위 벡터"""
+    seed = hashlib.sha256(json.dumps(item, ensure_ascii=False).encode('utf-8')).digest()
+    rng = random.Random(seed)
+    vector = [rng.gauss(0.0, 1.0) for _ in range(dim)]
+    norm = sum(v * v for v in vector) ** 0.5
+    return [v / norm for v in vector]
+
+
+FAKE_ANSWER = "제공된 정보에 따르면 수강신청은 2월 13일부터 15일까지입니다."
+
+
+def make_handler(latency: float, per_item_latency: float, dim: int,
+                 chat_latency: float = 1.0, max_concurrency: int = 0,
+                 rate_limit_rate: float = 0.0):
+    """서버 설정을 담은 요청 핸들러 클래스 생성"""
+    # 임베딩 API 동시 처리 한도 (0이면 무제한) - 실제 API의 rate limit 흉내
+    slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency > 0 else None
+    rng = random.Random(0)
+
+    class FakeOpenAIHandler(BaseHTTPRequestHandler):
+        # requests/inputs: 처리한 임베딩 요청/입력, rate_limited: 429 응답,
+        # active/max_active: 동시에 처리 중인/최대 임베딩 요청, chat_requests: 채팅 요청
+        stats = {'requests': 0, 'inputs': 0, 'rate_limited': 0, 'active': 0, 'max_active': 0,
+                 'chat_requests': 0}
+        stats_lock = threading.Lock()
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b'{}')
+
+            path = self.path.rstrip('/')
+            if path.endswith('/embeddings'):
+                self._embeddings(body)
+            elif path.endswith('/chat/completions'):
+                self._chat(body)
+            else:
+                self.send_error(404)
+
+        def _send_json(self, data) -> None:
+            payload = json.dumps(data, ensure_ascii=False).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _chat(self, body) -> None:
+            with self.stats_lock:
+                self.stats['chat_requests'] += 1
+
+            model = body.get('model', 'fake')
+            usage = {'prompt_tokens': 0, 'completion_tokens': len(FAKE_ANSWER),
+                     'total_tokens': len(FAKE_ANSWER)}
+            if not body.get('stream'):
+                time.sleep(chat_latency)
+                self._send_json({
+                    'id': 'chatcmpl-fake', 'object': 'chat.completion',
+                    'created': int(time.time()), 'model': model,
+                    'choices': [{'index': 0, 'finish_reason': 'stop',
+                                 'message': {'role': 'assistant', 'content': FAKE_ANSWER}}],
+                    'usage': usage,
+                })
+                return
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.end_headers()
+            tokens = FAKE_ANSWER.split(' ')
+            for i, token in enumerate(tokens):
+                time.sleep(chat_latency / len(tokens))
+                chunk = {
+                    'id': 'chatcmpl-fake', 'object': 'chat.completion.chunk',
+                    'created': int(time.time()), 'model': model,
+                    'choices': [{'index': 0, 'finish_reason': None,
+                                 'delta': {'content': token if i == 0 else ' ' + token}}],
+                }
+                self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode('utf-8'))
+                self.wfile.flush()
+            self.wfile.write(b"data: [DONE]\n\n")
+
+        def _embeddings(self, body) -> None:
+            inputs = body.get('input', [])
+            if isinstance(inputs, str) or (inputs and isinstance(inputs[0], int)):
+                inputs = [inputs]
+
+            with self.stats_lock:
+                limited = rng.random() < rate_limit_rate
+                if limited:
+                    self.stats['rate_limited'] += 1
+                else:
+                    self.stats['requests'] += 1
+                    self.stats['inputs'] += len(inputs)
+                self.stats['active'] += 1
+                self.stats['max_active'] = max(self.stats['max_active'], self.stats['active'])
+
+            try:
+                if limited:
+                    self._rate_limited()
+                    return
+                # 네트워크 왕복 + 모델 연산 시간 흉내
+                if slots is not None:
+                    with slots:
+                        time.sleep(latency + per_item_latency * len(inputs))
+                else:
+                    time.sleep(latency + per_item_latency * len(inputs))
+            finally:
+                with self.stats_lock:
+                    self.stats['active'] -= 1
+
+            data = []
+            for index, item in enumerate(inputs):
+                vector = fake_vector(item, dim)
+                if body.get('encoding_format') == 'base64':
+                    vector = base64.b64encode(array('f', vector).tobytes()).decode('ascii')
+                data.append({'object': 'embedding', 'index': index, 'embedding': vector})
+
+            tokens = sum(len(item) for item in inputs)
+            self._send_json({
+                'object': 'list',
+                'data': data,
+                'model': body.get('model', 'fake'),
+                'usage': {'prompt_tokens': tokens, 'total_tokens': tokens},
+            })
+
+        def _rate_limited(self) -> None:
+            payload = json.dumps({'error': {'message': 'Rate limit reached',
+                                            'type': 'requests', 'code': 'rate_limit_exceeded'}}
+                                 ).encode('utf-8')
+            self.send_response(429)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.send_header('retry-after-ms', '10')
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass  # 요청 로그 생략
+
+    return FakeOpenAIHandler
+
+
+class _FakeServer(ThreadingHTTPServer):
+    # 기본 listen 대기열(5)로는 동시 연결이 많을 때 재전송(약 1초) 지연이 생김
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+def start_fake_server(port: int = 0, latency: float = 0.3,
+                      per_item_latency: float = 0.0005,
+                      dim: int = 1536,
+                      chat_latency: float = 1.0,
+                      max_concurrency: int = 0,
+                      rate_limit_rate: float = 0.0) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    백그라운드 스레드에서 가짜 서버 시작
+
+    Args:
+        port: 포트 (0이면 빈 포트 자동 선택)
+        latency: 임베딩 요청당 고정 지연 (초)
+        per_item_latency: 임베딩 입력 1개당 추가 지연 (초)
+        dim: 벡터 차원
+        chat_latency: 채팅 응답 전체 생성 시간 (초)
+        max_concurrency: 동시에 처리할 임베딩 요청 수 (0이면 무제한)
+        rate_limit_rate: 임베딩 요청에 429를 돌려줄 확률
+
+    Returns:
+        (서버 인스턴스, base_url) - 통계는 server.RequestHandlerClass.stats,
+        종료 시 server.shutdown() 호출
+    """
+    handler = make_handler(latency, per_item_latency, dim, chat_latency,
+                           max_concurrency, rate_limit_rate)
+    server = _FakeServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    return server, base_url
+
+
+def main():
+    """서버 단독 실행"""
+    parser = argparse.ArgumentParser(description="가짜 OpenAI 서버")
+    parser.add_argument('--port', type=int, default=9000)
+    parser.add_argument('--latency', type=float, default=0.3)
+    parser.add_argument('--per-item-latency', type=float, default=0.0005)
+    parser.add_argument('--dim', type=int, default=1536)
+    parser.add_argument('--chat-latency', type=float, default=1.0)
+    parser.add_argument('--max-concurrency', type=int, default=0)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server, base_url = start_fake_server(args.port, args.latency,
+                                         args.per_item_latency, args.dim,
+                                         args.chat_latency, args.max_concurrency,
+                                         args.rate_limit_rate)
+    print(f"🧪 가짜 OpenAI 서버 실행 중: {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+로컬 가짜 학교 홈페이지 서버 (크롤러 벤치마크/테스트용)
+
+GET /page/{i}: 본문과 이미지 태그가 있는 게시글 HTML
+GET /img/{i}-{k}.png: 결정적인 이미지 바이트 (일부는 10KB 미만 아이콘)
+
+요청마다 latency(+ 0~jitter 사이의 임의 지연)만큼 지연하고, 초당 요청이 max_rate를 넘거나
+error_rate 확률로 429(Retry-After 포함)/503을 돌려줘 크롤러의 감속과 재시도를 확인할 수 있습니다.
+응답에는 ETag/Last-Modified를 붙이고 If-None-Match/If-Modified-Since가 맞으면 304를 돌려줍니다.
+server.RequestHandlerClass.revisions[i]를 올리면 페이지 i의 본문(과 ETag)이 바뀝니다.
+서버가 받은 요청 시각(429를 돌려준 요청은 throttled_times에도)과 최대 동시 요청 수를 기록하므로
+크롤러가 서버에 보낸 부하를 측정할 수 있습니다.
+
+사용 예:
+    python benchmarks/fake_site_server.py --port 9100 --latency 0.05
+"""
+
+import argparse
+import hashlib
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+IMAGES_PER_PAGE = 4
+
+
+# 모든 응답의 Last-Modified (서버 시작 시각)
+_LAST_MODIFIED = formatdate(usegmt=True)
+
+
+def page_html(index: int, revision: int = 0) -> str:
+    """게시글 페이지 HTML (이미지 IMAGES_PER_PAGE개, 마지막 이미지는 아이콘)"""
+    images = "\n".join(f'<img src="/img/{index}-{k}.png" alt="안내 이미지 {k}">'
+                       for k in range(IMAGES_PER_PAGE))
+    edited = f"<p>수정 {revision}: 일정이 변경되었습니다.</p>\n" if revision else ""
+    return (f"<!DOCTYPE html>\n<html><head><title>공지 {index} | 동양대학교</title></head>\n"
+            f"<body><h2>공지 {index}</h2>\n<p>{index}번 공지 본문입니다. 수강신청 일정을 안내합니다.</p>\n"
+            f"{edited}{images}\n</body></html>\n")
+
+
+def image_bytes(index: int, k: int) -> bytes:
+    """결정적인 이미지 바이트 (마지막 이미지는 2KB 아이콘, 나머지는 20KB)"""
+    size = 2 * 1024 if k == IMAGES_PER_PAGE - 1 else 20 * 1024
+    return random.Random(index * 100 + k).randbytes(size)
+
+
+def make_handler(latency: float, max_rate: float, error_rate: float, retry_after: float,
+                 jitter: float = 0.0):
+    """서버 설정을 담은 요청 핸들러 클래스 생성"""
+    rng = random.Random(0)
+
+    class FakeSiteHandler(BaseHTTPRequestHandler):
+        # requests: 받은 요청, throttled: 429 응답, errors: 503 응답, not_modified: 304 응답,
+        # body_bytes: 보낸 본문 크기, max_active: 최대 동시 요청
+        stats = {'requests': 0, 'throttled': 0, 'errors': 0, 'not_modified': 0, 'body_bytes': 0,
+                 'active': 0, 'max_active': 0}
+        request_times = []
+        throttled_times = []
+        revisions = defaultdict(int)
+        stats_lock = threading.Lock()
+        _recent = deque()
+
+        def do_GET(self):
+            now = time.monotonic()
+            with self.stats_lock:
+                self.stats['requests'] += 1
+                self.request_times.append(now)
+                self.stats['active'] += 1
+                self.stats['max_active'] = max(self.stats['max_active'], self.stats['active'])
+                # 최근 1초 동안의 요청 수로 과부하 판단
+                self._recent.append(now)
+                while self._recent and self._recent[0] < now - 1.0:
+                    self._recent.popleft()
+                overloaded = max_rate > 0 and len(self._recent) > max_rate
+                failed = not overloaded and rng.random() < error_rate
+                delay = latency + (rng.random() * jitter if jitter else 0.0)
+                if overloaded:
+                    self.stats['throttled'] += 1
+                    self.throttled_times.append(now)
+                elif failed:
+                    self.stats['errors'] += 1
+            try:
+                time.sleep(delay)
+                if overloaded:
+                    self._send(429, b'Too Many Requests', 'text/plain',
+                               {'Retry-After': f"{retry_after:g}"})
+                elif failed:
+                    self._send(503, b'Service Unavailable', 'text/plain')
+                else:
+                    self._route()
+            finally:
+                with self.stats_lock:
+                    self.stats['active'] -= 1
+
+        def _route(self) -> None:
+            parts = self.path.strip('/').split('/')
+            if len(parts) == 2 and parts[0] == 'page' and parts[1].isdigit():
+                index = int(parts[1])
+                self._send_validated(page_html(index, self.revisions[index]).encode('utf-8'),
+                                     'text/html; charset=utf-8')
+            elif len(parts) == 2 and parts[0] == 'img' and parts[1].endswith('.png'):
+                index, k = parts[1][:-len('.png')].split('-')
+                self._send_validated(image_bytes(int(index), int(k)), 'image/png')
+            else:
+                self.send_error(404)
+
+        def _send_validated(self, body: bytes, content_type: str) -> None:
+            """ETag/Last-Modified를 붙여 응답 (조건부 요청이 맞으면 304)"""
+            etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+            headers = {'ETag': etag, 'Last-Modified': _LAST_MODIFIED}
+            if_none_match = self.headers.get('If-None-Match')
+            if (if_none_match == etag
+                    or (if_none_match is None
+                        and self.headers.get('If-Modified-Since') == _LAST_MODIFIED)):
+                with self.stats_lock:
+                    self.stats['not_modified'] += 1
+                self.send_response(304)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                return
+            self._send(200, body, content_type, headers)
+
+        def _send(self, status: int, body: bytes, content_type: str, headers=None) -> None:
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+            with self.stats_lock:
+                self.stats['body_bytes'] += len(body)
+
+        def log_message(self, format, *args):
+            pass  # 요청 로그 생략
+
+    return FakeSiteHandler
+
+
+class _FakeServer(ThreadingHTTPServer):
+    # 기본 listen 대기열(5)로는 동시 연결이 많을 때 재전송(약 1초) 지연이 생김
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+def start_fake_site(port: int = 0, latency: float = 0.05, max_rate: float = 0.0,
+                    error_rate: float = 0.0, retry_after: float = 1.0,
+                    jitter: float = 0.0) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    백그라운드 스레드에서 가짜 홈페이지 서버 시작
+
+    Args:
+        port: 포트 (0이면 빈 포트 자동 선택)
+        latency: 요청당 지연 (초)
+        max_rate: 초당 허용 요청 수 (넘으면 429, 0이면 무제한)
+        error_rate: 503을 돌려줄 확률
+        retry_after: 429 응답의 Retry-After (초)
+        jitter: 요청마다 더할 임의 지연의 최댓값 (초, 응답 순서를 섞을 때)
+
+    Returns:
+        (서버 인스턴스, base_url) - 통계는 server.RequestHandlerClass.stats,
+        종료 시 server.shutdown() 호출
+    """
+    handler = make_handler(latency, max_rate, error_rate, retry_after, jitter)
+    server = _FakeServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    return server, base_url
+
+
+def main():
+    """서버 단독 실행"""
+    parser = argparse.ArgumentParser(description="가짜 학교 홈페이지 서버")
+    parser.add_argument('--port', type=int, default=9100)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--max-rate', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server, base_url = start_fake_site(args.port, args.latency, args.max_rate, args.error_rate)
+    print(f"🧪 가짜 홈페이지 서버 실행 중: {base_url}/page/0")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+보일러플레이트 청크 중복 제거 (MinHash + LSH)
+
+크롤링한 페이지마다 반복되는 메뉴, 푸터, 연락처 문구는 clean_html로 다 지워지지 않아
+분할 후 같은(또는 거의 같은) 청크가 수백 번 임베딩·저장됩니다.
+임베딩 전에 청크들의 MinHash 서명을 만들고 LSH 밴드 버킷으로 후보를 찾아,
+추정 자카드 유사도가 임계값 이상인 청크를 처음 나온 청크(대표) 하나로 합칩니다.
+
+- 서명: 공백을 정규화한 글자 n-gram(shingle) 해시를 num_perm개 구간(bin)으로 나눠 구간별 최솟값
+  (one permutation hashing - 해시 함수 num_perm개를 따로 돌리는 것보다 수십 배 빠름,
+  shingle이 없는 빈 구간은 오른쪽 이웃 구간 값으로 채움)
+- 후보: 서명을 bands개 밴드로 나눠 한 밴드라도 같으면 후보 (대표 청크만 버킷에 등록하므로
+  비슷한 청크가 꼬리를 물고 이어져 원래와 다른 청크까지 합쳐지지 않음)
+- 숫자(날짜, 학년도, 금액 등)가 다른 청크는 유사도와 관계없이 합치지 않음
+  ("1학기"/"2학기" 공지처럼 본문은 거의 같아도 내용이 다른 청크 보호)
+
+서명과 LSH 후보 탐색은 clean_data의 문서 중복 제거와 같은 data/near_duplicates.py를 사용하고,
+이 모듈은 청크 순서(처음 나온 청크가 대표), 숫자 규칙, 메타데이터 기록만 담당합니다.
+
+대표 청크의 metadata에는 합쳐진 사본 수(duplicate_count)와 사본이 있던 출처
+(duplicate_sources, 줄바꿈으로 구분 - Chroma 메타데이터는 문자열만 저장)를 기록합니다.
+"""
+
+import re
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+from langchain.schema import Document
+
+from data.near_duplicates import NearDuplicateDetector
+from tokenizer import count_tokens_batch
+
+_WHITESPACE = re.compile(r'\s+')
+_NUMBERS = re.compile(r'\d+')
+
+
+class ChunkDeduplicator:
+    """MinHash + LSH 기반 근사 중복 청크 제거 (탐지는 data/near_duplicates.py)"""
+
+    def __init__(self, threshold: float = 0.9, num_perm: int = 128, bands: int = 16,
+                 shingle_size: int = 5, seed: int = 1):
+        """
+        초기화
+
+        Args:
+            threshold: 같은 청크로 볼 최소 자카드 유사도 (서명으로 추정)
+            num_perm: MinHash 서명 길이 (구간 수)
+            bands: LSH 밴드 수 (num_perm의 약수, 많을수록 후보를 넓게 찾음)
+            shingle_size: shingle 글자 수
+            seed: 해시 시드 (같으면 항상 같은 결과)
+
+        Raises:
+            ValueError: 설정이 잘못된 경우
+        """
+        self.detector = NearDuplicateDetector(threshold=threshold, num_perm=num_perm,
+                                              bands=bands, shingle_size=shingle_size, seed=seed)
+        self.threshold = threshold
+
+    def deduplicate(self, documents: List[Document]) -> Tuple[List[Document], Dict[str, Any]]:
+        """
+        근사 중복 청크를 대표 청크 하나로 합치기
+
+        대표는 처음 나온 청크이며, 대표의 metadata에 duplicate_count와
+        duplicate_sources(대표와 다른 출처들)를 기록합니다.
+        입력 순서가 같으면 결과도 항상 같습니다.
+
+        Args:
+            documents: 청크 리스트
+
+        Returns:
+            (남은 청크 리스트, 보고서 딕셔너리)
+            보고서: chunks(입력), kept(남은 청크), collapsed(합쳐진 청크),
+            clusters(사본이 있는 대표 청크 수), saved_tokens(임베딩을 건너뛴 토큰 수),
+            top(사본이 많은 대표 청크 미리보기)
+        """
+        numbers: Dict[int, List[str]] = {}
+
+        def numbers_of(index: int) -> List[str]:
+            if index not in numbers:
+                numbers[index] = _NUMBERS.findall(documents[index].page_content)
+            return numbers[index]
+
+        # 대표는 처음 나온 청크, 숫자가 다른 청크는 합치지 않음
+        canonical_of = self.detector.find_duplicates(
+            [doc.page_content for doc in documents], longest_first=False,
+            can_merge=lambda index, candidate: numbers_of(index) == numbers_of(candidate))
+
+        # 대표 청크에 사본 출처 기록
+        copies: Dict[int, List[int]] = {}
+        for index, canonical in enumerate(canonical_of):
+            if canonical != index:
+                copies.setdefault(canonical, []).append(index)
+
+        kept = []
+        for index, doc in enumerate(documents):
+            if canonical_of[index] != index:
+                continue
+            if index in copies:
+                own_source = doc.metadata.get('source')
+                sources = sorted({documents[copy].metadata.get('source', '')
+                                  for copy in copies[index]} - {own_source})
+                doc.metadata['duplicate_count'] = len(copies[index])
+                doc.metadata['duplicate_sources'] = "\n".join(sources)
+            kept.append(doc)
+
+        collapsed = [documents[index] for index, canonical in enumerate(canonical_of)
+                     if canonical != index]
+        top = sorted(copies.items(), key=lambda item: -len(item[1]))[:5]
+        report = {
+            'chunks': len(documents),
+            'kept': len(kept),
+            'collapsed': len(collapsed),
+            'clusters': len(copies),
+            'saved_tokens': sum(count_tokens_batch([doc.page_content for doc in collapsed])),
+            'top': [{
+                'copies': len(members),
+                'sources': len(Counter(documents[member].metadata.get('source')
+                                       for member in members)),
+                'preview': _WHITESPACE.sub(' ', documents[canonical].page_content)[:60],
+            } for canonical, members in top],
+        }
+        return kept, report
+
+
+def print_dedup_report(report: Dict[str, Any]) -> None:
+    """중복 제거 보고서 출력"""
+    if not report['collapsed']:
+        print("🧹 근사 중복 청크 없음")
+        return
+    print(f"🧹 근사 중복 청크 {report['collapsed']}개를 대표 청크 {report['clusters']}개로 합침 "
+          f"({report['chunks']} → {report['kept']}개, 임베딩 {report['saved_tokens']:,}토큰 절약)")
+    for item in report['top']:
+        print(f"  - 사본 {item['copies']}개 (출처 {item['sources']}곳): {item['preview']}")
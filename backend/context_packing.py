@@ -0,0 +1,231 @@
+"""
+토큰 예산 기반 컨텍스트 구성
+
+검색 결과를 그대로 프롬프트에 넣으면 chunk_overlap 때문에 이웃 청크가
+같은 문장을 반복하고, 거의 같은 공지가 여러 번 들어가 토큰이 낭비됩니다.
+검색과 프롬프트 사이에서 다음 순서로 컨텍스트를 다시 구성합니다.
+
+1. 후보를 넉넉히 가져옴 (over-fetch)
+2. 같은 출처에서 겹치거나 이어지는 청크를 하나로 병합 (겹친 부분은 한 번만)
+3. 이미 고른 내용에 거의 포함되는 청크 제거 (문자 n-gram 포함도)
+4. 검색 순위대로 토큰 예산 안에 채움
+
+각 결과 문서의 metadata['packing']에 사용 토큰과 원본 토큰을 기록하므로
+요청마다 절약한 프롬프트 토큰을 계산할 수 있습니다.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from tokenizer import count_tokens
+
+
+def _shingles(text: str, n: int = 5) -> Set[str]:
+    """공백을 정리한 문자 n-gram 집합"""
+    text = re.sub(r'\s+', ' ', text).strip()
+    if len(text) <= n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def _text_overlap(left: str, right: str, min_overlap: int, max_overlap: int) -> int:
+    """left의 끝과 right의 시작이 겹치는 가장 긴 길이 (min_overlap 미만이면 0)"""
+    longest = min(len(left), len(right), max_overlap)
+    for length in range(longest, min_overlap - 1, -1):
+        if left.endswith(right[:length]):
+            return length
+    return 0
+
+
+class _Group:
+    """병합된 청크 묶음 (검색 순위가 가장 높은 청크의 순위를 따름)"""
+
+    def __init__(self, rank: int, doc: Document, tokens: int):
+        self.rank = rank
+        self.text = doc.page_content
+        self.metadata = dict(doc.metadata)
+        self.start = doc.metadata.get('start_index')
+        self.chunk_ids = [doc.metadata.get('chunk_id')]
+        self.raw_tokens = tokens
+        self.tokens = 0
+
+    @property
+    def source(self):
+        return self.metadata.get('source')
+
+    def try_merge(self, other: "_Group", min_overlap: int, max_overlap: int) -> bool:
+        """
+        같은 출처의 이어지는 청크면 뒤에 붙임
+
+        start_index가 있으면 위치로, 없으면 텍스트 겹침으로 판단합니다.
+        """
+        if self.source is None or self.source != other.source:
+            return False
+
+        if self.start is not None and other.start is not None:
+            end = self.start + len(self.text)
+            if other.start < self.start or other.start > end:
+                return False
+            overlap = end - other.start
+            merged = self.text + other.text[overlap:]
+        else:
+            overlap = _text_overlap(self.text, other.text, min_overlap, max_overlap)
+            if overlap == 0:
+                return False
+            merged = self.text + other.text[overlap:]
+
+        self.text = merged
+        self.rank = min(self.rank, other.rank)
+        self.chunk_ids.extend(other.chunk_ids)
+        self.raw_tokens += other.raw_tokens
+        return True
+
+
+class ContextPacker:
+    """검색 결과를 토큰 예산에 맞는 중복 없는 컨텍스트로 구성"""
+
+    def __init__(self, max_tokens: int = 1000, duplicate_threshold: float = 0.8,
+                 min_overlap: int = 20, max_overlap: int = 200):
+        """
+        초기화
+
+        Args:
+            max_tokens: 컨텍스트 전체 토큰 예산
+            duplicate_threshold: 이미 고른 내용에 이 비율 이상 포함되는 청크는 제거
+            min_overlap: 텍스트로 청크 연속을 판단할 때 필요한 최소 겹침 글자 수
+            max_overlap: 텍스트 겹침을 찾을 최대 글자 수 (청크 분할 overlap보다 크게)
+        """
+        self.max_tokens = max_tokens
+        self.duplicate_threshold = duplicate_threshold
+        self.min_overlap = min_overlap
+        self.max_overlap = max_overlap
+
+    def _merge_adjacent(self, docs: List[Document]) -> List[_Group]:
+        """같은 출처의 겹치거나 이어지는 청크 병합"""
+        groups = [_Group(rank, doc, count_tokens(doc.page_content))
+                  for rank, doc in enumerate(docs)]
+
+        # 출처별로 문서 내 위치(없으면 검색 순위) 순서로 훑으며 병합
+        def position(group: _Group) -> Tuple[str, int, int]:
+            return (str(group.source), group.start if group.start is not None else -1,
+                    group.rank)
+
+        merged: List[_Group] = []
+        for group in sorted(groups, key=position):
+            # 합쳐진 묶음이 다른 묶음과 또 이어질 수 있으므로 더 이상 합쳐지지 않을 때까지 반복
+            while True:
+                for i, target in enumerate(merged):
+                    if target.try_merge(group, self.min_overlap, self.max_overlap):
+                        group = merged.pop(i)
+                        break
+                    # 위치 정보가 없으면 뒤 청크가 먼저 올 수 있으므로 반대 방향도 확인
+                    if group.try_merge(target, self.min_overlap, self.max_overlap):
+                        merged.pop(i)
+                        break
+                else:
+                    merged.append(group)
+                    break
+        return sorted(merged, key=lambda group: group.rank)
+
+    def pack(self, docs: List[Document]) -> Tuple[List[Document], Dict[str, Any]]:
+        """
+        컨텍스트 구성
+
+        Args:
+            docs: 검색 순위대로 정렬된 후보 청크
+
+        Returns:
+            (프롬프트에 넣을 Document 리스트, 통계)
+            통계: candidates, merged, duplicates, over_budget, chunks,
+                  raw_tokens(후보 전체), tokens(구성된 컨텍스트)
+        """
+        groups = self._merge_adjacent(docs)
+
+        kept: List[_Group] = []
+        kept_shingles: Set[str] = set()
+        duplicates, over_budget, used_tokens = 0, 0, 0
+        for group in groups:
+            shingles = _shingles(group.text)
+            if kept and shingles and \
+                    len(shingles & kept_shingles) / len(shingles) >= self.duplicate_threshold:
+                # 이미 들어간 내용이므로 원본 토큰만 마지막으로 고른 문서에 반영
+                kept[-1].raw_tokens += group.raw_tokens
+                duplicates += 1
+                continue
+
+            tokens = count_tokens(group.text)
+            if used_tokens + tokens > self.max_tokens:
+                if kept:
+                    over_budget += 1
+                    continue
+                # 첫 문서가 예산보다 크면 예산만큼 자름
+                group.text = group.text[:max(1, len(group.text) * self.max_tokens // tokens)]
+                tokens = count_tokens(group.text)
+
+            kept.append(group)
+            kept_shingles |= shingles
+            used_tokens += tokens
+            group.tokens = tokens
+
+        documents = []
+        for group in kept:
+            metadata = dict(group.metadata)
+            metadata['packing'] = {
+                'chunk_ids': group.chunk_ids,
+                'tokens': group.tokens,
+                'raw_tokens': group.raw_tokens,
+            }
+            documents.append(Document(page_content=group.text, metadata=metadata))
+
+        stats = {
+            'candidates': len(docs),
+            'merged': len(docs) - len(groups),
+            'duplicates': duplicates,
+            'over_budget': over_budget,
+            'chunks': len(documents),
+            'raw_tokens': sum(count_tokens(doc.page_content) for doc in docs),
+            'tokens': used_tokens,
+        }
+        return documents, stats
+
+
+def packing_report(documents: List[Document]) -> Optional[Dict[str, int]]:
+    """
+    ContextPacker가 만든 문서들의 토큰 사용 요약
+
+    Args:
+        documents: 체인이 반환한 source_documents
+
+    Returns:
+        chunks, tokens(프롬프트에 넣은 토큰), saved_tokens(같은 내용을 원본 청크로
+        넣었을 때 대비 절약한 토큰) - packing 정보가 없으면 None
+    """
+    packing = [doc.metadata.get('packing') for doc in documents]
+    if not packing or not all(packing):
+        return None
+    tokens = sum(info['tokens'] for info in packing)
+    raw_tokens = sum(info['raw_tokens'] for info in packing)
+    return {
+        'chunks': sum(len(info['chunk_ids']) for info in packing),
+        'tokens': tokens,
+        'saved_tokens': raw_tokens - tokens,
+    }
+
+
+class PackedContextRetriever(BaseRetriever):
+    """후보를 넉넉히 검색한 뒤 ContextPacker로 컨텍스트를 구성하는 검색기"""
+
+    retriever: BaseRetriever
+    packer: Any
+
+    def _get_relevant_documents(
+            self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        candidates = self.retriever.invoke(
+            query, config={"callbacks": run_manager.get_child()})
+        documents, _ = self.packer.pack(candidates)
+        return documents
@@ -5,74 +5,224 @@
 1. HTML 태그 제거
 2. 중복 URL 제거
 3. 불필요한 텍스트 정리
-4. 너무 짧은 문서 필터링
+4. 내용이 거의 같은 문서(근사 중복) 제거
+5. 너무 짧은 문서 필터링
 """
 
+import argparse
 import json
+import os
 import re
-from typing import List, Dict
-from collections import Counter
-from bs4 import BeautifulSoup
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, tee
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
+from collections import Counter, deque
+from lxml import etree
+
+from near_duplicates import NearDuplicateDetector
+from records import iter_records, write_records
+from stage_cache import StageCache
+
+# 근사 중복으로 볼 최소 유사도 (clean_data.main과 pipeline.py 공통 기본값)
+NEAR_DUPLICATE_THRESHOLD = 0.9
+
+# clean_html 결과 버전 (단계 캐시 키에 포함 - 정제 규칙이 바뀌면 올림)
+CLEAN_HTML_VERSION = 1
+
+
+# 본문과 함께 통째로 지우는 태그
+_REMOVED_TAGS = frozenset(['script', 'style', 'nav', 'footer', 'header',
+                           'iframe', 'noscript', 'meta', 'link'])
+# BeautifulSoup의 get_text가 건너뛰는 문자열을 담는 태그 (루비 주석, 템플릿 등)
+_SKIPPED_STRING_TAGS = frozenset(['rt', 'rp', 'style', 'script', 'template'])
+# 공백만 있는 문자열도 그대로 두는 태그
+_PRESERVE_WHITESPACE_TAGS = frozenset(['pre', 'textarea'])
+_ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+# 반복되는 패턴 (네비게이션 메뉴 등) - 예: "Previous tab Next tab"
+_NAVIGATION_LINE = re.compile(r'^(Previous|Next|tab|\||»|«)+\s*(Previous|Next|tab|\||»|«)*$')
+_COMMON_LINE = re.compile(r'^(?:목록보기|인쇄|좋아요 \d+ 싫어요 \d+|Read more|조회 \d+)$')
+_DIGIT = re.compile(r'\d')
+
+
+class _TextTarget:
+    """
+    lxml HTML 파서 타깃 - 트리를 만들지 않고 본문 문자열만 모음
+
+    BeautifulSoup(content, 'lxml')으로 파싱해 _REMOVED_TAGS를 decompose한 뒤
+    get_text()를 부른 것과 같은 문자열을 만듭니다.
+    (같은 파서 이벤트를 받아 BeautifulSoup과 같은 규칙으로 문자열을 나누고 합침)
+    """
+
+    def __init__(self):
+        self.parts = []
+        self.pending = []
+        self.stack = []
+        self.hidden = 0
+        self.preserve = 0
+
+    def _end_data(self):
+        """모아 둔 문자열 조각을 하나의 문자열로 확정 (공백뿐이면 줄바꿈 또는 공백 하나로)"""
+        if not self.pending:
+            return
+        data = ''.join(self.pending)
+        self.pending = []
+        if self.hidden:
+            return
+        if not self.preserve and not data.strip(_ASCII_SPACES):
+            data = '\n' if '\n' in data else ' '
+        self.parts.append(data)
+
+    def start(self, tag, attrib):
+        self._end_data()
+        self.stack.append(tag)
+        if tag in _REMOVED_TAGS or tag in _SKIPPED_STRING_TAGS:
+            self.hidden += 1
+        if tag in _PRESERVE_WHITESPACE_TAGS:
+            self.preserve += 1
+
+    def end(self, tag):
+        self._end_data()
+        # 가장 가까운 같은 이름의 태그까지 닫음 (없으면 무시)
+        if tag not in self.stack:
+            return
+        while True:
+            name = self.stack.pop()
+            if name in _REMOVED_TAGS or name in _SKIPPED_STRING_TAGS:
+                self.hidden -= 1
+            if name in _PRESERVE_WHITESPACE_TAGS:
+                self.preserve -= 1
+            if name == tag:
+                return
+
+    def data(self, data):
+        self.pending.append(data)
+
+    def comment(self, text):
+        self._end_data()
+
+    def pi(self, target, data):
+        self._end_data()
+
+    def doctype(self, name, pubid, system):
+        self._end_data()
+
+    def close(self):
+        self._end_data()
+        return ''.join(self.parts)
+
+
+def _extract_text(content: str) -> str:
+    """HTML에서 보이는 본문 문자열 추출 (제거 대상 태그 제외)"""
+    if content.startswith('\ufeff'):
+        content = content[1:]
+    parser = etree.HTMLParser(target=_TextTarget(), recover=True)
+    try:
+        parser.feed(content)
+        return parser.close()
+    except (UnicodeDecodeError, LookupError, etree.ParserError):
+        # 유니코드로 파싱하지 못하면 UTF-8 바이트로 다시 시도
+        parser = etree.HTMLParser(target=_TextTarget(), recover=True, encoding='utf8')
+        parser.feed(content.encode('utf8'))
+        return parser.close()
 
 
 def clean_html(content: str) -> str:
     """
     HTML 태그를 제거하고 텍스트를 정제
 
+    BeautifulSoup 트리를 만들지 않고 lxml 파서 이벤트에서 바로 본문을 모읍니다.
+    결과는 BeautifulSoup(lxml)으로 파싱해 정제하던 이전 구현과 글자 하나까지 같습니다.
+
     Args:
         content: 원본 HTML 또는 텍스트
 
     Returns:
         정제된 텍스트
     """
-    # BeautifulSoup으로 파싱
-    soup = BeautifulSoup(content, 'lxml')
+    text = _extract_text(content)
 
-    # 불필요한 태그 완전 제거
-    for tag in soup(['script', 'style', 'nav', 'footer', 'header',
-                     'iframe', 'noscript', 'meta', 'link']):
-        tag.decompose()
+    # 빈 줄과 메뉴/버튼 문구 줄 제거
+    lines = [line.strip() for line in text.splitlines()]
+    lines = [line for line in lines
+             if line and not _NAVIGATION_LINE.match(line) and not _COMMON_LINE.match(line)]
 
-    # 텍스트 추출
-    text = soup.get_text()
+    # 연속된 공백(줄바꿈 포함)을 하나로
+    return ' '.join('\n'.join(lines).split())
 
-    # 중복 공백/줄바꿈 제거
-    lines = [line.strip() for line in text.splitlines()]
-    lines = [line for line in lines if line]  # 빈 줄 제거
 
-    # 반복되는 패턴 제거 (네비게이션 메뉴 등)
-    # 예: "Previous tab Next tab" 같은 패턴
-    lines = [line for line in lines if not re.match(r'^(Previous|Next|tab|\||»|«)+\s*(Previous|Next|tab|\||»|«)*$', line)]
+def _clean_html_chunk(contents: List[str]) -> List[str]:
+    """프로세스 풀 작업 단위 (문서 묶음 정제)"""
+    return [clean_html(content) for content in contents]
 
-    # 특수 패턴 제거
-    common_patterns = [
-        r'^목록보기$',
-        r'^인쇄$',
-        r'^좋아요 \d+ 싫어요 \d+$',
-        r'^Read more$',
-        r'^조회 \d+$',
-    ]
 
-    filtered_lines = []
-    for line in lines:
-        skip = False
-        for pattern in common_patterns:
-            if re.match(pattern, line.strip()):
-                skip = True
-                break
-        if not skip:
-            filtered_lines.append(line)
+def _submit_chunk(executor: Optional[ProcessPoolExecutor], chunk: List[str],
+                  cache: Optional[StageCache]) -> Tuple[List[str], List[Optional[str]], object]:
+    """묶음에서 캐시에 없는 문서만 정제 요청 → (입력 해시, 캐시 결과, 정제 결과 또는 Future)"""
+    keys = [StageCache.input_hash(content) for content in chunk] if cache else []
+    cached = ([cache.get('clean_html', CLEAN_HTML_VERSION, key) for key in keys] if cache
+              else [None] * len(chunk))
+    missing = [content for content, hit in zip(chunk, cached) if hit is None]
+    if executor is None or not missing:
+        return keys, cached, _clean_html_chunk(missing)
+    return keys, cached, executor.submit(_clean_html_chunk, missing)
 
-    # 최종 텍스트 조합
-    text = '\n'.join(filtered_lines)
 
-    # 연속된 공백을 하나로
-    text = re.sub(r'\s+', ' ', text)
+def _chunk_result(entry: Tuple[List[str], List[Optional[str]], object],
+                  cache: Optional[StageCache]) -> List[str]:
+    """캐시 결과와 새로 정제한 결과를 입력 순서대로 합치고 새 결과는 캐시에 저장"""
+    keys, cached, result = entry
+    cleaned = iter(result if isinstance(result, list) else result.result())
+    texts = [next(cleaned) if hit is None else hit for hit in cached]
+    if cache:
+        cache.put_many('clean_html', CLEAN_HTML_VERSION,
+                       [(key, text) for key, text, hit in zip(keys, texts, cached) if hit is None])
+    return texts
 
-    # 3개 이상 연속된 줄바꿈을 2개로
-    text = re.sub(r'\n{3,}', '\n\n', text)
 
-    return text.strip()
+def iter_clean_html(contents: Iterable[str], workers: Optional[int] = None,
+                    chunk_size: int = 64, cache: Optional[StageCache] = None) -> Iterator[str]:
+    """
+    여러 문서를 프로세스 풀에서 나눠 정제 (입력 순서대로 반환)
+
+    입력은 필요한 만큼만 (프로세스마다 묶음 2개씩) 앞서 읽으므로
+    제너레이터를 넘기면 메모리 사용량이 문서 수와 관계없이 일정합니다.
+    cache를 주면 본문 해시가 같은 문서는 정제하지 않고 저장된 결과를 사용합니다.
+
+    Args:
+        contents: 원본 HTML 또는 텍스트 이터러블
+        workers: 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 처리)
+        chunk_size: 프로세스에 한 번에 넘길 문서 수
+        cache: 단계 캐시 (None이면 캐시 사용 안 함)
+
+    Returns:
+        정제된 텍스트 이터레이터
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 and cache is None:
+        yield from map(clean_html, contents)
+        return
+
+    contents = iter(contents)
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        pending = deque()
+        while True:
+            chunk = list(islice(contents, chunk_size))
+            if chunk:
+                pending.append(_submit_chunk(executor, chunk, cache))
+            if pending and (not chunk or len(pending) >= 2 * workers):
+                yield from _chunk_result(pending.popleft(), cache)
+            elif not chunk:
+                return
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def _base_url(url: str) -> str:
+    """URL에서 쿼리 파라미터 제거하여 기본 URL만 비교"""
+    return url.split('?')[0]
 
 
 def remove_duplicates(data: List[Dict]) -> List[Dict]:
@@ -88,9 +238,7 @@ def remove_duplicates(data: List[Dict]) -> List[Dict]:
     seen_urls = {}
 
     for item in data:
-        url = item['url']
-        # URL에서 쿼리 파라미터 제거하여 기본 URL만 비교
-        base_url = url.split('?')[0]
+        base_url = _base_url(item['url'])
 
         if base_url not in seen_urls:
             seen_urls[base_url] = item
@@ -102,6 +250,55 @@ def remove_duplicates(data: List[Dict]) -> List[Dict]:
     return list(seen_urls.values())
 
 
+def remove_near_duplicates(data: List[Dict],
+                           threshold: Optional[float] = NEAR_DUPLICATE_THRESHOLD) -> List[Dict]:
+    """
+    내용이 거의 같은 문서 제거 (MinHash + LSH)
+
+    다른 경로로 다시 게시된 게시글, 거의 같은 페이지 목록처럼 URL이 달라
+    remove_duplicates로 걸러지지 않는 문서를 정제된 content 기준으로 찾습니다.
+    묶음마다 가장 긴 문서를 남기고, 남긴 문서의 duplicate_urls에 제거된 문서의 URL을 기록합니다.
+
+    Args:
+        data: 문서 리스트 (clean_html로 정제된 content)
+        threshold: 중복으로 볼 최소 자카드 유사도 (None이면 근사 중복 제거 안 함)
+
+    Returns:
+        근사 중복이 제거된 문서 리스트 (원래 순서 유지)
+
+    Raises:
+        ValueError: threshold가 0보다 크고 1 이하가 아닌 경우
+    """
+    if threshold is None:
+        return data
+
+    detector = NearDuplicateDetector(threshold=threshold)
+    canonical_of = detector.find_duplicates(item['content'] for item in data)
+
+    kept = []
+    for index, item in enumerate(data):
+        canonical = canonical_of[index]
+        if canonical == index:
+            kept.append(item)
+        else:
+            data[canonical].setdefault('duplicate_urls', []).append(item['url'])
+    return kept
+
+
+def _is_low_quality(content: str, min_length: int) -> bool:
+    """너무 짧거나 숫자/반복 문자만 많은 콘텐츠인지"""
+    # 너무 짧은 문서 제외
+    if len(content) < min_length:
+        return True
+
+    # 의미 없는 문서 제외 (거의 숫자만 있거나)
+    if len(_DIGIT.findall(content)) / len(content) > 0.5:
+        return True
+
+    # 반복되는 문자가 너무 많은 경우 제외
+    return len(set(content)) / len(content) < 0.1
+
+
 def filter_low_quality(data: List[Dict], min_length: int = 50) -> List[Dict]:
     """
     품질이 낮은 문서 필터링
@@ -113,75 +310,198 @@ def filter_low_quality(data: List[Dict], min_length: int = 50) -> List[Dict]:
     Returns:
         필터링된 문서 리스트
     """
-    filtered = []
-
-    for item in data:
-        content = item['content']
-
-        # 너무 짧은 문서 제외
-        if len(content) < min_length:
-            continue
-
-        # 의미 없는 문서 제외 (거의 숫자만 있거나)
-        if len(re.findall(r'\d', content)) / len(content) > 0.5:
-            continue
-
-        # 반복되는 문자가 너무 많은 경우 제외
-        if len(set(content)) / len(content) < 0.1:
-            continue
+    return [item for item in data if not _is_low_quality(item['content'], min_length)]
+
+
+class DocumentStats:
+    """문서 수, 콘텐츠 길이, URL 도메인 분포를 문서를 읽으면서 집계"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_chars = 0
+        self.domains = Counter()
+
+    def add(self, item: Dict) -> None:
+        """문서 하나 집계"""
+        url = item.get('url', '')
+        self.count += 1
+        self.total_chars += len(item.get('content', ''))
+        self.domains[url.split('/')[2] if len(url.split('/')) > 2 else url] += 1
+
+    def track(self, records: Iterable[Dict]) -> Iterator[Dict]:
+        """문서를 그대로 넘기면서 집계"""
+        for item in records:
+            self.add(item)
+            yield item
+
+
+def _clean_html_cached(content: str, cache: Optional[StageCache]) -> str:
+    """clean_html (cache가 있으면 본문 해시로 저장된 결과 사용)"""
+    if cache is None:
+        return clean_html(content)
+    key = StageCache.input_hash(content)
+    text = cache.get('clean_html', CLEAN_HTML_VERSION, key)
+    if text is None:
+        text = clean_html(content)
+        cache.put('clean_html', CLEAN_HTML_VERSION, key, text)
+    return text
+
+
+def _iter_cleaned(records: Iterable[Dict], extra_fields: Iterable[str],
+                  workers: Optional[int], cache: Optional[StageCache] = None) -> Iterator[Dict]:
+    """content는 프로세스 풀에서, extra_fields는 현재 프로세스에서 정제"""
+    records, originals = tee(records)
+    contents = iter_clean_html((item.get('content', '') for item in originals), workers=workers,
+                               cache=cache)
+    for item, content in zip(records, contents):
+        if 'content' in item:
+            item['content'] = content
+        for field in extra_fields:
+            if field in item:
+                item[field] = _clean_html_cached(item[field], cache)
+        yield item
+
+
+def clean_file(input_file: str, output_file: str,
+               near_duplicate_threshold: Optional[float] = NEAR_DUPLICATE_THRESHOLD,
+               min_length: int = 50, workers: Optional[int] = None,
+               extra_fields: Iterable[str] = (),
+               cache: Optional[StageCache] = None) -> Tuple[DocumentStats, DocumentStats]:
+    """
+    레코드 파일 정제 (중복 URL 제거 → HTML 정제 → 근사 중복 제거 → 저품질 필터링)
 
-        filtered.append(item)
+    clean_data.main과 pipeline.py가 함께 사용하는 정제 단계입니다.
+    문서를 하나씩 읽고 쓰므로(파일을 여러 번 읽음) 메모리에는 문서별 URL과
+    MinHash 서명만 남습니다. 결과는 입력 순서를 유지합니다.
 
-    return filtered
+    Args:
+        input_file: 입력 파일 (JSONL 또는 JSON 배열)
+        output_file: 출력 파일 (.jsonl이면 JSONL, .json이면 JSON 배열)
+        near_duplicate_threshold: 근사 중복 판정 유사도 (None이면 근사 중복 제거 안 함)
+        min_length: 최소 콘텐츠 길이
+        workers: HTML 정제 프로세스 수 (None이면 CPU 수)
+        extra_fields: content 외에 함께 HTML 정제할 필드 (예: 'text')
+        cache: 단계 캐시 (주면 HTML 정제 결과를 문서 단위로 저장하고 다시 사용)
 
+    Returns:
+        (원본 통계, 정제 후 통계)
 
-def print_statistics(original_data: List[Dict], cleaned_data: List[Dict]):
+    Raises:
+        FileNotFoundError: 입력 파일이 없는 경우
+        json.JSONDecodeError: 입력 파일 형식이 잘못된 경우
+    """
+    # 1. 원본 통계 + URL별로 남길 문서(가장 긴 콘텐츠) 찾기
+    original_stats = DocumentStats()
+    best: Dict[str, Tuple[int, int]] = {}
+    for index, item in enumerate(original_stats.track(iter_records(input_file))):
+        base_url = _base_url(item['url'])
+        length = len(item.get('content', ''))
+        if base_url not in best or length > best[base_url][0]:
+            best[base_url] = (length, index)
+    winners = {index for _, index in best.values()}
+    print(f"  🔸 중복 URL 제거: {original_stats.count - len(winners):,}개 "
+          f"(남음: {len(winners):,}개)")
+
+    # 2. HTML 정제 (임시 JSONL 파일로)
+    cleaned_file = f"{output_file}.cleaned.tmp"
+
+    def cleaned_records():
+        for i, item in enumerate(_iter_cleaned(
+                (item for index, item in enumerate(iter_records(input_file)) if index in winners),
+                extra_fields, workers, cache)):
+            if i % 500 == 0 and i > 0:
+                print(f"     진행: {i:,}/{len(winners):,} ({i/len(winners)*100:.1f}%)")
+            yield item
+
+    print(f"  🔸 HTML 태그 제거 및 텍스트 정제 중...")
+    try:
+        write_records(cleaned_file, cleaned_records())
+
+        # 3. 근사 중복 찾기 (정제된 본문 기준, 서명만 메모리에 유지)
+        canonical_of: List[int] = []
+        duplicate_urls: Dict[int, List[str]] = {}
+        if near_duplicate_threshold is not None:
+            urls = []
+
+            def contents():
+                for item in iter_records(cleaned_file):
+                    urls.append(item['url'])
+                    yield item.get('content', '')
+
+            detector = NearDuplicateDetector(threshold=near_duplicate_threshold)
+            canonical_of = detector.find_duplicates(contents())
+            for index, canonical in enumerate(canonical_of):
+                if canonical != index:
+                    duplicate_urls.setdefault(canonical, []).append(urls[index])
+            print(f"  🔸 근사 중복 제거 (유사도 {near_duplicate_threshold} 이상): "
+                  f"{sum(map(len, duplicate_urls.values())):,}개")
+
+        # 4. 근사 중복/저품질 문서를 빼고 저장
+        low_quality = 0
+        cleaned_stats = DocumentStats()
+
+        def kept_records():
+            nonlocal low_quality
+            for index, item in enumerate(iter_records(cleaned_file)):
+                if canonical_of and canonical_of[index] != index:
+                    continue
+                if index in duplicate_urls:
+                    item.setdefault('duplicate_urls', []).extend(duplicate_urls[index])
+                if _is_low_quality(item.get('content', ''), min_length):
+                    low_quality += 1
+                    continue
+                yield item
+
+        write_records(output_file, cleaned_stats.track(kept_records()))
+        print(f"  🔸 저품질 문서 제거 (최소 {min_length}자): {low_quality:,}개 "
+              f"(남음: {cleaned_stats.count:,}개)")
+    finally:
+        if os.path.exists(cleaned_file):
+            os.remove(cleaned_file)
+
+    return original_stats, cleaned_stats
+
+
+def print_statistics(original: DocumentStats, cleaned: DocumentStats):
     """
     데이터 정제 전후 통계 출력
 
     Args:
-        original_data: 원본 데이터
-        cleaned_data: 정제된 데이터
+        original: 원본 데이터 통계
+        cleaned: 정제된 데이터 통계
     """
     print("\n" + "="*60)
     print("📊 데이터 정제 통계")
     print("="*60)
 
     # 기본 통계
-    print(f"\n원본 문서 수: {len(original_data):,}개")
-    print(f"정제 후 문서 수: {len(cleaned_data):,}개")
-    print(f"제거된 문서: {len(original_data) - len(cleaned_data):,}개 "
-          f"({(1 - len(cleaned_data)/len(original_data))*100:.1f}% 감소)")
+    print(f"\n원본 문서 수: {original.count:,}개")
+    print(f"정제 후 문서 수: {cleaned.count:,}개")
+    if original.count:
+        print(f"제거된 문서: {original.count - cleaned.count:,}개 "
+              f"({(1 - cleaned.count/original.count)*100:.1f}% 감소)")
 
     # 컨텐츠 길이 통계
-    original_lengths = [len(item['content']) for item in original_data]
-    cleaned_lengths = [len(item['content']) for item in cleaned_data]
-
     print(f"\n평균 콘텐츠 길이:")
-    print(f"  원본: {sum(original_lengths)/len(original_lengths):.0f}자")
+    if original.count:
+        print(f"  원본: {original.total_chars/original.count:.0f}자")
 
-    if cleaned_lengths:
-        print(f"  정제 후: {sum(cleaned_lengths)/len(cleaned_lengths):.0f}자")
+    if cleaned.count:
+        print(f"  정제 후: {cleaned.total_chars/cleaned.count:.0f}자")
     else:
         print(f"  정제 후: 0자 (모든 데이터가 필터링됨)")
 
-    total_original = sum(original_lengths)
-    total_cleaned = sum(cleaned_lengths) if cleaned_lengths else 0
-
     print(f"\n총 텍스트 크기:")
-    print(f"  원본: {total_original/1024/1024:.2f} MB")
-    print(f"  정제 후: {total_cleaned/1024/1024:.2f} MB")
+    print(f"  원본: {original.total_chars/1024/1024:.2f} MB")
+    print(f"  정제 후: {cleaned.total_chars/1024/1024:.2f} MB")
 
-    if total_original > 0:
-        print(f"  감소: {(1 - total_cleaned/total_original)*100:.1f}%")
+    if original.total_chars > 0:
+        print(f"  감소: {(1 - cleaned.total_chars/original.total_chars)*100:.1f}%")
 
     # URL 도메인 분포
-    if cleaned_data:
+    if cleaned.count:
         print(f"\n상위 URL 도메인:")
-        domains = [item['url'].split('/')[2] if len(item['url'].split('/')) > 2 else item['url']
-                   for item in cleaned_data]
-        domain_counts = Counter(domains).most_common(5)
-        for domain, count in domain_counts:
+        for domain, count in cleaned.domains.most_common(5):
             print(f"  {domain}: {count}개")
     else:
         print(f"\n⚠️ 경고: 정제 후 남은 데이터가 없습니다!")
@@ -189,77 +509,69 @@ def print_statistics(original_data: List[Dict], cleaned_data: List[Dict]):
     print("="*60 + "\n")
 
 
-def main():
-    """메인 실행 함수"""
-    input_file = '111.json'
-    output_file = '111_cleaned.json'
+def main(input_file: str = '111.json', output_file: str = '111_cleaned.jsonl',
+         near_duplicate_threshold: Optional[float] = NEAR_DUPLICATE_THRESHOLD,
+         workers: Optional[int] = None):
+    """
+    메인 실행 함수
 
+    Args:
+        input_file: 입력 파일 (JSONL 또는 JSON 배열)
+        output_file: 출력 파일 (.jsonl이면 JSONL, .json이면 JSON 배열)
+        near_duplicate_threshold: 근사 중복 판정 유사도 (None이면 근사 중복 제거 안 함)
+        workers: HTML 정제 프로세스 수 (None이면 CPU 수)
+    """
     print(f"🚀 데이터 정제 시작: {input_file}")
 
-    # 1. 데이터 로드
-    print(f"\n1️⃣ 데이터 로드 중...")
+    # 1. 정제 (파일을 문서 단위로 읽고 씀)
+    print(f"\n1️⃣ 데이터 정제 중...")
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        print(f"   ✅ {len(data):,}개 문서 로드 완료")
+        first = next(iter_records(input_file), None)
+        original_stats, cleaned_stats = clean_file(
+            input_file, output_file, near_duplicate_threshold=near_duplicate_threshold,
+            min_length=50, workers=workers)
     except FileNotFoundError:
         print(f"   ❌ 파일을 찾을 수 없습니다: {input_file}")
         return
     except json.JSONDecodeError as e:
         print(f"   ❌ JSON 파싱 오류: {e}")
         return
-
-    original_data = data.copy()
-
-    # 2. 중복 제거
-    print(f"\n2️⃣ 중복 URL 제거 중...")
-    before_count = len(data)
-    data = remove_duplicates(data)
-    after_count = len(data)
-    print(f"   ✅ {before_count - after_count:,}개 중복 제거 ({after_count:,}개 남음)")
-
-    # 3. HTML 정제
-    print(f"\n3️⃣ HTML 태그 제거 및 텍스트 정제 중...")
-    for i, item in enumerate(data):
-        if i % 500 == 0:
-            print(f"   진행: {i}/{len(data)} ({i/len(data)*100:.1f}%)")
-        item['content'] = clean_html(item['content'])
-    print(f"   ✅ 모든 문서 정제 완료")
-
-    # 4. 저품질 문서 필터링
-    print(f"\n4️⃣ 저품질 문서 필터링 중...")
-    before_count = len(data)
-    data = filter_low_quality(data, min_length=50)
-    after_count = len(data)
-    print(f"   ✅ {before_count - after_count:,}개 문서 제거 ({after_count:,}개 남음)")
-
-    # 5. 통계 출력
-    print_statistics(original_data, data)
-
-    # 6. 저장
-    print(f"5️⃣ 정제된 데이터 저장 중: {output_file}")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    print(f"   ✅ 저장 완료!")
-
-    # 7. 샘플 출력
-    print(f"\n6️⃣ 정제 전후 비교 (첫 번째 문서):")
-    print("\n" + "-"*60)
-    print("📄 원본:")
-    print("-"*60)
-    print(original_data[0]['content'][:300] + "...")
-
-    print("\n" + "-"*60)
-    print("✨ 정제 후:")
-    print("-"*60)
-    # 정제된 데이터에서 같은 URL 찾기
-    cleaned_sample = next((d for d in data if d['url'] == original_data[0]['url']), data[0])
-    print(cleaned_sample['content'][:300] + "...")
-    print("-"*60)
+    print(f"   ✅ 저장 완료: {output_file}")
+
+    # 2. 통계 출력
+    print_statistics(original_stats, cleaned_stats)
+
+    # 3. 샘플 출력
+    if first is not None and cleaned_stats.count:
+        print(f"2️⃣ 정제 전후 비교 (첫 번째 문서):")
+        print("\n" + "-"*60)
+        print("📄 원본:")
+        print("-"*60)
+        print(first['content'][:300] + "...")
+
+        print("\n" + "-"*60)
+        print("✨ 정제 후:")
+        print("-"*60)
+        # 정제된 데이터에서 같은 URL 찾기
+        cleaned_sample = next((d for d in iter_records(output_file) if d['url'] == first['url']),
+                              None) or next(iter_records(output_file))
+        print(cleaned_sample['content'][:300] + "...")
+        print("-"*60)
 
     print(f"\n🎉 데이터 정제 완료! {output_file} 파일을 확인하세요.")
-    print(f"   다음 단계: backend/rag_system.py에서 data_path='data/111_cleaned.json'으로 변경")
+    print(f"   다음 단계: RAG_DATA_PATH=data/{os.path.basename(output_file)} 으로 서버 실행")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="데이터 정제")
+    parser.add_argument('input_file', nargs='?', default='111.json',
+                        help="입력 파일 (JSONL 또는 JSON 배열)")
+    parser.add_argument('output_file', nargs='?', default='111_cleaned.jsonl',
+                        help="출력 파일 (.jsonl이면 JSONL, .json이면 JSON 배열)")
+    parser.add_argument('--near-duplicate-threshold', type=float, default=NEAR_DUPLICATE_THRESHOLD,
+                        help="근사 중복으로 볼 최소 유사도 (0이면 근사 중복 제거 안 함)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="HTML 정제 프로세스 수 (기본: CPU 수)")
+    args = parser.parse_args()
+    main(args.input_file, args.output_file,
+         near_duplicate_threshold=args.near_duplicate_threshold or None, workers=args.workers)
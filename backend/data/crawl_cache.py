@@ -0,0 +1,137 @@
+"""
+조건부 요청용 HTTP 응답 캐시 (ETag / Last-Modified)
+
+URL마다 마지막 200 응답의 검증자(ETag, Last-Modified)와 본문을 SQLite에 저장합니다.
+다음 크롤링에서 If-None-Match / If-Modified-Since를 보내 서버가 304(변경 없음)를 돌려주면
+본문을 다시 받지 않고 저장된 본문을 사용하므로, 매일 갱신할 때 바뀐 페이지/이미지만 받습니다.
+텍스트 본문(HTML 등)은 zlib으로 압축해 저장하고, 이미 압축된 이미지는 그대로 저장합니다.
+검증자가 없는 응답은 다시 확인할 방법이 없으므로 저장하지 않습니다.
+"""
+
+import json
+import sqlite3
+import time
+import zlib
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+# 압축해서 저장할 Content-Type (이미지 등은 이미 압축되어 있음)
+_COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/xml', 'application/xhtml',
+                       'image/svg')
+# 304 응답에 다시 붙여 줄 원래 응답 헤더
+_STORED_HEADERS = ('content-type', 'etag', 'last-modified')
+
+
+class HttpCache:
+    """SQLite 기반 URL별 응답 캐시 (검증자 + 본문)"""
+
+    def __init__(self, cache_path: str = "output/crawl_cache.sqlite3"):
+        """
+        초기화
+
+        Args:
+            cache_path: SQLite 파일 경로
+        """
+        self.cache_path = cache_path
+        self.not_modified = 0
+        self.stored = 0
+
+        self._conn = sqlite3.connect(cache_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " url TEXT PRIMARY KEY,"
+            " headers TEXT NOT NULL,"
+            " body BLOB NOT NULL,"
+            " compressed INTEGER NOT NULL,"
+            " fetched_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def conditional_headers(headers: Dict[str, str]) -> Dict[str, str]:
+        """
+        저장된 응답 헤더 → 조건부 요청 헤더
+
+        Args:
+            headers: 저장된 응답 헤더 (load 결과)
+
+        Returns:
+            If-None-Match / If-Modified-Since 헤더
+        """
+        conditional = {}
+        if 'etag' in headers:
+            conditional['If-None-Match'] = headers['etag']
+        if 'last-modified' in headers:
+            conditional['If-Modified-Since'] = headers['last-modified']
+        return conditional
+
+    def load(self, url: str) -> Optional[Tuple[Dict[str, str], bytes]]:
+        """
+        저장된 응답
+
+        Args:
+            url: 요청 URL
+
+        Returns:
+            (응답 헤더, 본문), 없으면 None
+        """
+        row = self._conn.execute(
+            "SELECT headers, body, compressed FROM responses WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        body = zlib.decompress(row[1]) if row[2] else row[1]
+        return json.loads(row[0]), body
+
+    def store(self, url: str, response: httpx.Response) -> None:
+        """
+        200 응답 저장 (검증자가 없으면 저장하지 않음)
+
+        Args:
+            url: 요청 URL
+            response: 본문까지 읽은 응답
+        """
+        headers = {name: response.headers[name] for name in _STORED_HEADERS
+                   if name in response.headers}
+        if not self.conditional_headers(headers):
+            return
+        compressed = headers.get('content-type', '').startswith(_COMPRESSIBLE_TYPES)
+        body = zlib.compress(response.content) if compressed else response.content
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses (url, headers, body, compressed, fetched_at)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (url, json.dumps(headers), body, int(compressed), time.time())
+        )
+        self._conn.commit()
+        self.stored += 1
+
+    def refresh(self, url: str, headers: Dict[str, str], response: httpx.Response) -> Dict[str, str]:
+        """
+        304 응답 기록 (서버가 새 검증자를 보냈으면 갱신)
+
+        Args:
+            url: 요청 URL
+            headers: 저장된 응답 헤더
+            response: 304 응답
+
+        Returns:
+            갱신된 응답 헤더
+        """
+        headers = dict(headers)
+        for name in ('etag', 'last-modified'):
+            if name in response.headers:
+                headers[name] = response.headers[name]
+        self._conn.execute(
+            "UPDATE responses SET headers = ?, fetched_at = ? WHERE url = ?",
+            (json.dumps(headers), time.time(), url)
+        )
+        self._conn.commit()
+        self.not_modified += 1
+        return headers
+
+    def close(self) -> None:
+        """DB 연결 종료"""
+        self._conn.close()
@@ -0,0 +1,268 @@
+"""
+크롤링용 비동기 HTTP 클라이언트 (호스트별 요청 간격 조절)
+
+고정 대기(페이지마다 2초, 이미지마다 0.5초) 대신 요청을 동시에 보내면서도 한 서버에 몰리지
+않도록 합니다.
+
+- 연결 풀: httpx.AsyncClient 하나를 모든 요청이 공유 (keep-alive 재사용)
+- 전체 동시 요청 수 제한 (concurrency)
+- 호스트별 동시 요청 수와 요청 시작 간격 제한 (per_host_concurrency, per_host_rate)
+- 적응형 감속 (AIMD): 429/5xx 응답이나 연결 오류가 오면 그 호스트의 요청 속도를 절반으로 줄이고
+  Retry-After만큼 쉬며, 응답 시간(헤더까지)이 평소(가장 빨랐던 평균)의 두 배를 넘으면 속도를 줄임.
+  응답이 정상이면 속도를 per_host_rate의 1/16씩 올려 per_host_rate까지 회복
+- 조건부 요청: http_cache를 주면 저장된 검증자로 요청하고, 304 응답은 저장된 본문으로
+  바꿔 돌려줌 (is_not_modified로 구분)
+"""
+
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+from crawl_cache import HttpCache
+
+# 다시 시도할 응답 코드 (요청이 많음 / 서버 일시 오류)
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+
+def is_not_modified(response: httpx.Response) -> bool:
+    """서버가 304(변경 없음)를 보내 저장된 본문으로 만든 응답인지"""
+    return response.extensions.get('not_modified', False)
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Retry-After 헤더 (초 또는 HTTP 날짜) → 대기 초"""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HostThrottle:
+    """호스트 하나의 요청 속도/동시 요청 수 관리 (AIMD: 실패하면 절반으로, 성공하면 조금씩 회복)"""
+
+    def __init__(self, rate: float, concurrency: int, max_interval: float):
+        """
+        초기화
+
+        Args:
+            rate: 초당 최대 요청 수 (서버가 느려지거나 오류를 내면 이보다 줄임)
+            concurrency: 동시 요청 수
+            max_interval: 요청 간격 상한 (초)
+        """
+        self.max_rate = rate
+        self.min_rate = 1.0 / max_interval
+        self.rate = rate
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self._next_start = 0.0
+        self._last_backoff = 0.0
+
+        # 응답 시간 지수 이동 평균과 그 최솟값 (서버가 한가할 때의 기준)
+        self.latency: Optional[float] = None
+        self.baseline: Optional[float] = None
+
+        self.requests = 0
+        self.backoffs = 0
+
+    @property
+    def interval(self) -> float:
+        """현재 요청 시작 간격 (초)"""
+        return 1.0 / self.rate
+
+    async def wait_turn(self) -> float:
+        """
+        이 호스트에 다음 요청을 보낼 차례까지 대기 → 요청 시작 시각
+
+        차례를 미리 예약하지 않고 깨어난 뒤에 가져가므로, 기다리는 동안 속도가 줄거나
+        pause가 불리면 이미 기다리던 요청도 바뀐 간격을 따릅니다.
+        """
+        while True:
+            now = time.monotonic()
+            if now >= self._next_start:
+                self._next_start = now + self.interval
+                return now
+            await asyncio.sleep(self._next_start - now)
+
+    def pause(self, seconds: float) -> None:
+        """seconds초 동안 이 호스트에 새 요청을 보내지 않음 (Retry-After)"""
+        self._next_start = max(self._next_start, time.monotonic() + seconds)
+
+    def _back_off(self, started: float, factor: float) -> None:
+        """요청 속도를 factor로 나눔 (이미 감속한 뒤에 보낸 요청일 때만 - 한 번의 과부하로 여러 번 줄이지 않음)"""
+        if started < self._last_backoff:
+            return
+        self.backoffs += 1
+        self.rate = max(self.min_rate, self.rate / factor)
+        self._last_backoff = time.monotonic()
+
+    def record(self, started: float, latency: float, status: Optional[int]) -> None:
+        """
+        응답 결과로 요청 속도 조절
+
+        Args:
+            started: 요청 시작 시각 (wait_turn 반환값)
+            latency: 응답 시간 (초)
+            status: 응답 코드 (연결 오류/타임아웃이면 None)
+        """
+        self.requests += 1
+        if status is None or status in RETRY_STATUSES:
+            self._back_off(started, 2.0)
+            return
+
+        self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+        self.baseline = self.latency if self.baseline is None else min(self.baseline, self.latency)
+        if self.latency > 2 * self.baseline:
+            self._back_off(started, 1.5)
+        else:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 16)
+
+
+class CrawlClient:
+    """연결 풀을 공유하고 호스트별로 요청 간격을 조절하는 비동기 HTTP 클라이언트"""
+
+    def __init__(self, concurrency: int = 8, per_host_rate: float = 4.0,
+                 per_host_concurrency: int = 4, max_interval: float = 30.0,
+                 retries: int = 3, timeout: float = 30.0,
+                 http_cache: Optional[HttpCache] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        초기화
+
+        Args:
+            concurrency: 전체 동시 요청 수
+            per_host_rate: 호스트별 초당 최대 요청 수
+            per_host_concurrency: 호스트별 동시 요청 수
+            max_interval: 감속할 때 호스트별 요청 간격 상한 (초, 최저 속도 = 1/max_interval)
+            retries: 429/5xx/연결 오류 시 다시 시도할 횟수
+            timeout: 기본 요청 타임아웃 (초)
+            http_cache: 조건부 요청용 응답 캐시 (None이면 항상 전체 요청)
+            transport: httpx 전송 계층 (테스트용, None이면 기본)
+
+        Raises:
+            ValueError: 설정이 잘못된 경우
+        """
+        if concurrency < 1 or per_host_concurrency < 1 or per_host_rate <= 0:
+            raise ValueError("❌ concurrency, per_host_concurrency, per_host_rate는 0보다 커야 합니다.")
+        if retries < 0:
+            raise ValueError(f"❌ retries는 0 이상이어야 합니다: {retries}")
+        self.per_host_rate = per_host_rate
+        self.per_host_concurrency = per_host_concurrency
+        self.max_interval = max_interval
+        self.retries = retries
+        self.timeout = timeout
+        self.http_cache = http_cache
+        self.hosts: Dict[str, HostThrottle] = {}
+
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._client = httpx.AsyncClient(
+            headers={'User-Agent': USER_AGENT},
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=concurrency,
+                                max_keepalive_connections=concurrency),
+            transport=transport,
+        )
+
+    def _throttle(self, url: str) -> HostThrottle:
+        """URL 호스트의 HostThrottle (처음 보는 호스트면 생성)"""
+        host = urlparse(url).netloc
+        if host not in self.hosts:
+            self.hosts[host] = HostThrottle(self.per_host_rate, self.per_host_concurrency,
+                                            self.max_interval)
+        return self.hosts[host]
+
+    async def _fetch(self, url: str, timeout: float, start: float,
+                     headers: Dict[str, str]) -> Tuple[httpx.Response, float]:
+        """요청 후 본문까지 읽음 → (응답, 헤더까지의 응답 시간) - 본문 크기와 무관한 서버 응답 속도"""
+        request = self._client.build_request('GET', url, headers=headers, timeout=timeout)
+        response = await self._client.send(request, stream=True)
+        latency = time.monotonic() - start
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+        return response, latency
+
+    def _revalidated(self, url: str, response: httpx.Response,
+                     cached: Optional[Tuple[Dict[str, str], bytes]]) -> httpx.Response:
+        """조건부 요청 결과 반영 → 304면 저장된 본문으로 만든 200 응답, 200이면 저장"""
+        if response.status_code == 304 and cached is not None:
+            headers = self.http_cache.refresh(url, cached[0], response)
+            return httpx.Response(200, headers=headers, content=cached[1],
+                                  request=response.request, extensions={'not_modified': True})
+        if response.status_code == 200:
+            self.http_cache.store(url, response)
+        return response
+
+    async def get(self, url: str, timeout: Optional[float] = None) -> httpx.Response:
+        """
+        GET 요청 (호스트 차례를 기다리고 429/5xx/연결 오류는 속도를 줄여 다시 시도)
+
+        http_cache가 있으면 조건부 요청을 보내고, 304 응답은 저장된 본문의 200 응답으로
+        바꿔 돌려줍니다 (is_not_modified(response)가 True).
+
+        Args:
+            url: 요청 URL
+            timeout: 요청 타임아웃 (초, None이면 기본값)
+
+        Returns:
+            응답 (다시 시도해도 429/5xx면 마지막 응답)
+
+        Raises:
+            httpx.TransportError: 다시 시도해도 연결 오류/타임아웃인 경우
+        """
+        throttle = self._throttle(url)
+        cached = self.http_cache.load(url) if self.http_cache is not None else None
+        headers = HttpCache.conditional_headers(cached[0]) if cached else {}
+        for attempt in range(self.retries + 1):
+            async with throttle.semaphore:
+                started = await throttle.wait_turn()
+                async with self._semaphore:
+                    start = time.monotonic()
+                    try:
+                        response, latency = await self._fetch(url, timeout or self.timeout, start,
+                                                              headers)
+                    except httpx.TransportError:
+                        throttle.record(started, time.monotonic() - start, None)
+                        if attempt == self.retries:
+                            raise
+                        continue
+                throttle.record(started, latency, response.status_code)
+
+            if self.http_cache is not None:
+                response = self._revalidated(url, response, cached)
+            if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                return response
+            throttle.pause(_retry_after(response) or throttle.interval)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        호스트별 요청 통계
+
+        Returns:
+            {호스트: {'requests': 요청 수, 'backoffs': 감속 횟수, 'rate': 현재 초당 요청 수}}
+        """
+        return {host: {'requests': throttle.requests, 'backoffs': throttle.backoffs,
+                       'rate': throttle.rate}
+                for host, throttle in self.hosts.items()}
+
+    async def aclose(self) -> None:
+        """연결 풀 종료"""
+        await self._client.aclose()
+
+    async def __aenter__(self) -> 'CrawlClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
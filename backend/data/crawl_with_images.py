@@ -5,14 +5,30 @@
 1. 웹페이지 텍스트 추출
 2. 이미지 URL 수집 및 다운로드
 3. Base64 인코딩 (OpenAI API 전송용)
+4. asyncio 동시 크롤링 (호스트별 요청 간격 조절, crawl_client.py)
+5. 조건부 요청으로 바뀐 페이지/이미지만 다시 받기 (crawl_cache.py)
 """
 
-import requests
-from bs4 import BeautifulSoup
+import asyncio
 import base64
-from typing import Dict, List
+from collections import deque
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
-import time
+
+import httpx
+from bs4 import BeautifulSoup
+
+from crawl_cache import HttpCache
+from crawl_client import CrawlClient, is_not_modified
+
+# 크롤링 결과 형식 버전 (단계 캐시 키에 포함 - 페이지 결과 형식이 바뀌면 올림)
+CRAWL_VERSION = 2
+
+# 기본 동시 요청 수와 호스트별 요청 제한 (dyu.ac.kr 한 서버에 초당 4회, 동시 4개까지)
+CRAWL_CONCURRENCY = 8
+PER_HOST_RATE = 4.0
+PER_HOST_CONCURRENCY = 4
 
 
 def is_valid_image(img_url: str) -> bool:
@@ -43,34 +59,36 @@ def is_valid_image(img_url: str) -> bool:
     return False
 
 
-def download_image(img_url: str, timeout: int = 10) -> Dict:
+async def download_image(client: CrawlClient, img_url: str,
+                         timeout: int = 10) -> Tuple[Optional[Dict], bool]:
     """
     이미지 다운로드 및 Base64 인코딩
 
     Args:
+        client: 크롤링 HTTP 클라이언트
         img_url: 이미지 URL
         timeout: 타임아웃 (초)
 
     Returns:
-        이미지 정보 딕셔너리 (url, data, size)
+        (이미지 정보 딕셔너리 (url, data, size) - 실패하거나 제외 대상이면 None,
+         서버가 304로 이전과 같다고 답했는지)
     """
     try:
-        response = requests.get(img_url, timeout=timeout, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        response = await client.get(img_url, timeout=timeout)
+        unchanged = is_not_modified(response)
 
         if response.status_code != 200:
-            return None
+            return None, False
 
         # 이미지 크기 체크 (5MB 이하만)
         content_length = len(response.content)
         if content_length > 5 * 1024 * 1024:  # 5MB
             print(f"    ⚠️ 이미지 너무 큼 (건너뜀): {content_length/1024/1024:.1f}MB")
-            return None
+            return None, unchanged
 
         # 너무 작은 이미지는 아이콘일 가능성 (10KB 이하 제외)
         if content_length < 10 * 1024:  # 10KB
-            return None
+            return None, unchanged
 
         # Base64 인코딩
         img_b64 = base64.b64encode(response.content).decode('utf-8')
@@ -79,30 +97,32 @@ def download_image(img_url: str, timeout: int = 10) -> Dict:
             'url': img_url,
             'data': img_b64,
             'size': content_length
-        }
+        }, unchanged
 
     except Exception as e:
         print(f"    ❌ 이미지 다운로드 실패: {img_url[:50]}... - {e}")
-        return None
+        return None, False
 
 
-def extract_images(soup: BeautifulSoup, base_url: str) -> List[Dict]:
+async def extract_images(client: CrawlClient, soup: BeautifulSoup,
+                         base_url: str) -> Tuple[List[Dict], bool]:
     """
-    페이지에서 모든 이미지 추출
+    페이지에서 모든 이미지 추출 (동시에 다운로드, 페이지 순서 유지)
 
     Args:
+        client: 크롤링 HTTP 클라이언트 (서버 부하는 호스트별 요청 간격으로 조절)
         soup: BeautifulSoup 객체
         base_url: 기본 URL (상대경로 변환용)
 
     Returns:
-        이미지 정보 리스트
+        (이미지 정보 리스트, 모든 이미지가 이전 크롤링과 같은지)
     """
-    images = []
     img_tags = soup.find_all('img')
 
     print(f"  📸 {len(img_tags)}개 이미지 태그 발견")
 
-    for i, img in enumerate(img_tags, 1):
+    candidates = []
+    for img in img_tags:
         # src 또는 data-src 속성에서 URL 추출
         img_url = img.get('src') or img.get('data-src')
 
@@ -117,43 +137,40 @@ def extract_images(soup: BeautifulSoup, base_url: str) -> List[Dict]:
             continue
 
         # alt 텍스트 추출
-        alt_text = img.get('alt', '')
-
-        print(f"    다운로드 중 ({i}/{len(img_tags)}): {img_url[:50]}...")
+        candidates.append((img_url, img.get('alt', '')))
 
-        # 이미지 다운로드
-        img_data = download_image(img_url)
+    # 이미지 다운로드
+    downloaded = await asyncio.gather(*(download_image(client, img_url)
+                                        for img_url, _ in candidates))
 
+    images = []
+    for (_, alt_text), (img_data, _) in zip(candidates, downloaded):
         if img_data:
             img_data['alt'] = alt_text
             images.append(img_data)
-            print(f"    ✅ 성공 ({img_data['size']/1024:.1f}KB)")
-
-        # 서버 부하 방지
-        time.sleep(0.5)
 
-    print(f"  ✅ 총 {len(images)}개 이미지 다운로드 완료")
+    print(f"  ✅ 총 {len(images)}개 이미지 다운로드 완료 ({base_url})")
 
-    return images
+    return images, all(unchanged for _, unchanged in downloaded)
 
 
-def crawl_page_with_images(url: str) -> Dict:
+async def crawl_page(client: CrawlClient, url: str) -> Dict:
     """
     단일 페이지 크롤링 (텍스트 + 이미지)
 
     Args:
+        client: 크롤링 HTTP 클라이언트
         url: 크롤링할 URL
 
     Returns:
-        페이지 데이터 딕셔너리
+        페이지 데이터 딕셔너리 (실패하면 error 필드 포함, 페이지와 이미지가 모두
+        이전 크롤링과 같으면 unchanged가 True)
     """
     print(f"\n🔍 크롤링: {url}")
 
     try:
         # 페이지 요청
-        response = requests.get(url, timeout=30, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        response = await client.get(url, timeout=30)
         response.raise_for_status()
 
         # HTML 파싱
@@ -171,7 +188,7 @@ def crawl_page_with_images(url: str) -> Dict:
             text = soup.get_text()
 
         # 이미지 추출
-        images = extract_images(soup, url)
+        images, images_unchanged = await extract_images(client, soup, url)
 
         return {
             'url': url,
@@ -179,11 +196,12 @@ def crawl_page_with_images(url: str) -> Dict:
             'text': text,
             'content': text,  # clean_data.py와 호환성
             'images': images,
-            'image_count': len(images)
+            'image_count': len(images),
+            'unchanged': is_not_modified(response) and images_unchanged
         }
 
     except Exception as e:
-        print(f"  ❌ 크롤링 실패: {e}")
+        print(f"  ❌ 크롤링 실패 ({url}): {e}")
         return {
             'url': url,
             'title': url,
@@ -191,49 +209,113 @@ def crawl_page_with_images(url: str) -> Dict:
             'content': '',
             'images': [],
             'image_count': 0,
+            'unchanged': False,
             'error': str(e)
         }
 
 
-def crawl_multiple_pages(urls: List[str]) -> List[Dict]:
+def crawl_page_with_images(url: str) -> Dict:
     """
-    여러 페이지 크롤링
+    단일 페이지 크롤링 (텍스트 + 이미지)
 
     Args:
-        urls: URL 리스트
+        url: 크롤링할 URL
 
     Returns:
-        페이지 데이터 리스트
+        페이지 데이터 딕셔너리
     """
-    results = []
-    total = len(urls)
+    return crawl_multiple_pages([url])[0]
 
-    print(f"🚀 총 {total}개 페이지 크롤링 시작...\n")
 
-    for i, url in enumerate(urls, 1):
-        print(f"\n{'='*60}")
-        print(f"진행: {i}/{total} ({i/total*100:.1f}%)")
-        print(f"{'='*60}")
+def iter_crawl_pages(urls: List[str], concurrency: int = CRAWL_CONCURRENCY,
+                     per_host_rate: float = PER_HOST_RATE,
+                     per_host_concurrency: int = PER_HOST_CONCURRENCY,
+                     http_cache: Optional[HttpCache] = None,
+                     transport: Optional[httpx.AsyncBaseTransport] = None) -> Iterator[Dict]:
+    """
+    여러 페이지를 동시에 크롤링하며 URL 순서대로 결과를 내보냄 (제너레이터)
 
-        data = crawl_page_with_images(url)
-        results.append(data)
+    페이지와 이미지 요청은 하나의 연결 풀을 공유하며, 고정 대기 대신 호스트별 요청 간격
+    (per_host_rate)과 동시 요청 수로 서버 부하를 조절합니다. 429/5xx 응답이나 응답 지연이
+    관찰되면 그 호스트의 요청 간격을 자동으로 늘립니다 (crawl_client.py).
+    동시에 크롤링 중인 페이지는 concurrency개까지이므로 메모리 사용량은 URL 수와 관계없습니다.
+    http_cache를 주면 조건부 요청(ETag/Last-Modified)으로 바뀌지 않은 페이지/이미지는 본문을
+    다시 받지 않고, 페이지와 이미지가 모두 그대로인 페이지는 unchanged를 True로 표시합니다.
 
-        # 서버 부하 방지
-        if i < total:
-            time.sleep(2)
+    Args:
+        urls: URL 리스트
+        concurrency: 전체 동시 요청 수 (동시에 크롤링할 페이지 수)
+        per_host_rate: 호스트별 초당 최대 요청 수
+        per_host_concurrency: 호스트별 동시 요청 수
+        http_cache: 조건부 요청용 응답 캐시 (None이면 항상 전체 다운로드)
+        transport: httpx 전송 계층 (테스트용, None이면 기본)
 
-    # 통계
-    total_images = sum(d['image_count'] for d in results)
-    successful = sum(1 for d in results if 'error' not in d)
+    Returns:
+        페이지 데이터 이터레이터
+    """
+    total = len(urls)
+    total_images = successful = unchanged = 0
+    not_modified = http_cache.not_modified if http_cache is not None else 0
+
+    print(f"🚀 총 {total}개 페이지 크롤링 시작... "
+          f"(동시 {concurrency}개, 호스트별 초당 {per_host_rate:g}회)\n")
+
+    # 이벤트 루프는 다음 페이지를 기다리는 동안만 돌고, 결과를 내보내는 동안은 멈춤
+    loop = asyncio.new_event_loop()
+    client = CrawlClient(concurrency=concurrency, per_host_rate=per_host_rate,
+                         per_host_concurrency=per_host_concurrency, http_cache=http_cache,
+                         transport=transport)
+    pending = deque()
+    remaining = iter(urls)
+    try:
+        for url in islice(remaining, concurrency):
+            pending.append(loop.create_task(crawl_page(client, url)))
+
+        for i in range(1, total + 1):
+            data = loop.run_until_complete(pending.popleft())
+            for url in islice(remaining, 1):
+                pending.append(loop.create_task(crawl_page(client, url)))
+
+            print(f"  진행: {i}/{total} ({i/total*100:.1f}%) - {data['url']}")
+            total_images += data['image_count']
+            successful += 'error' not in data
+            unchanged += data['unchanged']
+            yield data
+
+        host_stats = client.stats()
+    finally:
+        # 중간에 멈춘 경우 (소비자가 제너레이터를 닫음) 남은 페이지 취소
+        if pending:
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.wait(pending))
+        loop.run_until_complete(client.aclose())
+        loop.close()
 
+    # 통계
     print(f"\n{'='*60}")
     print(f"📊 크롤링 완료!")
     print(f"{'='*60}")
     print(f"성공: {successful}/{total}개 페이지")
     print(f"총 이미지: {total_images}개")
+    if http_cache is not None:
+        print(f"변경 없음: {unchanged}개 페이지 (304 응답 {http_cache.not_modified - not_modified}회)")
+    for host, stats in host_stats.items():
+        print(f"{host}: 요청 {stats['requests']}회, 감속 {stats['backoffs']}회")
     print(f"{'='*60}\n")
 
-    return results
+
+def crawl_multiple_pages(urls: List[str]) -> List[Dict]:
+    """
+    여러 페이지 크롤링
+
+    Args:
+        urls: URL 리스트
+
+    Returns:
+        페이지 데이터 리스트
+    """
+    return list(iter_crawl_pages(urls))
 
 
 # 테스트
@@ -7,29 +7,50 @@ OpenAI Vision API를 사용한 이미지 텍스트 추출 (OCR)
 3. 표, 차트 등 복잡한 레이아웃 처리
 """
 
-import json
 import os
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Optional
 from openai import OpenAI
 from dotenv import load_dotenv
 import time
 
+from records import iter_records, write_records
+from stage_cache import StageCache
+
 # 환경 변수 로드
 load_dotenv()
 
+# OCR 결과 버전 (단계 캐시 키에 포함 - 프롬프트나 요청 설정이 바뀌면 올림)
+OCR_VERSION = 1
+
+
+def ocr_cache_key(model: str, image: Dict) -> str:
+    """
+    이미지 OCR 결과의 캐시 키 (모델 + 이미지 데이터 + alt 텍스트)
+
+    Args:
+        model: OCR 모델
+        image: 이미지 정보 딕셔너리 (data, alt)
+
+    Returns:
+        입력 해시
+    """
+    return StageCache.input_hash(model, image['data'], image.get('alt', ''))
+
 
 class ImageTextExtractor:
     """이미지 텍스트 추출기"""
 
-    def __init__(self, model: str = "gpt-4o-mini"):
+    def __init__(self, model: str = "gpt-4o-mini", cache: Optional[StageCache] = None):
         """
         초기화
 
         Args:
             model: 사용할 모델 (gpt-4o 또는 gpt-4o-mini)
+            cache: 단계 캐시 (주면 이미지별 OCR 결과를 저장하고 같은 이미지는 다시 요청하지 않음)
         """
         self.client = OpenAI()
         self.model = model
+        self.cache = cache
 
         # 모델별 비용 (1000 이미지당)
         self.costs = {
@@ -49,11 +70,18 @@ class ImageTextExtractor:
             alt_text: 이미지 alt 속성 (힌트)
 
         Returns:
-            추출된 텍스트
+            추출된 텍스트 (실패하면 빈 문자열)
         """
         try:
-            # 프롬프트 구성
-            prompt = """이 이미지에서 모든 텍스트를 정확하게 추출해주세요.
+            return self._request_text(image_base64, alt_text)
+        except Exception as e:
+            print(f"      ❌ OCR 실패: {e}")
+            return ""
+
+    def _request_text(self, image_base64: str, alt_text: str = "") -> str:
+        """Vision API로 텍스트 추출 (실패하면 예외를 그대로 올림)"""
+        # 프롬프트 구성
+        prompt = """이 이미지에서 모든 텍스트를 정확하게 추출해주세요.
 
 **중요 규칙:**
 1. 한국어와 영어 모두 정확히 추출
@@ -73,74 +101,102 @@ class ImageTextExtractor:
 [추출된 텍스트]
 """
 
-            if alt_text:
-                prompt += f"\n\n**힌트 (alt 텍스트):** {alt_text}"
-
-            # API 호출
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": prompt
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/jpeg;base64,{image_base64}",
-                                    "detail": "high"  # 고해상도 분석
-                                }
+        if alt_text:
+            prompt += f"\n\n**힌트 (alt 텍스트):** {alt_text}"
+
+        # API 호출
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": prompt
+                        },
+                        {
+                            "type": "image_url",
+                            "image_url": {
+                                "url": f"data:image/jpeg;base64,{image_base64}",
+                                "detail": "high"  # 고해상도 분석
                             }
-                        ]
-                    }
-                ],
-                max_tokens=2000,
-                temperature=0.1  # 일관성 있는 추출
-            )
-
-            extracted_text = response.choices[0].message.content
-            return extracted_text.strip()
-
+                        }
+                    ]
+                }
+            ],
+            max_tokens=2000,
+            temperature=0.1  # 일관성 있는 추출
+        )
+
+        extracted_text = response.choices[0].message.content
+        return extracted_text.strip()
+
+    def _cached_text(self, image: Dict) -> Optional[str]:
+        """캐시에 저장된 이미지 OCR 결과 (없으면 None)"""
+        if self.cache is None:
+            return None
+        return self.cache.get('ocr', OCR_VERSION, ocr_cache_key(self.model, image))
+
+    def _extract_and_cache(self, image: Dict) -> str:
+        """OCR 요청 후 성공한 결과를 캐시에 저장 (실패는 저장하지 않아 다음 실행에서 다시 시도)"""
+        try:
+            text = self._request_text(image['data'], image.get('alt', ''))
         except Exception as e:
             print(f"      ❌ OCR 실패: {e}")
             return ""
+        if self.cache is not None:
+            self.cache.put('ocr', OCR_VERSION, ocr_cache_key(self.model, image), text)
+        return text
 
-    def process_images(self, data: List[Dict], save_interval: int = 10) -> List[Dict]:
+    def process_images(self, data: List[Dict]) -> List[Dict]:
         """
         여러 문서의 이미지 처리
 
         Args:
             data: 문서 데이터 리스트 (images 필드 포함)
-            save_interval: 중간 저장 주기
 
         Returns:
             OCR 결과가 추가된 데이터 리스트
         """
         # 총 이미지 개수 계산
         total_images = sum(len(doc.get('images', [])) for doc in data)
+        return list(self.iter_process_images(data, total_images))
+
+    def iter_process_images(self, documents: Iterable[Dict], total_images: int) -> Iterator[Dict]:
+        """
+        문서를 하나씩 받아 이미지 OCR 결과를 붙여 내보냄 (제너레이터)
+
+        캐시가 있으면 OCR 결과가 저장된 이미지는 API를 호출하지 않고 저장된 결과를 사용합니다.
 
-        if total_images == 0:
+        Args:
+            documents: 문서 이터러블 (images 필드 포함, 파일에서 읽는 제너레이터 가능)
+            total_images: OCR할 이미지 수 (캐시된 이미지 제외, 진행률/비용 표시용)
+
+        Returns:
+            OCR 결과가 추가된 문서 이터레이터
+        """
+        if total_images == 0 and self.cache is None:
             print("⚠️ 처리할 이미지가 없습니다.")
-            return data
+            yield from documents
+            return
 
         print(f"📸 총 {total_images}개 이미지 OCR 시작...")
         print(f"💰 예상 비용: ${total_images * self.costs[self.model] / 1000:.2f}\n")
 
-        processed_count = 0
+        processed_count = cached_count = 0
         start_time = time.time()
 
         # 각 문서 처리
-        for doc_idx, doc in enumerate(data, 1):
+        for doc_idx, doc in enumerate(documents, 1):
             images = doc.get('images', [])
 
             if not images:
+                yield doc
                 continue
 
             print(f"\n{'='*60}")
-            print(f"문서 {doc_idx}/{len(data)}: {doc['url']}")
+            print(f"문서 {doc_idx}: {doc['url']}")
             print(f"이미지 {len(images)}개 처리 중...")
             print(f"{'='*60}")
 
@@ -148,13 +204,21 @@ class ImageTextExtractor:
 
             # 각 이미지 처리
             for img_idx, img in enumerate(images, 1):
-                processed_count += 1
+                # 이전 실행에서 OCR한 이미지는 저장된 결과 사용
+                text = self._cached_text(img)
+                from_cache = text is not None
 
-                print(f"  [{processed_count}/{total_images}] "
-                      f"처리 중... ({img['size']/1024:.1f}KB)")
+                if from_cache:
+                    cached_count += 1
+                    print(f"  ♻️ 캐시된 OCR 결과 사용 ({img['size']/1024:.1f}KB)")
+                else:
+                    processed_count += 1
+
+                    print(f"  [{processed_count}/{total_images}] "
+                          f"처리 중... ({img['size']/1024:.1f}KB)")
 
-                # OCR 실행
-                text = self.extract_text(img['data'], img.get('alt', ''))
+                    # OCR 실행
+                    text = self._extract_and_cache(img)
 
                 if text:
                     image_texts.append({
@@ -167,10 +231,13 @@ class ImageTextExtractor:
                 else:
                     print(f"    ⚠️ 텍스트 없음")
 
+                if from_cache:
+                    continue
+
                 # 진행률 표시
-                progress = processed_count / total_images * 100
+                progress = processed_count / max(total_images, processed_count) * 100
                 elapsed = time.time() - start_time
-                eta = (elapsed / processed_count) * (total_images - processed_count)
+                eta = (elapsed / processed_count) * max(0, total_images - processed_count)
 
                 print(f"    진행률: {progress:.1f}% | "
                       f"경과: {elapsed/60:.1f}분 | "
@@ -198,6 +265,8 @@ class ImageTextExtractor:
 
                 print(f"\n  ✅ 문서 처리 완료: {len(image_texts)}개 이미지 텍스트 추가")
 
+            yield doc
+
         # 최종 통계
         elapsed = time.time() - start_time
         actual_cost = processed_count * self.costs[self.model] / 1000
@@ -206,41 +275,42 @@ class ImageTextExtractor:
         print(f"🎉 OCR 완료!")
         print(f"{'='*60}")
         print(f"처리된 이미지: {processed_count}개")
+        if cached_count:
+            print(f"캐시 사용 이미지: {cached_count}개")
         print(f"소요 시간: {elapsed/60:.1f}분")
         print(f"실제 비용: ${actual_cost:.2f} (약 {actual_cost*1300:.0f}원)")
         print(f"{'='*60}\n")
 
-        return data
-
 
 def process_file(input_file: str, output_file: str, model: str = "gpt-4o-mini"):
     """
-    JSON 파일 처리 (편의 함수)
+    레코드 파일 처리 (편의 함수)
+
+    문서를 하나씩 읽어 OCR 후 바로 쓰므로 파일 크기와 관계없이 메모리 사용량이 일정합니다.
 
     Args:
-        input_file: 입력 JSON 파일 (images 필드 포함)
-        output_file: 출력 JSON 파일
+        input_file: 입력 파일 (JSONL 또는 JSON 배열, images 필드 포함)
+        output_file: 출력 파일 (.jsonl이면 JSONL, .json이면 JSON 배열)
         model: 사용할 모델
     """
     print(f"📂 입력 파일: {input_file}")
     print(f"📂 출력 파일: {output_file}\n")
 
-    # 데이터 로드
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # 이미지 수 집계 (문서 단위로 읽음)
+    total_documents = total_images = 0
+    for doc in iter_records(input_file):
+        total_documents += 1
+        total_images += len(doc.get('images', []))
 
-    print(f"📊 총 {len(data)}개 문서 로드\n")
+    print(f"📊 총 {total_documents}개 문서, 이미지 {total_images}개\n")
 
-    # OCR 처리
+    # OCR 처리하면서 저장
     extractor = ImageTextExtractor(model=model)
-    data = extractor.process_images(data)
-
-    # 저장
-    print(f"💾 결과 저장 중: {output_file}...")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    print(f"💾 결과 저장: {output_file}")
+    count = write_records(output_file,
+                          extractor.iter_process_images(iter_records(input_file), total_images))
 
-    print(f"✅ 저장 완료!\n")
+    print(f"✅ 저장 완료! ({count}개 문서)\n")
 
 
 # 테스트
@@ -249,10 +319,10 @@ if __name__ == "__main__":
 
     if len(sys.argv) > 1:
         input_file = sys.argv[1]
-        output_file = sys.argv[2] if len(sys.argv) > 2 else 'ocr_result.json'
+        output_file = sys.argv[2] if len(sys.argv) > 2 else 'ocr_result.jsonl'
         model = sys.argv[3] if len(sys.argv) > 3 else 'gpt-4o-mini'
 
         process_file(input_file, output_file, model)
     else:
         print("사용법: python extract_image_text.py <입력파일> [출력파일] [모델]")
-        print("예시: python extract_image_text.py crawled.json ocr_result.json gpt-4o-mini")
+        print("예시: python extract_image_text.py crawled.jsonl ocr_result.jsonl gpt-4o-mini")
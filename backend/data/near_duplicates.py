@@ -0,0 +1,216 @@
+"""
+근사 중복 문서 탐지 (MinHash + LSH 밴딩)
+
+다른 경로로 다시 게시된 게시글이나 95% 같은 페이지 목록처럼 URL은 다르지만
+내용이 거의 같은 문서를 찾습니다.
+
+- 서명: 공백을 정규화한 본문의 글자 n-gram(shingle) 해시를 num_perm개 구간(bin)으로 나눠
+  구간별 최솟값 (one permutation hashing, 빈 구간은 오른쪽 이웃 구간 값으로 채움)
+- 후보: 서명을 bands개 밴드로 나눠 한 밴드라도 같은 문서끼리만 비교 (문서 수에 거의 선형)
+- 판정: 서명 일치 비율(추정 자카드 유사도)이 threshold 이상이면 중복
+
+clean_data.main과 pipeline.py가 같은 함수를 사용하므로 판정 규칙이 항상 같습니다.
+backend의 chunk_dedup.py(임베딩 전 청크 중복 제거)도 이 탐지기를 사용합니다.
+data 스크립트는 data 디렉토리에서 단독으로 실행되므로 langchain 없이 numpy만 사용합니다.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# 한 번에 서명을 계산할 글자 수 (메모리 사용량 제한)
+_SIGNATURE_BATCH_CHARS = 1 << 22
+_EMPTY = np.uint32(0xFFFFFFFF)
+
+# 버킷 하나에 올릴 최대 대표 문서 수 (공통 문구를 조금씩 공유하는 문서가 한 버킷에
+# 몰려 후보 확인이 O(n^2)이 되는 것을 막음 - 다른 밴드로도 후보를 찾음)
+_MAX_BUCKET_SIZE = 32
+
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """64비트 해시 섞기 (murmur3 finalizer)"""
+    values ^= values >> np.uint64(33)
+    values *= np.uint64(0xFF51AFD7ED558CCD)
+    values ^= values >> np.uint64(33)
+    values *= np.uint64(0xC4CEB9FE1A85EC53)
+    values ^= values >> np.uint64(33)
+    return values
+
+
+class NearDuplicateDetector:
+    """MinHash + LSH 기반 근사 중복 문서 탐지"""
+
+    def __init__(self, threshold: float = 0.9, num_perm: int = 128, bands: int = 16,
+                 shingle_size: int = 5, seed: int = 1):
+        """
+        초기화
+
+        Args:
+            threshold: 중복으로 볼 최소 자카드 유사도 (서명으로 추정)
+            num_perm: MinHash 서명 길이 (구간 수)
+            bands: LSH 밴드 수 (num_perm의 약수, 많을수록 후보를 넓게 찾음)
+            shingle_size: shingle 글자 수
+            seed: 해시 시드 (같으면 항상 같은 결과)
+
+        Raises:
+            ValueError: 설정이 잘못된 경우
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError(f"❌ threshold는 0보다 크고 1 이하여야 합니다: {threshold}")
+        if num_perm % bands:
+            raise ValueError(f"❌ num_perm({num_perm})은 bands({bands})로 나누어떨어져야 합니다.")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self._salt = _mix64(np.array([seed], dtype=np.uint64))[0]
+
+    def signatures(self, texts: Iterable[str]) -> np.ndarray:
+        """
+        MinHash 서명 계산
+
+        Args:
+            texts: 텍스트 이터러블 (제너레이터면 묶음 단위로 읽음)
+
+        Returns:
+            (텍스트 수, num_perm) uint32 배열
+        """
+        return self._signatures_and_lengths(texts)[0]
+
+    def _signatures_and_lengths(self, texts: Iterable[str]) -> Tuple[np.ndarray, List[int]]:
+        """서명과 원래 텍스트 길이 (글자 수 기준으로 묶어 numpy로 한 번에 계산)"""
+        results, lengths = [], []
+        batch, chars = [], 0
+        for text in texts:
+            lengths.append(len(text))
+            batch.append(' '.join(text.split()) or ' ')
+            chars += len(batch[-1])
+            if chars >= _SIGNATURE_BATCH_CHARS:
+                results.append(self._batch_signatures(batch))
+                batch, chars = [], 0
+        if batch:
+            results.append(self._batch_signatures(batch))
+        if not results:
+            return np.empty((0, self.num_perm), dtype=np.uint32), lengths
+        return np.concatenate(results), lengths
+
+    def _batch_signatures(self, texts: List[str]) -> np.ndarray:
+        """한 묶음의 서명 (각 텍스트 뒤에 k-1개 패딩을 붙여 모든 글자 위치에서 창을 만듦)"""
+        k = self.shingle_size
+        pad = "\0" * (k - 1)
+        codepoints = np.frombuffer((pad.join(texts) + pad).encode('utf-32-le'),
+                                   dtype=np.uint32).astype(np.uint64)
+        lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+        rows = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+        # 패딩을 건너뛴 각 창의 시작 위치
+        positions = np.arange(lengths.sum()) + rows * (k - 1)
+
+        with np.errstate(over='ignore'):
+            hashes = np.full(len(positions), self._salt, dtype=np.uint64)
+            for offset in range(k):
+                hashes = hashes * np.uint64(1_000_003) + codepoints[positions + offset]
+            hashes = _mix64(hashes)
+            # 상위 32비트로 구간을 고르고 하위 32비트의 구간별 최솟값을 서명으로 사용
+            bins = ((hashes >> np.uint64(32)) * np.uint64(self.num_perm)) >> np.uint64(32)
+            signature = np.full(len(texts) * self.num_perm, _EMPTY, dtype=np.uint32)
+            np.minimum.at(signature, rows * self.num_perm + bins.astype(np.int64),
+                          hashes.astype(np.uint32))
+        return self._densify(signature.reshape(len(texts), self.num_perm))
+
+    def _densify(self, signature: np.ndarray) -> np.ndarray:
+        """빈 구간을 오른쪽(순환)으로 가장 가까운 채워진 구간 값 + 거리로 채움"""
+        empty = signature == _EMPTY
+        if not empty.any():
+            return signature
+        width = self.num_perm
+        columns = np.arange(2 * width)
+        filled_at = np.where(np.tile(~empty, 2), columns, 4 * width)
+        nearest = np.minimum.accumulate(filled_at[:, ::-1], axis=1)[:, ::-1][:, :width]
+        distance = (nearest - columns[:width]).astype(np.uint32)
+        with np.errstate(over='ignore'):
+            values = np.take_along_axis(np.tile(signature, 2), nearest % (2 * width), axis=1)
+            return np.where(empty, values + distance * np.uint32(0x9E3779B1), signature)
+
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """밴드별 서명 해시 (len(signatures), bands) - 충돌해도 유사도 확인에서 걸러짐"""
+        bands = signatures.reshape(len(signatures), self.bands, self.rows).astype(np.uint64)
+        keys = np.zeros((len(signatures), self.bands), dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            for row in range(self.rows):
+                keys = keys * np.uint64(0x100000001B3) + bands[:, :, row]
+            return _mix64(keys)
+
+    def find_duplicates(self, texts: Iterable[str], longest_first: bool = True,
+                        can_merge: Optional[Callable[[int, int], bool]] = None) -> List[int]:
+        """
+        텍스트마다 대표 텍스트 번호 찾기
+
+        긴 텍스트부터 차례로 앞서 대표가 된 텍스트와 비교하므로 대표는 묶음에서
+        가장 긴 텍스트입니다 (길이가 같으면 앞의 것). 입력이 같으면 결과도 항상 같습니다.
+
+        Args:
+            texts: 텍스트 이터러블 (제너레이터면 서명만 남기고 텍스트는 버림)
+            longest_first: False면 입력 순서대로 비교 (대표는 처음 나온 텍스트)
+            can_merge: (텍스트 번호, 후보 대표 번호)를 받아 합쳐도 되는지 판단하는 함수
+                       - 유사도가 임계값 이상인 후보를 가장 비슷한 것부터 확인
+
+        Returns:
+            텍스트별 대표 번호 리스트 (자기 자신이 대표면 자기 번호)
+        """
+        signatures, text_lengths = self._signatures_and_lengths(texts)
+        canonical_of = list(range(len(signatures)))
+        if len(signatures) < 2:
+            return canonical_of
+
+        band_keys = self._band_keys(signatures)
+
+        # 다른 문서와 겹치는 밴드 키만 버킷에 올림 (대부분의 문서는 겹치는 키가 없어 건너뜀)
+        shared = np.zeros(band_keys.shape, dtype=bool)
+        for band in range(self.bands):
+            _, inverse, counts = np.unique(band_keys[:, band], return_inverse=True,
+                                           return_counts=True)
+            shared[:, band] = counts[inverse] > 1
+        active = np.flatnonzero(shared.any(axis=1))
+        if longest_first:
+            lengths = np.asarray(text_lengths, dtype=np.int64)[active]
+            active = active[np.argsort(-lengths, kind='stable')]
+        order = active.tolist()
+        # 서명 전체가 같은 문서(그대로 다시 게시된 글)는 후보 검색 없이 처리
+        full_keys = np.zeros(len(signatures), dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            for band in range(self.bands):
+                full_keys = full_keys * np.uint64(0x100000001B3) + band_keys[:, band]
+        full_keys = _mix64(full_keys).tolist()
+        band_keys, shared = band_keys.tolist(), shared.tolist()
+        first_with_signature: Dict[int, int] = {}
+
+        # 밴드 키 → 그 키를 가진 대표 문서 번호들
+        buckets: Dict[tuple, List[int]] = {}
+        min_matches = self.threshold * self.num_perm
+        for index in order:
+            first = first_with_signature.setdefault(full_keys[index], index)
+            if first != index and (can_merge is None or can_merge(index, first)) and \
+                    np.array_equal(signatures[index], signatures[first]):
+                canonical_of[index] = canonical_of[first]
+                continue
+            keys = [(band, key) for band, (key, is_shared)
+                    in enumerate(zip(band_keys[index], shared[index])) if is_shared]
+            found = [buckets[key] for key in keys if key in buckets]
+            if found:
+                # 후보 대표 문서들과의 서명 일치 수를 한 번에 계산해 가장 비슷한 것부터 확인
+                candidates = np.unique(np.concatenate(found))
+                matches = np.count_nonzero(signatures[candidates] == signatures[index], axis=1)
+                for position in np.argsort(-matches, kind='stable'):
+                    if matches[position] < min_matches:
+                        break
+                    candidate = int(candidates[position])
+                    if can_merge is None or can_merge(index, candidate):
+                        canonical_of[index] = candidate
+                        break
+            if canonical_of[index] == index:
+                for key in keys:
+                    bucket = buckets.setdefault(key, [])
+                    if len(bucket) < _MAX_BUCKET_SIZE:
+                        bucket.append(index)
+        return canonical_of
@@ -3,83 +3,182 @@
 
 1. 웹 크롤링 (텍스트 + 이미지)
 2. 이미지 OCR (OpenAI Vision)
-3. 데이터 정제 (HTML 제거, 중복 제거)
-4. 최종 JSON 생성
+3. 데이터 정제 (HTML 제거, 중복/근사 중복 제거)
+4. 최종 JSONL 생성 (단계마다 문서 단위로 읽고 씀)
+
+단계 결과는 페이지/이미지/문서 단위로 단계 캐시(output/stage_cache.sqlite3)에 저장되므로
+중단된 뒤 다시 실행하면 끝난 작업은 건너뛰고 멈춘 곳부터 이어서 진행합니다.
+다시 크롤링할 때는 조건부 요청(output/crawl_cache.sqlite3)으로 바뀐 페이지/이미지만 받습니다.
 """
 
-import json
 import os
 from datetime import datetime
-from crawl_with_images import crawl_multiple_pages
-from extract_image_text import ImageTextExtractor
-from clean_data import clean_html, remove_duplicates, filter_low_quality, print_statistics
+from typing import Dict, Iterator, List, Optional
+from crawl_with_images import iter_crawl_pages, CRAWL_VERSION
+from crawl_cache import HttpCache
+from extract_image_text import ImageTextExtractor, ocr_cache_key, OCR_VERSION
+from clean_data import clean_file, print_statistics, NEAR_DUPLICATE_THRESHOLD
+from records import iter_records, write_records
+from stage_cache import StageCache
+
+# 크롤링 캐시 유효 시간 (초) - 이보다 오래된 페이지는 다시 크롤링
+CRAWL_CACHE_MAX_AGE = 24 * 60 * 60
 
 
 class Pipeline:
     """데이터 파이프라인"""
 
-    def __init__(self, output_dir: str = "output"):
+    def __init__(self, output_dir: str = "output",
+                 near_duplicate_threshold: Optional[float] = NEAR_DUPLICATE_THRESHOLD,
+                 clean_workers: Optional[int] = None, use_cache: bool = True,
+                 crawl_max_age: Optional[float] = CRAWL_CACHE_MAX_AGE):
         """
         초기화
 
         Args:
             output_dir: 출력 디렉토리
+            near_duplicate_threshold: 근사 중복 판정 유사도 (None이면 근사 중복 제거 안 함)
+            clean_workers: HTML 정제 프로세스 수 (None이면 CPU 수)
+            use_cache: 단계 캐시와 조건부 요청 캐시 사용 여부
+                (output_dir/stage_cache.sqlite3, output_dir/crawl_cache.sqlite3)
+            crawl_max_age: 캐시된 크롤링 결과 유효 시간(초, None이면 무제한) - 지나면
+                조건부 요청으로 바뀌었는지 확인
         """
         self.output_dir = output_dir
+        self.near_duplicate_threshold = near_duplicate_threshold
+        self.clean_workers = clean_workers
+        self.crawl_max_age = crawl_max_age
         os.makedirs(output_dir, exist_ok=True)
 
+        self.cache = self.http_cache = None
+        if use_cache:
+            self.cache = StageCache(os.path.join(output_dir, 'stage_cache.sqlite3'))
+            self.http_cache = HttpCache(os.path.join(output_dir, 'crawl_cache.sqlite3'))
+
         # 타임스탬프
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
         print(f"🚀 파이프라인 초기화")
         print(f"📂 출력 디렉토리: {output_dir}\n")
 
-    def run(self, urls: list, ocr_enabled: bool = True, ocr_model: str = "gpt-4o-mini"):
+    def _iter_crawl(self, urls: List[str]) -> Iterator[Dict]:
+        """
+        캐시에 없거나 오래된 페이지만 크롤링하고, 나머지는 캐시 결과를 URL 순서대로 내보냄
+
+        캐시 결과를 그대로 쓴 페이지도 unchanged로 표시합니다 (다시 확인하지 않았으므로 이전과 같음).
+        """
+        if self.cache is None:
+            yield from iter_crawl_pages(urls)
+            return
+
+        keys = {url: StageCache.input_hash(url) for url in urls}
+        cached = {url for url in urls
+                  if self.cache.contains('crawl', CRAWL_VERSION, keys[url], self.crawl_max_age)}
+        if cached:
+            print(f"♻️ 캐시된 페이지 {len(cached)}개는 다시 크롤링하지 않습니다.\n")
+
+        # 크롤링할 페이지는 URL 순서대로 하나씩 받아 옴 (실패한 페이지는 저장하지 않아 다음에 다시 시도)
+        missing = [url for url in urls if url not in cached]
+        fetched = iter_crawl_pages(missing, http_cache=self.http_cache)
+        for url in urls:
+            page = self.cache.get('crawl', CRAWL_VERSION, keys[url],
+                                  None if url in cached else self.crawl_max_age)
+            if page is None:
+                page = next(fetched)
+                if 'error' not in page:
+                    self.cache.put('crawl', CRAWL_VERSION, keys[url], page)
+            else:
+                page['unchanged'] = True
+            yield page
+        if missing:
+            # 크롤링 통계 출력 (제너레이터 마무리)
+            next(fetched, None)
+
+    def _count_uncached_images(self, crawled_file: str, ocr_model: str) -> int:
+        """OCR 결과가 캐시에 없는 이미지 수"""
+        return sum(1 for doc in iter_records(crawled_file) for image in doc.get('images', [])
+                   if not self.cache.contains('ocr', OCR_VERSION, ocr_cache_key(ocr_model, image)))
+
+    def _print_cache_summary(self) -> None:
+        """단계별 캐시 적중 수 출력"""
+        if self.cache is None:
+            return
+        print(f"\n♻️ 단계 캐시 적중 ({self.cache.cache_path}):")
+        for stage, counts in self.cache.stats().items():
+            total = counts['hits'] + counts['misses']
+            print(f"  - {stage}: {counts['hits']:,}/{total:,} ({counts['hits'] / total * 100:.1f}%)")
+
+    def run(self, urls: list, ocr_enabled: bool = True, ocr_model: str = "gpt-4o-mini") -> str:
         """
         전체 파이프라인 실행
 
+        단계마다 문서를 하나씩 읽고 JSONL 파일에 바로 쓰므로 (base64 이미지가 들어 있어도)
+        메모리 사용량이 문서 수와 관계없이 일정합니다. 통계도 문서를 쓰면서 집계합니다.
+        크롤링(URL), OCR(이미지), HTML 정제(본문) 결과는 입력 해시와 단계 버전을 키로
+        캐시되므로, 다시 실행하면 입력이 바뀌지 않은 항목은 건너뜁니다.
+
         Args:
             urls: 크롤링할 URL 리스트
             ocr_enabled: OCR 사용 여부
             ocr_model: OCR 모델 (gpt-4o 또는 gpt-4o-mini)
 
         Returns:
-            최종 처리된 데이터
+            최종 데이터 파일 경로 (JSONL)
         """
         print("="*70)
         print(" "*20 + "📊 파이프라인 시작")
         print("="*70 + "\n")
 
+        if self.cache is not None:
+            self.cache.reset_stats()
+        # 같은 URL은 한 번만 크롤링
+        urls = list(dict.fromkeys(urls))
+
         # ========== 1단계: 크롤링 ==========
         print("\n" + "="*70)
         print("1️⃣ 웹 크롤링 (텍스트 + 이미지)")
         print("="*70 + "\n")
 
-        data = crawl_multiple_pages(urls)
-
-        # 중간 저장
-        crawled_file = os.path.join(self.output_dir, f'step1_crawled_{self.timestamp}.json')
-        self._save_json(data, crawled_file)
+        # 페이지마다 바로 저장하면서 통계 집계
+        total_images = successful = total_text_length = unchanged = 0
+        failures = []
+
+        def crawled_pages():
+            nonlocal total_images, successful, total_text_length, unchanged
+            for d in self._iter_crawl(urls):
+                total_images += d.get('image_count', 0)
+                unchanged += d.get('unchanged', False)
+                total_text_length += len(d.get('text', ''))
+                if 'error' not in d and len(d.get('text', '')) > 0:
+                    successful += 1
+                else:
+                    failures.append((d['url'], d.get('error', '텍스트 없음')))
+                yield d
+
+        crawled_file = os.path.join(self.output_dir, f'step1_crawled_{self.timestamp}.jsonl')
+        total_pages = write_records(crawled_file, crawled_pages())
         print(f"✅ 크롤링 결과 저장: {crawled_file}\n")
 
         # 통계
-        total_images = sum(d.get('image_count', 0) for d in data)
-        successful = sum(1 for d in data if 'error' not in d and len(d.get('text', '')) > 0)
-        failed = len(data) - successful
-        avg_text_length = sum(len(d.get('text', '')) for d in data) / len(data) if data else 0
+        failed = total_pages - successful
+        avg_text_length = total_text_length / total_pages if total_pages else 0
 
         print(f"📊 크롤링 통계:")
-        print(f"  - 총 페이지: {len(data)}개")
+        print(f"  - 총 페이지: {total_pages}개")
         print(f"  - 성공: {successful}개")
         print(f"  - 실패: {failed}개")
         print(f"  - 평균 텍스트 길이: {avg_text_length:.0f}자")
         print(f"  - 이미지: {total_images}개")
+        if self.cache is not None:
+            # 바뀌지 않은 페이지는 OCR/정제 단계에서도 캐시 결과를 사용
+            print(f"  - 변경 없음: {unchanged}개 (OCR/정제 결과 재사용)")
 
         if failed > 0:
             print(f"\n⚠️ {failed}개 페이지 크롤링 실패")
-            for d in data:
-                if 'error' in d or len(d.get('text', '')) == 0:
-                    print(f"  - {d['url']}: {d.get('error', '텍스트 없음')}")
+            for url, error in failures:
+                print(f"  - {url}: {error}")
+
+        source_file = crawled_file
 
         # ========== 2단계: OCR (선택사항) ==========
         if ocr_enabled and total_images > 0:
@@ -87,24 +186,35 @@ class Pipeline:
             print("2️⃣ 이미지 OCR (OpenAI Vision)")
             print("="*70 + "\n")
 
+            # 이전 실행에서 OCR한 이미지는 비용 계산에서 제외
+            pending_images = total_images
+            if self.cache is not None:
+                pending_images = self._count_uncached_images(crawled_file, ocr_model)
+                if pending_images < total_images:
+                    print(f"♻️ 캐시된 OCR 결과: {total_images - pending_images}개 "
+                          f"(다시 요청하지 않음)")
+
             # 비용 계산
             cost_per_1000 = {"gpt-4o": 10.0, "gpt-4o-mini": 3.0}
-            estimated_cost = total_images * cost_per_1000[ocr_model] / 1000
+            estimated_cost = pending_images * cost_per_1000[ocr_model] / 1000
 
             print(f"💰 예상 비용: ${estimated_cost:.2f} (약 {estimated_cost*1300:.0f}원)")
-            print(f"📸 처리할 이미지: {total_images}개")
+            print(f"📸 처리할 이미지: {pending_images}개")
             print(f"🤖 사용 모델: {ocr_model}\n")
 
-            # 확인
-            confirm = input("OCR을 진행하시겠습니까? (y/n): ").strip().lower()
+            # 확인 (모든 이미지가 캐시에 있으면 비용이 없으므로 바로 진행)
+            confirm = 'y'
+            if pending_images > 0:
+                confirm = input("OCR을 진행하시겠습니까? (y/n): ").strip().lower()
 
             if confirm == 'y':
-                extractor = ImageTextExtractor(model=ocr_model)
-                data = extractor.process_images(data)
+                extractor = ImageTextExtractor(model=ocr_model, cache=self.cache)
 
-                # 중간 저장
-                ocr_file = os.path.join(self.output_dir, f'step2_ocr_{self.timestamp}.json')
-                self._save_json(data, ocr_file)
+                # 문서마다 OCR 후 바로 저장
+                ocr_file = os.path.join(self.output_dir, f'step2_ocr_{self.timestamp}.jsonl')
+                write_records(ocr_file, extractor.iter_process_images(iter_records(crawled_file),
+                                                                      pending_images))
+                source_file = ocr_file
                 print(f"✅ OCR 결과 저장: {ocr_file}\n")
             else:
                 print("⏭️ OCR 생략됨\n")
@@ -119,39 +229,14 @@ class Pipeline:
         print("3️⃣ 데이터 정제")
         print("="*70 + "\n")
 
-        original_data = [d.copy() for d in data]
-
-        # 3-1. 중복 제거
-        print("  🔸 중복 URL 제거 중...")
-        before = len(data)
-        data = remove_duplicates(data)
-        after = len(data)
-        print(f"     제거: {before - after}개, 남음: {after}개\n")
-
-        # 3-2. HTML 정제
-        print("  🔸 HTML 태그 제거 및 텍스트 정제 중...")
-        for i, item in enumerate(data):
-            if i % 100 == 0 and i > 0:
-                print(f"     진행: {i}/{len(data)} ({i/len(data)*100:.1f}%)")
-
-            # content 필드 정제
-            if 'content' in item:
-                item['content'] = clean_html(item['content'])
-            # text 필드도 정제 (있다면)
-            if 'text' in item:
-                item['text'] = clean_html(item['text'])
-
-        print(f"     완료: {len(data)}개 문서 정제\n")
-
-        # 3-3. 품질 필터링
-        print("  🔸 저품질 문서 필터링 중 (최소 10자)...")
-        before = len(data)
-        data = filter_low_quality(data, min_length=10)
-        after = len(data)
-        print(f"     제거: {before - after}개, 남음: {after}개\n")
+        # 중복 URL 제거 → HTML 정제 → 근사 중복 제거 → 품질 필터링 (clean_data.main과 같은 단계)
+        final_file = os.path.join(self.output_dir, f'final_data_{self.timestamp}.jsonl')
+        original_stats, cleaned_stats = clean_file(
+            source_file, final_file, near_duplicate_threshold=self.near_duplicate_threshold,
+            min_length=10, workers=self.clean_workers, extra_fields=('text',), cache=self.cache)
 
         # 데이터가 비어있는 경우 경고
-        if after == 0:
+        if cleaned_stats.count == 0:
             print("\n⚠️ 경고: 모든 데이터가 필터링되었습니다!")
             print("원인:")
             print("  1. 크롤링 실패 (페이지 접근 불가)")
@@ -164,11 +249,7 @@ class Pipeline:
             print()
 
         # 통계 출력
-        print_statistics(original_data, data)
-
-        # 최종 저장
-        final_file = os.path.join(self.output_dir, f'final_data_{self.timestamp}.json')
-        self._save_json(data, final_file)
+        print_statistics(original_stats, cleaned_stats)
 
         print(f"\n✅ 최종 데이터 저장: {final_file}")
 
@@ -177,19 +258,15 @@ class Pipeline:
         print(" "*20 + "🎉 파이프라인 완료!")
         print("="*70)
         print(f"\n📁 출력 파일: {final_file}")
-        print(f"📊 최종 문서 수: {len(data)}개")
+        print(f"📊 최종 문서 수: {cleaned_stats.count}개")
+        self._print_cache_summary()
         print(f"\n다음 단계:")
-        print(f"  1. backend/main.py에서 data_path 변경:")
-        print(f"     data_path=\"../{final_file}\"")
+        print(f"  1. 데이터 경로 환경 변수 설정 (backend 디렉토리 기준):")
+        print(f"     RAG_DATA_PATH=\"data/{final_file}\"")
         print(f"  2. vectorstore 삭제 후 서버 재시작")
         print("="*70 + "\n")
 
-        return data
-
-    def _save_json(self, data: list, filename: str):
-        """JSON 저장"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        return final_file
 
 
 def main():
@@ -0,0 +1,116 @@
+"""
+문서 레코드 파일 읽기/쓰기 (스트리밍)
+
+크롤링 결과에는 base64 이미지가 들어 있어 수 GB가 되기도 하므로 파일 전체를 메모리에
+올리지 않고 문서(레코드)를 하나씩 읽고 씁니다.
+
+- 쓰기: 한 줄에 문서 하나인 JSONL (.json 경로면 이전과 같은 JSON 배열)
+- 읽기: JSONL과 JSON 배열을 모두 지원 (파일 첫 글자로 구분, 배열도 원소 단위로 읽음)
+"""
+
+import json
+import os
+import re
+from typing import Dict, Iterable, Iterator
+
+# 한 번에 읽을 글자 수 (배열 원소가 더 크면 두 배씩 늘려 읽음)
+_READ_SIZE = 1 << 20
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_DECODER = json.JSONDecoder()
+
+
+def iter_records(path: str) -> Iterator[Dict]:
+    """
+    레코드 파일을 문서 단위로 읽기
+
+    Args:
+        path: JSONL 또는 JSON 배열 파일 경로
+
+    Returns:
+        문서 딕셔너리 이터레이터
+
+    Raises:
+        FileNotFoundError: 파일이 없는 경우
+        json.JSONDecodeError: 파일 형식이 잘못된 경우
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        head = f.read(_READ_SIZE)
+        start = _WHITESPACE.match(head).end()
+        if head[start:start + 1] == '[':
+            yield from _iter_json_array(f, head, start + 1)
+            return
+
+        f.seek(0)
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise json.JSONDecodeError(f"{path} {line_number}번째 줄: {e.msg}",
+                                           e.doc, e.pos) from e
+
+
+def _iter_json_array(f, buffer: str, pos: int) -> Iterator[Dict]:
+    """JSON 배열의 원소를 하나씩 디코딩 (buffer[pos:]부터 이어서 읽음)"""
+    read_size = _READ_SIZE
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if pos < len(buffer) and buffer[pos] == ']':
+            return
+        if pos < len(buffer) and buffer[pos] == ',':
+            pos += 1
+            continue
+        try:
+            if pos == len(buffer):
+                raise json.JSONDecodeError("배열이 닫히지 않았습니다", buffer, pos)
+            item, pos = _DECODER.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # 원소가 버퍼 끝에서 잘렸을 수 있으므로 더 읽어서 다시 시도
+            chunk = f.read(read_size)
+            if not chunk:
+                raise
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            read_size = max(read_size, len(buffer))
+            continue
+        yield item
+
+
+def write_records(path: str, records: Iterable[Dict]) -> int:
+    """
+    문서를 하나씩 파일에 쓰기
+
+    .json 경로는 이전 형식과 같은 JSON 배열로, 그 밖의 경로는 JSONL로 씁니다.
+    임시 파일에 다 쓴 뒤 교체하므로 중간에 실패해도 기존 파일은 그대로 남습니다.
+
+    Args:
+        path: 출력 파일 경로
+        records: 문서 딕셔너리 이터러블 (제너레이터 가능)
+
+    Returns:
+        쓴 문서 수
+    """
+    as_array = path.endswith('.json')
+    temp_path = f"{path}.tmp"
+    count = 0
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            if as_array:
+                f.write('[')
+            for record in records:
+                if as_array:
+                    f.write(',\n' if count else '\n')
+                    f.write(json.dumps(record, ensure_ascii=False, indent=2))
+                else:
+                    f.write(json.dumps(record, ensure_ascii=False))
+                    f.write('\n')
+                count += 1
+            if as_array:
+                f.write('\n]' if count else ']')
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return count
@@ -0,0 +1,151 @@
+"""
+파이프라인 단계별 결과 캐시
+
+(단계 이름, 단계 버전, 입력 해시)를 키로 문서/이미지 하나 단위의 결과를 SQLite에 저장합니다.
+결과는 저장할 때마다 기록되므로 OCR 도중 중단되거나 OCR 확인에서 n을 고른 뒤 다시 실행해도
+이미 끝난 크롤링/OCR/정제 결과를 그대로 이어서 사용하고, 입력이 바뀌지 않은 항목은 건너뜁니다.
+단계 구현이 바뀌면 해당 단계의 버전을 올려 이전 결과를 무효화합니다.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+class StageCache:
+    """SQLite 기반 단계별 결과 캐시"""
+
+    def __init__(self, cache_path: str = "output/pipeline_cache.sqlite3"):
+        """
+        초기화
+
+        Args:
+            cache_path: SQLite 파일 경로
+        """
+        self.cache_path = cache_path
+        self.hits: Dict[str, int] = defaultdict(int)
+        self.misses: Dict[str, int] = defaultdict(int)
+
+        self._conn = sqlite3.connect(cache_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " stage TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value BLOB NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " PRIMARY KEY (stage, key))"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def input_hash(*parts: str) -> str:
+        """입력 값들의 해시 (캐시 키)"""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def _select(self, stage: str, version: int, input_hash: str,
+                max_age: Optional[float]) -> Optional[bytes]:
+        """저장된 결과 조회 (max_age초보다 오래된 결과는 없는 것으로 봄)"""
+        row = self._conn.execute(
+            "SELECT value, created_at FROM results WHERE stage = ? AND key = ?",
+            (stage, f"{version}:{input_hash}")
+        ).fetchone()
+        if row is None or (max_age is not None and time.time() - row[1] > max_age):
+            return None
+        return row[0]
+
+    def contains(self, stage: str, version: int, input_hash: str,
+                 max_age: Optional[float] = None) -> bool:
+        """
+        결과가 있는지 확인 (적중 통계에 포함하지 않음)
+
+        Args:
+            stage: 단계 이름
+            version: 단계 버전
+            input_hash: 입력 해시
+            max_age: 결과 유효 시간(초, None이면 무제한)
+
+        Returns:
+            결과 존재 여부
+        """
+        return self._select(stage, version, input_hash, max_age) is not None
+
+    def get(self, stage: str, version: int, input_hash: str,
+            max_age: Optional[float] = None) -> Optional[Any]:
+        """
+        결과 조회
+
+        Args:
+            stage: 단계 이름
+            version: 단계 버전
+            input_hash: 입력 해시
+            max_age: 결과 유효 시간(초, None이면 무제한)
+
+        Returns:
+            저장된 결과 (없으면 None)
+        """
+        blob = self._select(stage, version, input_hash, max_age)
+        if blob is None:
+            self.misses[stage] += 1
+            return None
+        self.hits[stage] += 1
+        return json.loads(zlib.decompress(blob))
+
+    def put(self, stage: str, version: int, input_hash: str, value: Any) -> None:
+        """
+        결과 저장 (바로 기록되므로 중단되어도 남음)
+
+        Args:
+            stage: 단계 이름
+            version: 단계 버전
+            input_hash: 입력 해시
+            value: JSON으로 저장할 수 있는 결과
+        """
+        self.put_many(stage, version, [(input_hash, value)])
+
+    def put_many(self, stage: str, version: int, items: Iterable[Tuple[str, Any]]) -> None:
+        """
+        여러 결과를 한 트랜잭션으로 저장
+
+        Args:
+            stage: 단계 이름
+            version: 단계 버전
+            items: (입력 해시, 결과) 이터러블
+        """
+        now = time.time()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO results (stage, key, value, created_at) VALUES (?, ?, ?, ?)",
+            [(stage, f"{version}:{input_hash}",
+              zlib.compress(json.dumps(value, ensure_ascii=False).encode('utf-8')), now)
+             for input_hash, value in items]
+        )
+        self._conn.commit()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        단계별 적중 통계
+
+        Returns:
+            {단계 이름: {'hits': 적중 수, 'misses': 미스 수}}
+        """
+        stages = sorted(set(self.hits) | set(self.misses))
+        return {stage: {'hits': self.hits[stage], 'misses': self.misses[stage]}
+                for stage in stages}
+
+    def reset_stats(self) -> None:
+        """적중 통계 초기화 (실행마다 따로 집계)"""
+        self.hits.clear()
+        self.misses.clear()
+
+    def close(self) -> None:
+        """DB 연결 종료"""
+        self._conn.close()
@@ -0,0 +1,233 @@
+"""
+디스크 기반 임베딩 캐시
+
+(모델명, 텍스트 해시)를 키로 임베딩 벡터를 SQLite에 저장하여
+바뀌지 않은 텍스트나 여러 페이지에 반복되는 문구를 다시 임베딩하지 않도록 합니다.
+인덱스 생성(embed_documents)과 질의 임베딩(embed_query, aembed_query) 모두 캐시를 거칩니다.
+캐시 적중은 읽기만 하고, 사용 시각(last_used) 갱신은 메모리에 모아 두었다가
+새 벡터를 저장할 때(삭제 순서를 정하기 전)나 일정 개수가 쌓였을 때 한 번에 기록합니다.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Dict, List, Any
+
+from langchain_core.embeddings import Embeddings
+
+# 메모리에 모아 둔 사용 시각 갱신을 기록하는 개수
+TOUCH_FLUSH_SIZE = 1000
+
+
+class CachedEmbeddings(Embeddings):
+    """SQLite 캐시를 앞에 둔 임베딩 래퍼"""
+
+    def __init__(self, embeddings: Embeddings, model: str,
+                 cache_path: str = "embedding_cache.sqlite3",
+                 max_entries: int = 200_000):
+        """
+        초기화
+
+        Args:
+            embeddings: 실제 임베딩을 계산할 모델 (예: OpenAIEmbeddings)
+            model: 캐시 키에 포함할 모델명 (모델이 바뀌면 캐시도 분리됨)
+            cache_path: SQLite 파일 경로
+            max_entries: 최대 보관 벡터 수 (초과 시 오래 사용하지 않은 것부터 삭제)
+        """
+        self.embeddings = embeddings
+        self.model = model
+        self.cache_path = cache_path
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # 아직 기록하지 않은 사용 시각 {키: 마지막 사용 시각}
+        self._touched: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(cache_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY,"
+            " vector BLOB NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used"
+            " ON embeddings (last_used)"
+        )
+        self._conn.commit()
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def _key(self, text: str) -> str:
+        """(모델명, 텍스트) 캐시 키 계산"""
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        return f"{self.model}:{digest}"
+
+    def _lookup(self, keys: List[str]) -> Dict[str, List[float]]:
+        """캐시에 있는 벡터 조회 (사용 시각은 메모리에만 기록)"""
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+        # SQLite 변수 개수 제한(999)을 넘지 않도록 나눠서 조회
+        for i in range(0, len(unique_keys), 500):
+            part = unique_keys[i:i+500]
+            placeholders = ','.join('?' * len(part))
+            rows = self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                part
+            ).fetchall()
+            for key, blob in rows:
+                found[key] = array('f', blob).tolist()
+
+        now = time.time()
+        for key in found:
+            self._touched[key] = now
+        if len(self._touched) >= TOUCH_FLUSH_SIZE:
+            self._flush_touches()
+            self._conn.commit()
+        return found
+
+    def _flush_touches(self) -> None:
+        """모아 둔 사용 시각을 DB에 기록 (커밋은 호출한 쪽에서)"""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def _store(self, items: Dict[str, List[float]]) -> None:
+        """새 벡터 저장 후 크기 제한 초과분 삭제"""
+        # 오래 사용하지 않은 순서가 정확하도록 삭제 전에 사용 시각부터 기록
+        self._flush_touches()
+        now = time.time()
+        before = self._conn.total_changes
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+            [(key, array('f', vector).tobytes(), now) for key, vector in items.items()]
+        )
+        self._entries += self._conn.total_changes - before
+
+        overflow = self._entries - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE key IN ("
+                " SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+                (overflow,)
+            )
+            self._entries -= overflow
+            self.evictions += overflow
+        self._conn.commit()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        문서 임베딩 (캐시에 없는 텍스트만 실제 모델 호출)
+
+        Args:
+            texts: 임베딩할 텍스트 리스트
+
+        Returns:
+            입력 순서와 같은 벡터 리스트
+        """
+        keys = [self._key(text) for text in texts]
+
+        with self._lock:
+            cached = self._lookup(keys)
+
+        # 캐시 미스 텍스트는 중복 없이 한 번만 요청
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        computed = {}
+        if missing:
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors))
+            with self._lock:
+                self._store(computed)
+
+        with self._lock:
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+
+        return [cached[key] if key in cached else computed[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        질의 임베딩
+
+        OpenAI 임베딩은 문서/질의 구분이 없으므로 같은 캐시를 공유합니다.
+
+        Args:
+            text: 질의 텍스트
+
+        Returns:
+            임베딩 벡터
+        """
+        key = self._key(text)
+
+        with self._lock:
+            cached = self._lookup([key])
+            if key in cached:
+                self.hits += 1
+                return cached[key]
+
+        vector = self.embeddings.embed_query(text)
+        with self._lock:
+            self._store({key: vector})
+            self.misses += 1
+        return vector
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """
+        질의 임베딩 (비동기, 캐시 미스만 모델의 비동기 API 호출)
+
+        Args:
+            text: 질의 텍스트
+
+        Returns:
+            임베딩 벡터
+        """
+        key = self._key(text)
+
+        with self._lock:
+            cached = self._lookup([key])
+            if key in cached:
+                self.hits += 1
+                return cached[key]
+
+        vector = await self.embeddings.aembed_query(text)
+        with self._lock:
+            self._store({key: vector})
+            self.misses += 1
+        return vector
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        캐시 통계
+
+        Returns:
+            hits, misses, hit_rate, evictions, entries
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'evictions': self.evictions,
+                'entries': self._entries,
+            }
+
+    def close(self) -> None:
+        """남은 사용 시각 기록 후 SQLite 연결 종료"""
+        with self._lock:
+            self._flush_touches()
+            self._conn.commit()
+            self._conn.close()
@@ -0,0 +1,63 @@
+"""
+벡터 DB 생성 잠금 (프로세스 간)
+
+uvicorn 워커 여러 개가 동시에 시작하면 벡터 DB가 없을 때 각자 생성을 시도해
+같은 디렉토리에 겹쳐 쓰게 됩니다. 벡터 DB 옆의 잠금 파일에 OS 파일 잠금을 걸어
+생성/변경은 한 프로세스만, 읽기는 생성이 끝난 뒤에만 하도록 합니다.
+
+- 생성/변경: 배타 잠금 (다른 프로세스는 끝날 때까지 대기)
+- 읽기 전용 로드: 공유 잠금 (여러 워커가 동시에 로드 가능)
+- 프로세스가 죽으면 OS가 잠금을 풀어 주므로 오래된 잠금 파일이 남아도 문제 없음
+"""
+
+import os
+from contextlib import contextmanager
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def lock_path(vectorstore_path: str) -> str:
+    """
+    잠금 파일 경로 (재생성 시 디렉토리가 삭제되므로 디렉토리 바깥에 둠)
+
+    Args:
+        vectorstore_path: 벡터 DB 디렉토리
+
+    Returns:
+        "<벡터 DB 디렉토리>.lock"
+    """
+    return os.path.normpath(vectorstore_path) + ".lock"
+
+
+@contextmanager
+def index_lock(vectorstore_path: str, shared: bool = False) -> Iterator[None]:
+    """
+    벡터 DB 잠금 (with 블록 동안 유지)
+
+    Args:
+        vectorstore_path: 벡터 DB 디렉토리
+        shared: True면 공유(읽기) 잠금, False면 배타(쓰기) 잠금
+                (Windows에서는 항상 배타 잠금)
+    """
+    path = lock_path(vectorstore_path)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    with open(path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
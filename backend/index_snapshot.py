@@ -0,0 +1,253 @@
+"""
+단일 파일 색인 스냅샷
+
+청크 본문/메타데이터, 벡터(float32와 압축 벡터), IVF 색인, 어휘(BM25) 색인을
+파일 하나에 담아 CI에서 한 번 만들고 배포 산출물로 옮길 수 있게 합니다.
+RAGSystem(snapshot_path=...)은 이 파일을 메모리 매핑으로 바로 열므로
+벡터 DB 디렉토리 복사나 임베딩 재계산 없이 시작합니다.
+
+파일 구조 (정수는 little-endian):
+    MAGIC (8바이트) | 형식 버전 (uint32) | 헤더 길이 (uint64) | 헤더 SHA-256 (32바이트)
+    | 헤더 (JSON) | 섹션들 (각 섹션은 64바이트 경계에 정렬)
+
+헤더에는 메타데이터(임베딩 모델, 차원, 정밀도 등)와 섹션별 위치, dtype, shape,
+SHA-256이 들어 있습니다. 배열 섹션은 복사 없이 numpy 배열로 매핑됩니다.
+
+사용 예 (backend 디렉토리에서):
+    python index_snapshot.py export index.ragsnap   # python main.py가 만든 vectorstore/ (chroma)
+    python index_snapshot.py export index.ragsnap --snapshot-backend ivf --vector-precision int8
+    python index_snapshot.py verify index.ragsnap
+    python index_snapshot.py info index.ragsnap
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from typing import Any, Dict, Union
+
+import numpy as np
+
+MAGIC = b"DYURAGSS"
+FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct("<8sIQ32s")
+_ALIGNMENT = 64
+
+Section = Union[np.ndarray, bytes]
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _section_bytes(data: Section) -> bytes:
+    if isinstance(data, np.ndarray):
+        return np.ascontiguousarray(data).tobytes()
+    return bytes(data)
+
+
+def write_snapshot(path: str, sections: Dict[str, Section],
+                   metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    스냅샷 파일 기록 (임시 파일에 쓴 뒤 원자적으로 교체)
+
+    Args:
+        path: 저장 경로
+        sections: 섹션 이름 → numpy 배열 또는 bytes
+        metadata: 헤더에 넣을 메타데이터 (JSON 직렬화 가능해야 함)
+
+    Returns:
+        기록한 헤더
+    """
+    payloads = {name: _section_bytes(data) for name, data in sections.items()}
+
+    entries: Dict[str, Dict[str, Any]] = {}
+    for name, data in sections.items():
+        entry: Dict[str, Any] = {
+            'length': len(payloads[name]),
+            'sha256': hashlib.sha256(payloads[name]).hexdigest(),
+        }
+        if isinstance(data, np.ndarray):
+            entry['dtype'] = data.dtype.str
+            entry['shape'] = list(data.shape)
+        entries[name] = entry
+
+    # 헤더 길이가 정해져야 섹션 위치가 정해지므로, 위치를 채운 뒤 길이가 같아질 때까지 반복
+    header: Dict[str, Any] = {'format_version': FORMAT_VERSION, 'metadata': metadata,
+                              'sections': entries}
+    header_bytes = b""
+    while True:
+        offset = _align(_PREAMBLE.size + len(header_bytes))
+        for entry in entries.values():
+            entry['offset'] = offset
+            offset = _align(offset + entry['length'])
+        encoded = json.dumps(header, ensure_ascii=False).encode('utf-8')
+        settled = len(encoded) == len(header_bytes)
+        header_bytes = encoded
+        if settled:
+            break
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header_bytes),
+                               hashlib.sha256(header_bytes).digest()))
+        f.write(header_bytes)
+        for name, entry in entries.items():
+            f.write(b"\0" * (entry['offset'] - f.tell()))
+            f.write(payloads[name])
+    os.replace(tmp_path, path)
+    return header
+
+
+class IndexSnapshot:
+    """메모리 매핑된 스냅샷 파일 (읽기 전용)"""
+
+    def __init__(self, path: str, verify: bool = True):
+        """
+        스냅샷 열기
+
+        형식 버전, 헤더 체크섬, 파일 크기는 항상 확인하고,
+        verify=True면 모든 섹션의 SHA-256도 확인합니다.
+
+        Args:
+            path: 스냅샷 파일 경로
+            verify: 섹션 체크섬까지 확인할지 여부
+
+        Raises:
+            ValueError: 스냅샷 파일이 아니거나, 지원하지 않는 버전이거나, 손상된 경우
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < _PREAMBLE.size:
+                raise ValueError(f"❌ 스냅샷 파일이 아닙니다: {path}")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, header_length, header_sha256 = _PREAMBLE.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"❌ 스냅샷 파일이 아닙니다: {path}")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"❌ 지원하지 않는 스냅샷 형식 버전입니다: {version} "
+                             f"(지원: {FORMAT_VERSION})")
+
+        header_bytes = self._mmap[_PREAMBLE.size:_PREAMBLE.size + header_length]
+        if hashlib.sha256(header_bytes).digest() != header_sha256:
+            raise ValueError(f"❌ 스냅샷 헤더가 손상되었습니다: {path}")
+        header = json.loads(header_bytes)
+
+        self.metadata: Dict[str, Any] = header['metadata']
+        self.sections: Dict[str, Dict[str, Any]] = header['sections']
+        end = max((entry['offset'] + entry['length'] for entry in self.sections.values()),
+                  default=0)
+        if size < end:
+            raise ValueError(f"❌ 스냅샷 파일이 잘렸습니다: {path} ({size} < {end}바이트)")
+
+        if verify:
+            self.verify()
+
+    def verify(self) -> None:
+        """
+        모든 섹션의 SHA-256 확인
+
+        Raises:
+            ValueError: 체크섬이 다른 섹션이 있는 경우
+        """
+        for name, entry in self.sections.items():
+            start = entry['offset']
+            digest = hashlib.sha256(memoryview(self._mmap)[start:start + entry['length']])
+            if digest.hexdigest() != entry['sha256']:
+                raise ValueError(f"❌ 스냅샷 섹션이 손상되었습니다: {name}")
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.sections
+
+    def array(self, name: str) -> np.ndarray:
+        """
+        배열 섹션 (파일을 직접 가리키는 읽기 전용 배열)
+
+        Args:
+            name: 섹션 이름
+
+        Returns:
+            numpy 배열
+        """
+        entry = self.sections[name]
+        dtype = np.dtype(entry['dtype'])
+        count = entry['length'] // dtype.itemsize if dtype.itemsize else 0
+        array = np.frombuffer(self._mmap, dtype=dtype, count=count, offset=entry['offset'])
+        return array.reshape(entry['shape'])
+
+    def section_bytes(self, name: str) -> bytes:
+        """
+        바이트 섹션 (복사본)
+
+        Args:
+            name: 섹션 이름
+
+        Returns:
+            섹션 내용
+        """
+        entry = self.sections[name]
+        return self._mmap[entry['offset']:entry['offset'] + entry['length']]
+
+    def buffer(self) -> mmap.mmap:
+        """파일 전체 매핑 (섹션 위치는 sections[name]['offset'])"""
+        return self._mmap
+
+
+def main():
+    """스냅샷 생성/확인 CLI"""
+    parser = argparse.ArgumentParser(description="단일 파일 색인 스냅샷")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export = subparsers.add_parser('export', help="데이터 파일로 색인을 만들어 스냅샷으로 저장")
+    export.add_argument('output')
+    # 기본값은 main.rag_settings_from_env와 같음 (python main.py가 만든 벡터 DB를 그대로 내보냄)
+    export.add_argument('--data-path', default=os.getenv("RAG_DATA_PATH", "data/111_cleaned.jsonl"))
+    export.add_argument('--vectorstore-path', default=os.getenv("RAG_VECTORSTORE_PATH", "vectorstore"))
+    export.add_argument('--vector-backend', default=os.getenv("RAG_VECTOR_BACKEND", "chroma"),
+                        choices=["chroma", "flat", "ivf"], help="열어서 내보낼 벡터 DB의 백엔드")
+    export.add_argument('--snapshot-backend', default=None, choices=["flat", "ivf"],
+                        help="스냅샷 백엔드 (생략하면 --vector-backend, chroma면 flat)")
+    export.add_argument('--vector-precision', default=os.getenv("RAG_VECTOR_PRECISION", "float32"),
+                        choices=["float32", "float16", "int8"])
+    export.add_argument('--nlist', type=int, default=None, help="ivf 백엔드의 리스트 수")
+
+    for name, help_text in (('verify', "체크섬 확인"), ('info', "메타데이터 출력")):
+        subparser = subparsers.add_parser(name, help=help_text)
+        subparser.add_argument('path')
+
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+        from rag_system import RAGSystem
+
+        index_params = {'nlist': args.nlist} if args.nlist else None
+        # chroma는 float32만 저장하므로 정밀도는 스냅샷을 만들 때만 적용
+        store_precision = args.vector_precision if args.vector_backend != "chroma" else "float32"
+        rag = RAGSystem(data_path=args.data_path, vectorstore_path=args.vectorstore_path,
+                        vector_backend=args.vector_backend,
+                        vector_precision=store_precision,
+                        vector_index_params=index_params)
+        rag.export_snapshot(args.output, backend=args.snapshot_backend,
+                            precision=args.vector_precision)
+        return
+
+    start = time.perf_counter()
+    snapshot = IndexSnapshot(args.path, verify=args.command == 'verify')
+    if args.command == 'verify':
+        print(f"✅ 스냅샷 체크섬 확인 완료 ({time.perf_counter() - start:.2f}s)")
+    print(json.dumps(snapshot.metadata, ensure_ascii=False, indent=2))
+    for name, entry in snapshot.sections.items():
+        print(f"  {name:24s} {entry['length'] / 2**20:10.2f}MB  "
+              f"{entry.get('dtype', 'bytes'):6s} {entry.get('shape', '')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+"""
+한국어 문장 단위 토큰 청커
+
+RecursiveCharacterTextSplitter는 글자 수로만 자르기 때문에 한국어 문장 중간에서
+청크가 끊기는 일이 잦습니다. 이 청커는 텍스트를 먼저 다음 단위로 나눈 뒤
+토큰 예산 안에서 단위를 그대로 이어 붙여 청크를 만듭니다.
+
+- 블록: 빈 줄로 구분된 문단, 마크다운 표(OCR 결과의 | 열 | 열 |), OCR 구분선(====, ----)
+- 단위: 문장(다./요./다 등 종결 어미, . ! ?), 줄, 목록 항목(1. 1) ① 가. ※ ■ ○ 등), 표의 행
+  (clean_html로 공백이 압축된 텍스트에서도 | | 행 경계, ====, ## 제목 앞에서 나눔)
+
+블록이 통째로 들어가면 블록을 쪼개지 않고, 넘치는 블록만 단위 경계에서 자릅니다.
+짧은 제목 블록은 다음 블록과 묶고, 한 단위가 예산보다 크면 공백 위치에서 자릅니다.
+청크는 항상 원문의 연속 구간이며 metadata['start_index']에 원문 내 위치를 기록하므로
+컨텍스트 구성 시 인접 청크 병합이 그대로 동작합니다. 겹침(overlap)은 앞 청크의
+끝 문장들을 토큰 예산 안에서 통째로 가져옵니다.
+"""
+
+import re
+from bisect import bisect_left
+from typing import Iterable, Iterator, List, Tuple
+
+from langchain.schema import Document
+
+from tokenizer import count_tokens, count_tokens_batch
+
+# 청크를 이루는 조각: (시작 위치, 끝 위치, 토큰 수, 종류)
+Piece = Tuple[int, int, int, int]
+_UNIT, _TEXT_BLOCK, _TABLE_BLOCK = 0, 1, 2  # 문장/행, 통째로 넣은 본문 블록, 통째로 넣은 표
+
+# 다음 블록에 붙여 둘 제목 블록의 최대 글자 수
+_HEADING_MAX_CHARS = 60
+
+# 조각을 이을 때 경계마다 더할 여유 토큰 수 - 이은 텍스트의 토큰 수는 조각별 토큰 수와
+# 사이 공백의 토큰 수를 더한 값보다 클 수 있음 (근사 계산의 바이트 나머지, BPE 경계 병합)
+_JOIN_SLACK = 2
+
+# 블록 경계: 빈 줄
+_PARAGRAPH_BREAK = re.compile(r'\n[ \t\r\f\v]*\n\s*')
+
+# 표의 행 (| 로 시작해 | 로 끝나는 줄)과 OCR 구분선
+_TABLE_ROW = re.compile(r'^[ \t]*\|.*\|[ \t]*$')
+_SEPARATOR_LINE = re.compile(r'^[ \t]*(?:={3,}|-{3,})[ \t]*$')
+
+# 블록 안의 단위 경계 - 모든 패턴이 기준 글자로 시작하도록 작성해
+# 정규식 엔진이 기준 글자만 빠르게 찾아보게 함 (\s로 시작하면 글자마다 시도해 느림)
+# 문장 끝: 문장 부호(2024. 3. 같은 날짜와 가. 같은 목록 번호 제외)
+# 또는 종결 어미 뒤의 공백 (그룹 1)
+_SENTENCE_END = re.compile(
+    r'[.!?。다요]'
+    r'(?:(?<=[.!?。])(?<!\d\.)(?<!\s[가나라마바사아자차카타파하]\.)'
+    r'|(?<=니다|세요|어요|아요|해요|에요|예요|이다|한다|된다|있다|없다|였다|했다|까요))'
+    r'(\s+)'
+)
+# 기호 목록과 제목 (앞에 공백이 있는 ① ※ ■ ○ 등, ## 제목)
+_SYMBOL_MARKER = re.compile(r'(?:[①-⑳※■□▶►○●◆◇ㆍ•▪]|#(?=[# ]))(?<=\s.)')
+# 공백이 압축된 텍스트(clean_html 결과) 안의 표 행 경계(| |)와 OCR 구분선(====) 앞뒤 공백
+_INLINE_BREAK = re.compile(r'\|([ \t]+)(?=\|)|=(?<=\s=)={2,}(?=\s)')
+# 번호 목록 (1. 12) 가. 나) 뒤에 공백, 2024. 3. 같은 날짜 제외) - 기준 글자는 . 또는 )
+_NUMBER_MARKER = re.compile(
+    r'[.)](?=\s)'
+    r'(?:(?<=\s\d.)(?<!\d\.\s\d.)'
+    r'|(?<=\s\d\d.)(?<!\d\.\s\d\d.)'
+    r'|(?<=\s[가나라마바사아자차카타파하].))'
+)
+
+
+class KoreanSentenceChunker:
+    """토큰 수 기준 한국어 문장 단위 청커"""
+
+    def __init__(self, chunk_tokens: int = 400, chunk_overlap_tokens: int = 60):
+        """
+        청커 초기화
+
+        Args:
+            chunk_tokens: 청크 최대 토큰 수
+            chunk_overlap_tokens: 앞 청크와 겹칠 최대 토큰 수 (문장 단위로만 겹침)
+
+        Raises:
+            ValueError: 토큰 수 설정이 잘못된 경우
+        """
+        if chunk_tokens <= 0:
+            raise ValueError(f"❌ chunk_tokens는 1 이상이어야 합니다: {chunk_tokens}")
+        if not 0 <= chunk_overlap_tokens < chunk_tokens:
+            raise ValueError(f"❌ chunk_overlap_tokens는 0 이상 chunk_tokens 미만이어야 합니다: "
+                             f"{chunk_overlap_tokens}")
+        self.chunk_tokens = chunk_tokens
+        self.chunk_overlap_tokens = chunk_overlap_tokens
+
+    def _blocks(self, text: str) -> Iterator[Tuple[int, int, bool]]:
+        """
+        텍스트를 블록으로 분할
+
+        Returns:
+            (시작, 끝, 표 여부) 이터레이터
+        """
+        start = 0
+        for match in _PARAGRAPH_BREAK.finditer(text):
+            yield from self._split_paragraph(text, start, match.start())
+            start = match.end()
+        yield from self._split_paragraph(text, start, len(text))
+
+    @staticmethod
+    def _split_paragraph(text: str, start: int, end: int) -> Iterator[Tuple[int, int, bool]]:
+        """문단 안의 표와 구분선을 별도 블록으로 분리"""
+        paragraph = text[start:end]
+        if '|' not in paragraph and '===' not in paragraph and '---' not in paragraph:
+            if paragraph.strip():
+                yield start, end, False
+            return
+
+        block_start, block_is_table = None, False
+        position = start
+        for line in paragraph.split('\n'):
+            line_end = position + len(line)
+            if _SEPARATOR_LINE.match(line) or not line.strip():
+                kind = None  # 블록을 끊고 버림
+            else:
+                kind = bool(_TABLE_ROW.match(line))
+            if block_start is not None and kind != block_is_table:
+                yield block_start, position - 1, block_is_table
+                block_start = None
+            if kind is not None and block_start is None:
+                block_start, block_is_table = position, kind
+            position = line_end + 1
+        if block_start is not None:
+            yield block_start, end, block_is_table
+
+    @staticmethod
+    def _boundaries(text: str) -> List[Tuple[int, int]]:
+        """
+        텍스트 전체의 단위 경계(줄바꿈, 문장 끝, 목록 기호 앞) 공백 구간
+
+        Returns:
+            (시작, 끝) 리스트 (시작 위치 순)
+        """
+        cuts = [match.span(1) for match in _SENTENCE_END.finditer(text)]
+        position = text.find('\n')
+        while position != -1:
+            cuts.append((position, position + 1))
+            position = text.find('\n', position + 1)
+        for match in _SYMBOL_MARKER.finditer(text):
+            cuts.append((match.start() - 1, match.start()))
+        for match in _INLINE_BREAK.finditer(text):
+            if match.group(1):
+                cuts.append(match.span(1))
+            else:
+                cuts.append((match.start() - 1, match.start()))
+                cuts.append((match.end(), match.end() + 1))
+        for match in _NUMBER_MARKER.finditer(text):
+            marker_start = match.start()
+            while not text[marker_start - 1].isspace():
+                marker_start -= 1
+            cuts.append((marker_start - 1, marker_start))
+        cuts.sort()
+        return cuts
+
+    @staticmethod
+    def _units(text: str, start: int, end: int, is_table: bool,
+               cuts: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """블록을 단위(문장/줄/목록 항목/표의 행) 구간으로 분할"""
+        spans = []
+        position = start
+        if is_table:
+            for line in text[start:end].split('\n'):
+                if line.strip():
+                    spans.append((position, position + len(line)))
+                position += len(line) + 1
+        else:
+            for index in range(bisect_left(cuts, (start, start)), len(cuts)):
+                cut_start, cut_end = cuts[index]
+                if cut_start >= end:
+                    break
+                if cut_start > position:
+                    spans.append((position, cut_start))
+                position = max(position, cut_end)
+            if end > position:
+                spans.append((position, end))
+
+        # 앞뒤 공백 제외
+        trimmed = []
+        for unit_start, unit_end in spans:
+            if text[unit_start].isspace() or text[unit_end - 1].isspace():
+                segment = text[unit_start:unit_end]
+                stripped = segment.strip()
+                if not stripped:
+                    continue
+                unit_start += len(segment) - len(segment.lstrip())
+                unit_end = unit_start + len(stripped)
+            trimmed.append((unit_start, unit_end))
+        return trimmed
+
+    @staticmethod
+    def _is_heading(text: str, start: int, end: int) -> bool:
+        """한 줄짜리 짧은 제목 블록인지 (## 제목, 공지 제목, OCR 안내 문구 등)"""
+        if end - start > _HEADING_MAX_CHARS or '\n' in text[start:end]:
+            return False
+        return text[start] == '#' or _SENTENCE_END.search(text[start:end] + ' ') is None
+
+    def _hard_split(self, text: str, unit: Piece) -> List[Piece]:
+        """예산보다 큰 단위를 공백 위치에서 분할 (공백이 없으면 글자 단위)"""
+        start, end, tokens, _ = unit
+        chars_per_piece = max(1, (end - start) * self.chunk_tokens // max(tokens, 1))
+        pieces = []
+        while start < end:
+            cut = min(end, start + chars_per_piece)
+            while True:
+                if cut < end:
+                    space = text.rfind(' ', start + 1, cut + 1)
+                    if space > start:
+                        cut = space
+                piece_tokens = count_tokens(text[start:cut])
+                if piece_tokens <= self.chunk_tokens or cut - start == 1:
+                    break
+                # 글자당 토큰 수가 평균보다 많은 구간 (URL, 숫자 등) - 비율대로 줄여 다시 자름
+                cut = start + max(1, (cut - start) * self.chunk_tokens // piece_tokens)
+            pieces.append((start, cut, piece_tokens, _UNIT))
+            start = cut
+            while start < end and text[start].isspace():
+                start += 1
+        return pieces
+
+    def split_text_spans(self, text: str) -> Iterator[Tuple[int, str]]:
+        """
+        텍스트를 청크로 분할
+
+        Args:
+            text: 입력 텍스트
+
+        Returns:
+            (원문 내 시작 위치, 청크 텍스트) 이터레이터
+        """
+        blocks = []
+        for start, end, is_table in self._blocks(text):
+            segment = text[start:end]
+            stripped = segment.strip()
+            if stripped:
+                start += len(segment) - len(segment.lstrip())
+                blocks.append((start, start + len(stripped), is_table))
+        if not blocks:
+            return
+        block_tokens = count_tokens_batch([text[start:end] for start, end, _ in blocks])
+
+        # 문장 경계는 블록을 쪼개야 할 때(예산 초과, 겹침)만 계산
+        cuts: List[Tuple[int, int]] = []
+        cuts_ready = False
+
+        def units_of(start: int, end: int, is_table: bool) -> List[Piece]:
+            nonlocal cuts, cuts_ready
+            if not is_table and not cuts_ready:
+                cuts, cuts_ready = self._boundaries(text), True
+            spans = self._units(text, start, end, is_table, cuts)
+            counts = count_tokens_batch([text[s:e] for s, e in spans])
+            return [(s, e, n, _UNIT) for (s, e), n in zip(spans, counts)]
+
+        current: List[Piece] = []
+        current_tokens = 0
+
+        def joined_tokens(start: int, end: int, tokens: int) -> int:
+            """
+            현재 청크에 조각(start~end, 토큰 수 tokens)을 이었을 때의 토큰 수 상한
+
+            사이의 공백/줄바꿈/구분선과 경계 여유를 더한 추정치가 예산 안이면 그대로 쓰고,
+            넘칠 수 있을 때만 이은 구간을 직접 셈 (청크마다 예산 근처에서 몇 번만 셈)
+            """
+            if not current:
+                return tokens
+            gap = text[current[-1][1]:start]
+            estimate = current_tokens + count_tokens(gap) + tokens + _JOIN_SLACK
+            if estimate <= self.chunk_tokens:
+                return estimate
+            return count_tokens(text[current[0][0]:end])
+
+        def emit() -> Tuple[int, str]:
+            return current[0][0], text[current[0][0]:current[-1][1]]
+
+        def carry_over(next_tokens: int) -> None:
+            """앞 청크 끝 문장들을 겹침 예산 안에서 다음 청크 앞에 남김 (표 블록은 제외)"""
+            nonlocal current, current_tokens
+            budget = min(self.chunk_overlap_tokens, self.chunk_tokens - next_tokens)
+            if budget > 0 and current[-1][3] == _TEXT_BLOCK:
+                current[-1:] = units_of(current[-1][0], current[-1][1], False)
+            kept, kept_tokens = [], 0
+            for piece in reversed(current[1:]):  # 청크 전체를 겹치지는 않음
+                if piece[3] != _UNIT or kept_tokens + piece[2] > budget:
+                    break
+                kept.append(piece)
+                kept_tokens += piece[2]
+            current = kept[::-1]
+            # 조각 사이 공백까지 포함한 실제 토큰 수로 다시 확인
+            current_tokens = count_tokens(emit()[1]) if current else 0
+            while current and current_tokens > budget:
+                current = current[1:]
+                current_tokens = count_tokens(emit()[1]) if current else 0
+
+        def place(piece: Piece, overlap: bool) -> Iterator[Tuple[int, str]]:
+            """조각을 현재 청크에 추가 (넘치면 청크를 내보내고 새 청크에서 시작)"""
+            nonlocal current, current_tokens
+            start, end, tokens, kind = piece
+            total = joined_tokens(start, end, tokens)
+            if current and total > self.chunk_tokens:
+                yield emit()
+                if overlap:
+                    carry_over(tokens)
+                else:
+                    current, current_tokens = [], 0
+                total = joined_tokens(start, end, tokens)
+                if total > self.chunk_tokens:  # 겹침을 남긴 채로는 넘치면 겹침 없이 시작
+                    current, total = [], tokens
+            current.append(piece)
+            current_tokens = total
+
+        def place_unit(unit: Piece, overlap: bool) -> Iterator[Tuple[int, str]]:
+            """단위를 추가 (예산보다 크면 먼저 공백 위치에서 자름)"""
+            pieces = [unit] if unit[2] <= self.chunk_tokens else self._hard_split(text, unit)
+            for piece in pieces:
+                yield from place(piece, overlap)
+
+        previous_is_table = False
+        heading_start = None  # 다음 블록에 붙일 제목 블록(들)의 시작 위치
+        for (start, end, is_table), tokens in zip(blocks, block_tokens):
+            if not is_table and self._is_heading(text, start, end):
+                # 제목이 이어지면 (OCR 안내 문구 + ## 이미지 1 등) 함께 묶음
+                if heading_start is None:
+                    heading_start = start
+                continue
+            if heading_start is not None:
+                # 제목이 청크 끝에 홀로 남지 않도록 다음 블록과 묶음
+                heading = (heading_start, text[heading_start:start].rstrip())
+                heading_start = None
+                heading_tokens = count_tokens(heading[1])
+                joined = count_tokens(text[heading[0]:end])  # 제목과 블록 사이 줄바꿈 포함
+                if joined <= self.chunk_tokens:
+                    start, tokens = heading[0], joined
+                else:
+                    yield from place_unit((heading[0], heading[0] + len(heading[1]),
+                                           heading_tokens, _UNIT), overlap=not previous_is_table)
+            if tokens <= self.chunk_tokens:
+                # 블록이 통째로 들어갈 수 있으면 쪼개지 않고 필요하면 새 청크에서 시작
+                # (표와 본문 사이에는 겹침을 두지 않음)
+                kind = _TABLE_BLOCK if is_table else _TEXT_BLOCK
+                yield from place((start, end, tokens, kind),
+                                 overlap=not (is_table or previous_is_table))
+            else:
+                for unit in units_of(start, end, is_table):
+                    yield from place_unit(unit, overlap=True)
+            previous_is_table = is_table
+        if heading_start is not None:
+            heading = text[heading_start:].rstrip()
+            yield from place_unit((heading_start, heading_start + len(heading),
+                                   count_tokens(heading), _UNIT), overlap=not previous_is_table)
+
+        if current:
+            yield emit()
+
+    def split_text(self, text: str) -> List[str]:
+        """
+        텍스트를 청크 텍스트 리스트로 분할
+
+        Args:
+            text: 입력 텍스트
+
+        Returns:
+            청크 텍스트 리스트
+        """
+        return [chunk for _, chunk in self.split_text_spans(text)]
+
+    def iter_split_documents(self, documents: Iterable[Document]) -> Iterator[Document]:
+        """
+        문서를 하나씩 청크로 분할 (제너레이터)
+
+        Args:
+            documents: 원본 Document 이터러블 (제너레이터 가능)
+
+        Returns:
+            metadata에 원본 메타데이터와 start_index가 들어간 청크 이터레이터
+        """
+        for document in documents:
+            for start, chunk in self.split_text_spans(document.page_content):
+                metadata = dict(document.metadata)
+                metadata['start_index'] = start
+                yield Document(page_content=chunk, metadata=metadata)
+
+    def split_documents(self, documents: Iterable[Document]) -> List[Document]:
+        """
+        문서를 청크 리스트로 분할 (RecursiveCharacterTextSplitter와 같은 사용법)
+
+        Args:
+            documents: 원본 Document 이터러블
+
+        Returns:
+            청크 리스트
+        """
+        return list(self.iter_split_documents(documents))
@@ -0,0 +1,304 @@
+"""
+한국어 문자 n-gram 역색인 (BM25) 및 하이브리드 검색
+
+벡터 검색만으로는 학수번호, 날짜, 학과명 같은 정확한 용어를 놓치는 경우가 있어
+벡터 DB와 함께 어휘(lexical) 색인을 만듭니다.
+
+- 단어 문자(한글, 영문, 숫자) 2-gram을 용어로 사용 (한 글자 단어는 1-gram)
+- 포스팅은 용어별로 이어 붙인 NumPy 배열(CSR 형태)로 저장
+- BM25 점수, 결과는 청크 ID로 반환
+- 벡터 검색 결과와는 RRF(Reciprocal Rank Fusion)로 결합
+"""
+
+import os
+import unicodedata
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.vectorstores import VectorStore
+
+from retrieval_cache import MemoizedRetriever, get_documents_by_ids
+
+# 검색 방식
+SEARCH_MODES = ("vector", "lexical", "hybrid")
+
+_DOC_BITS = 21                        # 문서 번호 비트 수 (최대 약 200만 청크)
+_UNIGRAM_FLAG = np.uint64(1 << 42)    # 1-gram 용어 표시 비트
+
+
+def _word_mask(codepoints: np.ndarray) -> np.ndarray:
+    """단어 문자(한글 음절/자모, 한자, 영문 소문자, 숫자) 여부"""
+    return (
+        ((codepoints >= 0xAC00) & (codepoints <= 0xD7A3)) |
+        ((codepoints >= 0x3131) & (codepoints <= 0x318E)) |
+        ((codepoints >= 0x4E00) & (codepoints <= 0x9FFF)) |
+        ((codepoints >= 0x61) & (codepoints <= 0x7A)) |
+        ((codepoints >= 0x30) & (codepoints <= 0x39))
+    )
+
+
+def _codepoints(text: str) -> np.ndarray:
+    """NFKC 정규화 + 소문자 변환 후 유니코드 코드포인트 배열"""
+    text = unicodedata.normalize('NFKC', text).lower()
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+
+
+def _term_keys(codepoints: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    코드포인트 배열의 n-gram 용어 키와 각 용어의 시작 위치 계산
+
+    Args:
+        codepoints: _codepoints()의 결과
+
+    Returns:
+        (uint64 용어 키 배열, 용어 시작 위치 배열)
+    """
+    if codepoints.size == 0:
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64)
+
+    word = _word_mask(codepoints)
+    prev_word = np.concatenate(([False], word[:-1]))
+    next_word = np.concatenate((word[1:], [False]))
+
+    bigram_pos = np.flatnonzero(word[:-1] & word[1:])
+    bigram_keys = ((codepoints[bigram_pos].astype(np.uint64) << np.uint64(21)) |
+                   codepoints[bigram_pos + 1].astype(np.uint64))
+
+    unigram_pos = np.flatnonzero(word & ~prev_word & ~next_word)
+    unigram_keys = codepoints[unigram_pos].astype(np.uint64) | _UNIGRAM_FLAG
+
+    return (np.concatenate((bigram_keys, unigram_keys)),
+            np.concatenate((bigram_pos, unigram_pos)))
+
+
+class LexicalIndex:
+    """배열 기반 포스팅을 사용하는 BM25 역색인"""
+
+    # 저장/로드하는 배열 (생성자 인자 이름)
+    ARRAY_NAMES = ("ids", "vocab", "offsets", "postings", "term_freqs", "doc_lengths")
+
+    def __init__(self, ids: np.ndarray, vocab: np.ndarray, offsets: np.ndarray,
+                 postings: np.ndarray, term_freqs: np.ndarray, doc_lengths: np.ndarray,
+                 k1: float = 1.2, b: float = 0.75, common_term_ratio: float = 0.5):
+        """
+        초기화 (보통 build() 또는 load()로 생성)
+
+        Args:
+            ids: 문서 번호 → 청크 ID
+            vocab: 정렬된 용어 키
+            offsets: 용어별 포스팅 시작 위치 (len(vocab) + 1)
+            postings: 문서 번호 (용어별로 이어 붙임)
+            term_freqs: 포스팅별 용어 빈도
+            doc_lengths: 문서별 용어 수
+            k1, b: BM25 파라미터
+            common_term_ratio: 이 비율보다 많은 문서에 나오는 용어는 검색 시 생략 가능
+        """
+        self.ids = ids
+        self.vocab = vocab
+        self.offsets = offsets
+        self.postings = postings
+        self.term_freqs = term_freqs
+        self.doc_lengths = doc_lengths
+        self.k1 = k1
+        self.b = b
+        self.common_term_ratio = common_term_ratio
+
+        n_docs = len(ids)
+        avg_length = float(doc_lengths.mean()) if n_docs else 0.0
+        self._length_norm = (k1 * (1 - b + b * doc_lengths / avg_length)
+                             if avg_length > 0 else np.full(n_docs, k1)).astype(np.float32)
+        df = np.diff(offsets).astype(np.float32)
+        idf = np.log1p((n_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+        # 포스팅별 BM25 기여도를 미리 계산해 검색 시에는 더하기만 수행
+        tf = term_freqs.astype(np.float32)
+        posting_idf = np.repeat(idf, np.diff(offsets))
+        self._impacts = (posting_idf * tf * (k1 + 1) /
+                         (tf + self._length_norm[postings])).astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def build(cls, ids: Sequence[str], texts: Sequence[str]) -> "LexicalIndex":
+        """
+        색인 생성
+
+        전체 문서를 한 번에 이어 붙여 벡터화 연산으로 처리하므로
+        10만 개 청크도 수 초 안에 색인할 수 있습니다.
+
+        Args:
+            ids: 청크 ID 리스트
+            texts: 청크 텍스트 리스트
+
+        Returns:
+            LexicalIndex 인스턴스
+        """
+        n_docs = len(ids)
+        if n_docs >= 1 << _DOC_BITS:
+            raise ValueError(f"❌ 어휘 색인은 최대 {1 << _DOC_BITS}개 청크까지 지원합니다.")
+
+        # 문서 구분자('\x00')는 단어 문자가 아니므로 n-gram이 문서를 넘지 않음
+        joined = '\x00'.join(text.replace('\x00', ' ') for text in texts)
+        codepoints = _codepoints(joined)
+        keys, positions = _term_keys(codepoints)
+
+        # 용어 시작 위치 앞의 구분자 개수 = 문서 번호
+        doc_of_position = np.cumsum(codepoints == 0)
+        docs = doc_of_position[positions].astype(np.uint64)
+
+        # (용어, 문서) 쌍을 하나의 uint64로 합쳐 정렬 → 용어 빈도 계산
+        pairs, term_freqs = np.unique((keys << np.uint64(_DOC_BITS)) | docs,
+                                      return_counts=True)
+        pair_terms = pairs >> np.uint64(_DOC_BITS)
+        postings = (pairs & np.uint64((1 << _DOC_BITS) - 1)).astype(np.int32)
+
+        vocab, starts = np.unique(pair_terms, return_index=True)
+        offsets = np.append(starts, len(pairs)).astype(np.int64)
+        doc_lengths = np.bincount(docs.astype(np.int64), minlength=n_docs).astype(np.float32)
+
+        return cls(
+            ids=np.asarray(list(ids), dtype=str),
+            vocab=vocab,
+            offsets=offsets,
+            postings=postings,
+            term_freqs=np.minimum(term_freqs, np.iinfo(np.uint16).max).astype(np.uint16),
+            doc_lengths=doc_lengths
+        )
+
+    def search(self, query: str, k: int = 3) -> List[Tuple[str, float]]:
+        """
+        BM25 검색
+
+        Args:
+            query: 검색어
+            k: 반환할 결과 수
+
+        Returns:
+            (청크 ID, 점수) 리스트 - 점수 내림차순
+        """
+        if len(self.ids) == 0:
+            return []
+
+        keys = np.unique(_term_keys(_codepoints(query))[0])
+        term_ids = np.searchsorted(self.vocab, keys)
+        in_range = term_ids < len(self.vocab)
+        term_ids, keys = term_ids[in_range], keys[in_range]
+        term_ids = term_ids[self.vocab[term_ids] == keys]
+
+        if term_ids.size == 0:
+            return []
+
+        # 거의 모든 문서에 있는 용어(예: "니다")는 순위에 영향이 작으므로
+        # 더 변별력 있는 용어가 있을 때는 건너뜀
+        df = self.offsets[term_ids + 1] - self.offsets[term_ids]
+        selective = df <= self.common_term_ratio * len(self.ids)
+        if selective.any():
+            term_ids = term_ids[selective]
+
+        # 질의 용어들의 포스팅을 모아 문서별로 한 번에 합산
+        slices = [slice(self.offsets[t], self.offsets[t + 1]) for t in term_ids]
+        scores = np.bincount(
+            np.concatenate([self.postings[part] for part in slices]),
+            weights=np.concatenate([self._impacts[part] for part in slices]),
+            minlength=len(self.ids)
+        )
+
+        if k < len(scores):
+            top = np.argpartition(scores, len(scores) - k)[-k:]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind='stable')]
+        matched = top[scores[top] > 0]
+
+        return [(str(self.ids[i]), float(scores[i])) for i in matched]
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """
+        저장할 배열 (LexicalIndex(**arrays)로 다시 생성 가능)
+
+        Returns:
+            배열 이름 → 배열
+        """
+        return {name: getattr(self, name) for name in self.ARRAY_NAMES}
+
+    def save(self, path: str) -> None:
+        """
+        .npz 파일로 저장
+
+        Args:
+            path: 저장 경로
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'wb') as f:
+            np.savez(f, **self.arrays())
+
+    @classmethod
+    def load(cls, path: str) -> "LexicalIndex":
+        """
+        저장된 색인 로드
+
+        Args:
+            path: .npz 파일 경로
+
+        Returns:
+            LexicalIndex 인스턴스
+        """
+        with np.load(path) as data:
+            return cls(**{name: data[name] for name in data.files})
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> List[str]:
+    """
+    여러 검색 결과 순위를 RRF로 결합
+
+    Args:
+        rankings: 청크 ID 순위 리스트들
+        k: RRF 상수 (클수록 하위 순위 영향이 커짐)
+
+    Returns:
+        결합된 청크 ID 순위
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, chunk_id in enumerate(ranking):
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores, key=lambda chunk_id: -scores[chunk_id])
+
+
+class HybridRetriever(BaseRetriever):
+    """어휘 색인 / 벡터 검색 / 둘의 RRF 결합 중 하나로 검색"""
+
+    vectorstore: VectorStore
+    lexical_index: Optional[Any] = None
+    vector_retriever: Optional[MemoizedRetriever] = None
+    mode: str = "hybrid"
+    k: int = 3
+    fetch_k: int = 10
+
+    def _get_relevant_documents(
+            self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        # 어휘 검색만 하는 경우 임베딩 호출 없음
+        if self.mode == "lexical" or self.vector_retriever is None:
+            ids = [chunk_id for chunk_id, _ in self.lexical_index.search(query, self.k)]
+            return get_documents_by_ids(self.vectorstore, ids)
+
+        vector_docs = self.vector_retriever.invoke(
+            query, config={"callbacks": run_manager.get_child()})
+        if self.mode == "vector" or self.lexical_index is None:
+            return vector_docs[:self.k]
+
+        vector_ids = [doc.metadata.get('chunk_id') for doc in vector_docs]
+        lexical_ids = [chunk_id for chunk_id, _ in self.lexical_index.search(query, self.fetch_k)]
+        fused = reciprocal_rank_fusion([vector_ids, lexical_ids])[:self.k]
+
+        # 벡터 검색으로 이미 가져온 문서는 재사용
+        by_id = {doc.metadata.get('chunk_id'): doc for doc in vector_docs}
+        missing = [chunk_id for chunk_id in fused if chunk_id not in by_id]
+        for doc in get_documents_by_ids(self.vectorstore, missing):
+            by_id[doc.metadata.get('chunk_id')] = doc
+        return [by_id[chunk_id] for chunk_id in fused if chunk_id in by_id]
@@ -2,19 +2,27 @@
 동양대학교 RAG 챗봇 FastAPI 백엔드
 
 이 모듈은 RAG 시스템을 REST API로 제공합니다.
+무거운 모듈(langchain, OpenAI 클라이언트 등) 임포트와 색인 로드는 포트를 연 뒤
+백그라운드에서 진행하며, 진행 상황은 /ready에서 확인할 수 있습니다.
 """
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, List, Any
+from typing import TYPE_CHECKING, Dict, Iterator, List, Any, Literal, Optional
+import json
 import sys
 import os
+import threading
 
 # backend 디렉토리를 Python 경로에 추가
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from rag_system import RAGSystem
+from startup_progress import StartupProgress
+
+if TYPE_CHECKING:
+    from rag_system import RAGSystem
 
 # FastAPI 앱 생성
 app = FastAPI(
@@ -32,19 +40,45 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 전역 RAG 시스템 인스턴스
-rag_system: RAGSystem = None
+# 전역 RAG 시스템 인스턴스 (백그라운드 로드와 예열이 끝나면 설정됨)
+rag_system: Optional["RAGSystem"] = None
+
+# 시작 진행 상황
+startup_progress = StartupProgress()
+
+
+def rag_settings_from_env() -> Dict[str, Any]:
+    """
+    환경 변수로 RAG 시스템 설정 구성
+
+    멀티 워커 실행(serve.py) 시 워커 프로세스에 설정을 전달하는 데 사용합니다.
+
+    Returns:
+        RAGSystem 생성 인자
+    """
+    return {
+        'data_path': os.getenv("RAG_DATA_PATH", "data/111_cleaned.jsonl"),
+        'vectorstore_path': os.getenv("RAG_VECTORSTORE_PATH", "vectorstore"),
+        'vector_backend': os.getenv("RAG_VECTOR_BACKEND", "chroma"),
+        'vector_precision': os.getenv("RAG_VECTOR_PRECISION", "float32"),
+        'read_only': os.getenv("RAG_READ_ONLY", "0") == "1",
+        'snapshot_path': os.getenv("RAG_SNAPSHOT_PATH") or None,
+        'verify_snapshot': os.getenv("RAG_VERIFY_SNAPSHOT", "1") == "1",
+    }
 
 
 # Request/Response 모델
 class ChatRequest(BaseModel):
     """채팅 요청 모델"""
     question: str
+    # 검색 방식 (생략 시 서버 기본값): 벡터 / 어휘(BM25) / 둘의 결합
+    search_mode: Optional[Literal["vector", "lexical", "hybrid"]] = None
 
     class Config:
         json_schema_extra = {
             "example": {
-                "question": "수강신청은 언제야?"
+                "question": "수강신청은 언제야?",
+                "search_mode": "hybrid"
             }
         }
 
@@ -56,10 +90,18 @@ class Source(BaseModel):
     content: str
 
 
+class ContextUsage(BaseModel):
+    """프롬프트 컨텍스트 토큰 사용량"""
+    chunks: int
+    tokens: int
+    saved_tokens: int
+
+
 class ChatResponse(BaseModel):
     """채팅 응답 모델"""
     answer: str
     sources: List[Source]
+    context: Optional[ContextUsage] = None
 
     class Config:
         json_schema_extra = {
@@ -71,25 +113,62 @@ class ChatResponse(BaseModel):
                         "source": "https://www.dyu.ac.kr/academic/course-registration",
                         "content": "2024학년도 1학기 수강신청 일정을 안내합니다..."
                     }
-                ]
+                ],
+                "context": {"chunks": 3, "tokens": 940, "saved_tokens": 210}
             }
         }
 
 
-@app.on_event("startup")
-async def startup_event():
-    """서버 시작 시 RAG 시스템 초기화"""
+def _load_rag_system() -> None:
+    """RAG 시스템 임포트/로드/예열 (백그라운드 스레드)"""
     global rag_system
     try:
-        print("=" * 60)
-        print("🚀 FastAPI 서버를 시작합니다...")
-        print("=" * 60)
-        rag_system = RAGSystem(data_path="data/111_cleaned.json")
+        startup_progress.begin("imports")
+        from rag_system import RAGSystem
+
+        system = RAGSystem(**rag_settings_from_env(), on_stage=startup_progress.begin)
+
+        startup_progress.begin("warm_up")
+        system.warm_up()
+
+        rag_system = system
+        startup_progress.finish()
+        print(f"⏱️ 시작 시간: {startup_progress.summary()}")
         print("✅ FastAPI 서버가 준비되었습니다!")
         print("=" * 60)
     except Exception as e:
+        startup_progress.fail(e)
         print(f"❌ RAG 시스템 초기화 실패: {e}")
-        raise
+
+
+def _require_rag_system() -> "RAGSystem":
+    """
+    준비된 RAG 시스템 반환
+
+    Raises:
+        HTTPException: 아직 로드 중(503)이거나 초기화에 실패한 경우(500)
+    """
+    if rag_system is not None:
+        return rag_system
+    if startup_progress.status == "failed":
+        raise HTTPException(
+            status_code=500,
+            detail=f"RAG 시스템 초기화에 실패했습니다: {startup_progress.error}"
+        )
+    raise HTTPException(
+        status_code=503,
+        detail="RAG 시스템이 아직 준비되지 않았습니다. 잠시 후 다시 시도해주세요.",
+        headers={"Retry-After": "1"}
+    )
+
+
+@app.on_event("startup")
+async def startup_event():
+    """서버 시작 시 RAG 시스템 로드를 백그라운드에서 시작 (포트는 바로 열림)"""
+    print("=" * 60)
+    print("🚀 FastAPI 서버를 시작합니다...")
+    print("=" * 60)
+    threading.Thread(target=_load_rag_system, name="rag-loader", daemon=True).start()
 
 
 @app.get("/", tags=["Health Check"])
@@ -121,12 +200,8 @@ async def chat(request: ChatRequest) -> ChatResponse:
     Raises:
         HTTPException: RAG 시스템 미초기화 또는 처리 중 오류 발생 시
     """
-    # RAG 시스템 초기화 확인
-    if rag_system is None:
-        raise HTTPException(
-            status_code=500,
-            detail="RAG 시스템이 초기화되지 않았습니다."
-        )
+    # RAG 시스템 준비 확인
+    system = _require_rag_system()
 
     # 질문 유효성 검사
     if not request.question or not request.question.strip():
@@ -136,13 +211,14 @@ async def chat(request: ChatRequest) -> ChatResponse:
         )
 
     try:
-        # 답변 생성
-        result = rag_system.ask(request.question)
+        # 답변 생성 (비동기 - 생성 중에도 다른 요청 처리)
+        result = await system.aask(request.question, search_mode=request.search_mode)
 
         # 응답 반환
         return ChatResponse(
             answer=result['answer'],
-            sources=[Source(**source) for source in result['sources']]
+            sources=[Source(**source) for source in result['sources']],
+            context=result.get('context')
         )
 
     except Exception as e:
@@ -153,19 +229,107 @@ async def chat(request: ChatRequest) -> ChatResponse:
         )
 
 
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """server-sent events 형식의 이벤트 문자열"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _stream_answer(question: str, search_mode: Optional[str]) -> Iterator[str]:
+    """ask_stream 결과를 SSE 이벤트로 변환 (오류는 error 이벤트로 전달)"""
+    try:
+        for event in rag_system.ask_stream(question, search_mode=search_mode):
+            yield _sse_event(event.pop('type'), event)
+    except Exception as e:
+        print(f"❌ 오류 발생: {e}")
+        yield _sse_event("error", {"detail": f"답변 생성 중 오류가 발생했습니다: {str(e)}"})
+
+
+@app.post("/chat/stream", tags=["Chat"])
+async def chat_stream(request: ChatRequest) -> StreamingResponse:
+    """
+    스트리밍 채팅 API - server-sent events로 답변 전송
+
+    이벤트 순서:
+        sources: {"sources": [...], "context": {...} 또는 null}
+        token: {"content": "답변 조각"} (여러 번)
+        done: {"answer": "전체 답변"}
+        (실패 시) error: {"detail": "오류 메시지"}
+
+    Args:
+        request: 사용자 질문을 포함한 요청
+
+    Returns:
+        text/event-stream 응답
+
+    Raises:
+        HTTPException: RAG 시스템 미초기화 또는 빈 질문인 경우
+    """
+    _require_rag_system()
+
+    if not request.question or not request.question.strip():
+        raise HTTPException(
+            status_code=400,
+            detail="질문을 입력해주세요."
+        )
+
+    # 동기 제너레이터는 StreamingResponse가 스레드풀에서 순회하므로 이벤트 루프를 막지 않음
+    return StreamingResponse(
+        _stream_answer(request.question, request.search_mode),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.get("/health", tags=["Health Check"])
 async def health_check() -> Dict[str, Any]:
     """
     상세 헬스 체크 엔드포인트
 
+    프로세스가 살아 있는지 확인하는 용도로, RAG 시스템을 로드하는 중에도 200을 반환합니다.
+    요청을 받을 수 있는지는 /ready로 확인하세요.
+
     Returns:
-        서버 및 RAG 시스템 상태
+        서버 및 RAG 시스템 상태 (status: starting / healthy / failed)
     """
-    return {
-        "status": "healthy",
+    status = {"starting": "starting", "ready": "healthy", "failed": "failed"}
+    body = {
+        "status": status[startup_progress.status],
         "rag_system_initialized": rag_system is not None,
         "api_version": "1.0.0"
     }
+    if startup_progress.status == "failed":
+        return JSONResponse(status_code=503, content=body)
+    return body
+
+
+@app.get("/ready", tags=["Health Check"])
+async def ready_check() -> JSONResponse:
+    """
+    준비 상태 엔드포인트 (로드 밸런서/오케스트레이터 readiness 확인용)
+
+    RAG 시스템 로드와 예열이 끝나야 200을 반환하고, 그 전에는 503과 함께
+    진행 중인 단계와 단계별 소요 시간을 반환합니다.
+
+    Returns:
+        status, stage, completed, timings, elapsed, ready_after, error
+    """
+    snapshot = startup_progress.snapshot()
+    return JSONResponse(status_code=200 if snapshot['status'] == "ready" else 503,
+                        content=snapshot)
+
+
+@app.get("/stats", tags=["Monitoring"])
+async def cache_stats() -> Dict[str, Any]:
+    """
+    캐시 통계 엔드포인트
+
+    Returns:
+        답변/임베딩 캐시 적중률 등 통계
+
+    Raises:
+        HTTPException: RAG 시스템 미초기화 시
+    """
+    return _require_rag_system().cache_stats()
 
 
 if __name__ == "__main__":
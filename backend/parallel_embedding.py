@@ -0,0 +1,106 @@
+"""
+병렬 배치 임베딩
+
+인덱스 생성 시 청크 배치를 제한된 워커 풀에서 동시에 임베딩합니다.
+분당 토큰 수(TPM) 제한을 지키면서, 결과는 입력 배치 순서대로 돌려주므로
+호출하는 쪽은 벡터 DB에 순서대로 기록할 수 있습니다.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from tokenizer import count_tokens
+
+
+class TokenRateLimiter:
+    """분당 토큰 수 제한 (토큰 버킷)"""
+
+    def __init__(self, tokens_per_minute: int):
+        """
+        초기화
+
+        Args:
+            tokens_per_minute: 분당 허용 토큰 수
+        """
+        self.capacity = tokens_per_minute
+        self.rate = tokens_per_minute / 60.0  # 초당 충전량
+        self._available = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int) -> None:
+        """
+        토큰이 충분해질 때까지 대기 후 차감
+
+        Args:
+            tokens: 사용할 토큰 수 (버킷 크기보다 크면 버킷 크기로 제한)
+        """
+        tokens = min(tokens, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._available = min(
+                    self.capacity,
+                    self._available + (now - self._updated) * self.rate
+                )
+                self._updated = now
+
+                if self._available >= tokens:
+                    self._available -= tokens
+                    return
+
+                wait = (tokens - self._available) / self.rate
+            time.sleep(wait)
+
+
+def embed_batches_concurrently(
+        embeddings: Embeddings,
+        batches: List[List[str]],
+        max_workers: int = 4,
+        tokens_per_minute: Optional[int] = None
+) -> Iterator[Tuple[int, List[List[float]]]]:
+    """
+    배치들을 동시에 임베딩하고 입력 순서대로 결과 반환
+
+    동시에 진행 중인 배치는 max_workers * 2개로 제한하여
+    큰 코퍼스에서도 메모리 사용량이 일정하게 유지됩니다.
+
+    Args:
+        embeddings: 임베딩 모델
+        batches: 텍스트 배치 리스트
+        max_workers: 동시 요청 수
+        tokens_per_minute: 분당 토큰 제한 (None이면 제한 없음)
+
+    Yields:
+        (배치 인덱스, 벡터 리스트) - 배치 인덱스 오름차순
+    """
+    limiter = TokenRateLimiter(tokens_per_minute) if tokens_per_minute else None
+
+    def embed(texts: List[str]) -> List[List[float]]:
+        if limiter is not None:
+            limiter.acquire(sum(count_tokens(text) for text in texts))
+        return embeddings.embed_documents(texts)
+
+    max_in_flight = max(1, max_workers) * 2
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        pending = deque()
+        next_batch = 0
+
+        while next_batch < len(batches) or pending:
+            while next_batch < len(batches) and len(pending) < max_in_flight:
+                pending.append((next_batch, executor.submit(embed, batches[next_batch])))
+                next_batch += 1
+
+            index, future = pending.popleft()
+            try:
+                yield index, future.result()
+            except BaseException:
+                for _, remaining in pending:
+                    remaining.cancel()
+                raise
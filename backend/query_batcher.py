@@ -0,0 +1,140 @@
+"""
+요청 간 질의 임베딩 마이크로 배칭
+
+부하가 걸리면 /chat 요청마다 텍스트 1개짜리 임베딩 API 호출을 따로 보냅니다.
+동시에 들어온 질의를 최대 max_wait_ms 동안(또는 max_batch_size개가 찰 때까지) 모아
+embed_documents 한 번으로 보내고, 각 벡터를 호출자에게 돌려줍니다.
+
+- 동기(embed_query)와 비동기(aembed_query) 호출자가 같은 배치를 공유
+- 배치 안의 같은 텍스트는 한 번만 요청
+- 배치 호출이 실패하면 그 배치의 모든 호출자가 같은 예외를 받음
+- OpenAI 임베딩은 문서/질의 구분이 없으므로 embed_documents로 질의를 임베딩해도 결과가 같음
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+
+class QueryEmbeddingBatcher(Embeddings):
+    """동시 질의를 모아 배치로 임베딩하는 래퍼"""
+
+    def __init__(self, embeddings: Embeddings, max_batch_size: int = 64,
+                 max_wait_ms: float = 5.0, max_concurrent_batches: int = 4):
+        """
+        초기화 (배치를 모으는 백그라운드 스레드 시작)
+
+        Args:
+            embeddings: 실제 임베딩 모델 (예: CachedEmbeddings)
+            max_batch_size: 한 번에 보낼 최대 질의 수
+            max_wait_ms: 첫 질의가 들어온 뒤 배치를 모으는 최대 시간 (밀리초)
+            max_concurrent_batches: 동시에 진행할 배치 API 호출 수
+        """
+        self.embeddings = embeddings
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        self._queue: "queue.Queue[Optional[Tuple[str, Future]]]" = queue.Queue()
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrent_batches,
+                                        thread_name_prefix="embed-batch")
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.queries = 0
+        self.max_seen_batch = 0
+
+        self._thread = threading.Thread(target=self._collect, name="embed-batcher",
+                                        daemon=True)
+        self._thread.start()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """문서 임베딩 (색인 생성용, 배칭 없이 그대로 전달)"""
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        질의 임베딩 (다른 요청의 질의와 함께 배치로 전송)
+
+        Args:
+            text: 질의 텍스트
+
+        Returns:
+            임베딩 벡터
+        """
+        return self._submit(text).result()
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """질의 임베딩 (비동기, 배치가 끝날 때까지 이벤트 루프를 막지 않음)"""
+        return await asyncio.wrap_future(self._submit(text))
+
+    def _submit(self, text: str) -> Future:
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def _collect(self) -> None:
+        """첫 질의부터 max_wait 동안 또는 max_batch_size개까지 모아 배치 전송"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 \
+                        else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)  # 지금 배치를 보낸 뒤 종료
+                    break
+                batch.append(item)
+
+            self._pool.submit(self._embed_batch, batch)
+
+    def _embed_batch(self, batch: List[Tuple[str, Future]]) -> None:
+        """배치 임베딩 후 각 호출자에게 결과 전달"""
+        unique = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            vectors = self.embeddings.embed_documents(unique)
+        except BaseException as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        by_text = dict(zip(unique, vectors))
+        for text, future in batch:
+            future.set_result(by_text[text])
+
+        with self._stats_lock:
+            self.batches += 1
+            self.queries += len(batch)
+            self.max_seen_batch = max(self.max_seen_batch, len(batch))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        배칭 통계
+
+        Returns:
+            batches(API 호출 수), queries, avg_batch_size, max_batch_size
+        """
+        with self._stats_lock:
+            return {
+                'batches': self.batches,
+                'queries': self.queries,
+                'avg_batch_size': self.queries / self.batches if self.batches else 0.0,
+                'max_batch_size': self.max_seen_batch,
+            }
+
+    def close(self) -> None:
+        """대기 중인 질의를 처리한 뒤 백그라운드 스레드 종료"""
+        self._queue.put(None)
+        self._thread.join()
+        self._pool.shutdown(wait=True)
@@ -1,54 +1,215 @@
 """
 동양대학교 RAG 기반 챗봇 시스템
 
-이 모듈은 LangChain, OpenAI API, ChromaDB를 사용하여
+이 모듈은 LangChain, OpenAI API, ChromaDB(또는 NumPy 전수 검색)를 사용하여
 학생들의 학사 관련 질문에 답변하는 RAG 시스템을 제공합니다.
 """
 
-import json
+import asyncio
+import copy
+import hashlib
 import os
-from typing import Dict, List, Any
+import time
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from typing import Callable, Dict, Iterable, Iterator, List, Any, Optional
 from pathlib import Path
 
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
-from langchain_community.vectorstores import Chroma
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.vectorstores import VectorStore
 from langchain.chains import RetrievalQA
 from langchain.prompts import PromptTemplate
 from langchain.schema import Document
 
+from answer_cache import SemanticAnswerCache
+from chunk_dedup import ChunkDeduplicator, print_dedup_report
+from data.records import iter_records
+from context_packing import ContextPacker, PackedContextRetriever, packing_report
+from embedding_cache import CachedEmbeddings
+from lexical_index import SEARCH_MODES, HybridRetriever, LexicalIndex
+from parallel_embedding import embed_batches_concurrently
+from retrieval_cache import MemoizedRetriever, RetrievalCache, normalize_query
+from index_lock import index_lock
+from index_snapshot import IndexSnapshot, write_snapshot
+from korean_chunker import KoreanSentenceChunker
+from query_batcher import QueryEmbeddingBatcher
+from single_flight import SingleFlight
+from vector_backends import (VECTOR_BACKENDS, VECTOR_PRECISIONS, open_snapshot_vectorstore,
+                             open_vectorstore, snapshot_sections)
+
 # 환경 변수 로드
 load_dotenv()
 
 
+def compute_chunk_id(doc: Document) -> str:
+    """
+    청크의 안정적인 콘텐츠 해시 ID 계산
+
+    출처 URL, 제목, 청크 본문이 같으면 항상 같은 ID가 나오므로
+    재크롤링 후에도 바뀌지 않은 청크를 식별할 수 있습니다.
+    근사 중복을 합친 대표 청크는 사본 출처 목록도 반영하므로
+    사본 출처가 바뀌면 동기화 시 메타데이터가 갱신됩니다.
+
+    Args:
+        doc: 청크 Document
+
+    Returns:
+        SHA-256 16진수 문자열
+    """
+    hasher = hashlib.sha256()
+    for part in (doc.metadata.get('source', ''),
+                 doc.metadata.get('title', ''),
+                 doc.page_content):
+        hasher.update(part.encode('utf-8'))
+        hasher.update(b'\x00')
+    if 'duplicate_sources' in doc.metadata:
+        hasher.update(doc.metadata['duplicate_sources'].encode('utf-8'))
+        hasher.update(b'\x00')
+    return hasher.hexdigest()
+
+
 class RAGSystem:
     """RAG 기반 질의응답 시스템"""
 
+    # 한 번에 임베딩/저장할 청크 수 (OpenAI API 토큰 제한 회피)
+    BATCH_SIZE = 100
+
+    # 임베딩 모델 (스냅샷에 기록해 다른 모델로 만든 색인을 열지 않도록 확인)
+    EMBEDDING_MODEL = "text-embedding-3-small"
+
     def __init__(self, data_path: str = "data/sample_data.json",
-                 vectorstore_path: str = "vectorstore"):
+                 vectorstore_path: str = "vectorstore",
+                 embedding_cache_path: Optional[str] = "embedding_cache.sqlite3",
+                 embedding_concurrency: int = 4,
+                 embedding_tokens_per_minute: Optional[int] = None,
+                 answer_cache_size: int = 512,
+                 answer_cache_ttl: float = 3600,
+                 answer_cache_threshold: float = 0.92,
+                 search_mode: str = "hybrid",
+                 vector_backend: str = "chroma",
+                 vector_precision: str = "float32",
+                 vector_index_params: Optional[Dict[str, Any]] = None,
+                 context_token_budget: Optional[int] = 1000,
+                 context_fetch_k: int = 8,
+                 search_workers: int = 4,
+                 query_batch_size: int = 64,
+                 query_batch_wait_ms: float = 5.0,
+                 read_only: bool = False,
+                 on_stage: Optional[Callable[[str], None]] = None,
+                 snapshot_path: Optional[str] = None,
+                 verify_snapshot: bool = True,
+                 chunk_tokens: int = 400,
+                 chunk_overlap_tokens: int = 60,
+                 chunk_dedup_threshold: Optional[float] = 0.9):
         """
         RAG 시스템 초기화
 
         Args:
-            data_path: JSON 데이터 파일 경로
+            data_path: 데이터 파일 경로 (JSONL 또는 JSON 배열)
             vectorstore_path: 벡터 DB 저장 경로
+            embedding_cache_path: 임베딩 캐시(SQLite) 경로, None이면 캐시 미사용
+            embedding_concurrency: 인덱스 생성 시 동시에 임베딩할 배치 수 (1이면 순차 처리)
+            embedding_tokens_per_minute: 인덱스 생성 시 분당 임베딩 토큰 제한 (None이면 제한 없음)
+            answer_cache_size: 답변 캐시 최대 항목 수 (0이면 캐시 미사용)
+            answer_cache_ttl: 캐시된 답변 유효 시간 (초)
+            answer_cache_threshold: 캐시 적중으로 볼 질문 간 최소 코사인 유사도 (질문의 숫자도 같아야 적중)
+            search_mode: 기본 검색 방식 ("vector", "lexical", "hybrid")
+            vector_backend: 벡터스토어 백엔드 ("chroma", 메모리 매핑 전수 검색 "flat",
+                            근사 검색 "ivf")
+            vector_precision: flat/ivf 백엔드의 검색용 벡터 정밀도 ("float32", "float16", "int8")
+            vector_index_params: ivf 백엔드의 빌드/검색 파라미터
+                                 (예: {"nlist": 1024, "nprobe": 16})
+            context_token_budget: 프롬프트 컨텍스트 토큰 예산
+                                  (None이면 상위 3개 청크를 그대로 사용). 기존 방식의
+                                  상위 3개 × 500자 청크는 최대 약 1150토큰
+                                  (sample_data 기준 글자당 약 0.77토큰)이므로
+                                  기본값 1000은 기존 컨텍스트보다 크지 않음
+            context_fetch_k: 컨텍스트 구성 전에 검색할 후보 청크 수
+            search_workers: aask()에서 검색(CPU 작업)을 실행할 스레드 수
+            query_batch_size: 동시 요청의 질의 임베딩을 묶을 최대 개수 (1 이하면 배칭 안 함)
+            query_batch_wait_ms: 질의 임베딩 배치를 모으는 최대 대기 시간 (밀리초)
+            read_only: True면 이미 만들어진 벡터 DB/어휘 색인을 읽기만 함
+                       (멀티 워커 서버의 워커용, 벡터 DB가 없으면 오류)
+            on_stage: 초기화 단계가 시작될 때마다 단계 이름으로 호출할 함수
+                      ("clients", "vectorstore", "lexical_index", "qa_chain")
+            snapshot_path: 단일 파일 색인 스냅샷 경로 - 주어지면 벡터 DB 디렉토리 대신
+                           스냅샷을 읽기 전용으로 열고, 백엔드/정밀도는 스냅샷 설정을 따름
+            verify_snapshot: 스냅샷을 열 때 모든 섹션의 체크섬 확인
+            chunk_tokens: 청크 최대 토큰 수 (문장/목록/표 경계에서 자름)
+            chunk_overlap_tokens: 인접 청크와 겹칠 최대 토큰 수
+            chunk_dedup_threshold: 임베딩 전에 근사 중복(메뉴, 푸터 등 보일러플레이트) 청크를
+                                   하나로 합칠 최소 유사도 (None이면 합치지 않음)
+
+        Raises:
+            ValueError: 설정이 잘못되었거나 읽기 전용인데 벡터 DB가 없는 경우
         """
         print("🚀 RAG 시스템을 초기화하는 중...")
 
+        if search_mode not in SEARCH_MODES:
+            raise ValueError(f"❌ 지원하지 않는 검색 방식입니다: {search_mode}")
+        if vector_backend not in VECTOR_BACKENDS:
+            raise ValueError(f"❌ 지원하지 않는 벡터스토어 백엔드입니다: {vector_backend}")
+        if vector_precision not in VECTOR_PRECISIONS:
+            raise ValueError(f"❌ 지원하지 않는 벡터 정밀도입니다: {vector_precision}")
+        if vector_backend == "chroma" and vector_precision != "float32":
+            raise ValueError("❌ float16/int8 정밀도는 flat/ivf 백엔드에서만 사용할 수 있습니다.")
+
         self.data_path = data_path
         self.vectorstore_path = vectorstore_path
+        self.embedding_concurrency = embedding_concurrency
+        self.embedding_tokens_per_minute = embedding_tokens_per_minute
+        self.search_mode = search_mode
+        self.vector_backend = vector_backend
+        self.vector_precision = vector_precision
+        self.vector_index_params = vector_index_params
+        self.read_only = read_only or snapshot_path is not None
+        self.snapshot_path = snapshot_path
+        self.chunker = KoreanSentenceChunker(chunk_tokens=chunk_tokens,
+                                             chunk_overlap_tokens=chunk_overlap_tokens)
+        self.chunk_deduplicator = None
+        if chunk_dedup_threshold is not None:
+            self.chunk_deduplicator = ChunkDeduplicator(threshold=chunk_dedup_threshold)
+        self.chunk_dedup_report: Optional[Dict[str, Any]] = None  # 마지막 분할의 중복 제거 보고서
+
+        # 중복 제거 + 인접 청크 병합 + 토큰 예산 컨텍스트 구성
+        self.context_fetch_k = context_fetch_k
+        self.context_packer = None
+        if context_token_budget is not None:
+            self.context_packer = ContextPacker(max_tokens=context_token_budget)
+
+        stage = on_stage or (lambda name: None)
 
         # OpenAI API 키 확인
+        stage("clients")
         if not os.getenv("OPENAI_API_KEY"):
             raise ValueError("❌ OPENAI_API_KEY가 .env 파일에 설정되지 않았습니다!")
 
         # OpenAI Embeddings 설정
-        print("📝 임베딩 모델 설정 중 (text-embedding-3-small)...")
+        print(f"📝 임베딩 모델 설정 중 ({self.EMBEDDING_MODEL})...")
         self.embeddings = OpenAIEmbeddings(
-            model="text-embedding-3-small"
+            model=self.EMBEDDING_MODEL
         )
 
+        # 임베딩 캐시 (벡터 DB 재생성 시에도 유지되도록 별도 파일에 저장)
+        if embedding_cache_path:
+            print(f"🗄️ 임베딩 캐시 사용: {embedding_cache_path}")
+            self.embeddings = CachedEmbeddings(
+                self.embeddings,
+                model=self.EMBEDDING_MODEL,
+                cache_path=embedding_cache_path
+            )
+
+        # 동시 요청의 질의 임베딩을 모아 한 번에 호출 (색인 생성은 self.embeddings 직접 사용)
+        self.query_embeddings = self.embeddings
+        if query_batch_size > 1:
+            self.query_embeddings = QueryEmbeddingBatcher(
+                self.embeddings,
+                max_batch_size=query_batch_size,
+                max_wait_ms=query_batch_wait_ms
+            )
+
         # OpenAI LLM 설정
         print("🤖 LLM 모델 설정 중 (gpt-4o-mini)...")
         self.llm = ChatOpenAI(
@@ -56,100 +217,407 @@ class RAGSystem:
             temperature=0.3
         )
 
-        # 벡터 DB 로드 또는 생성
-        self.vectorstore = self._load_or_create_vectorstore()
+        # 의미 기반 답변 캐시 (표현만 다른 같은 질문 재사용)
+        self.answer_cache = None
+        if answer_cache_size > 0:
+            self.answer_cache = SemanticAnswerCache(
+                max_entries=answer_cache_size,
+                ttl_seconds=answer_cache_ttl,
+                threshold=answer_cache_threshold
+            )
+
+        # 질의 벡터 / 검색 결과 메모이제이션 (인덱스 버전별)
+        self.retrieval_cache = RetrievalCache()
+
+        # 같은 질문의 동시 요청 합치기
+        self.single_flight = SingleFlight()
+
+        # 비동기 경로에서 검색을 실행할 스레드 풀 (이벤트 루프를 막지 않도록 분리)
+        self._search_executor = ThreadPoolExecutor(max_workers=search_workers,
+                                                   thread_name_prefix="rag-search")
 
-        # QA 체인 생성
+        # 벡터 DB / 어휘(BM25) 색인 로드 또는 생성
+        # (여러 프로세스가 동시에 시작해도 생성은 한 프로세스만, 나머지는 끝난 뒤 로드)
+        self.index_version = 0
+        if snapshot_path is not None:
+            # 스냅샷 파일은 원자적으로 교체되고 변경되지 않으므로 잠금 불필요
+            stage("vectorstore")
+            snapshot = self._open_snapshot(snapshot_path, verify_snapshot)
+            stage("lexical_index")
+            self.lexical_index = self._load_snapshot_lexical_index(snapshot)
+        else:
+            with index_lock(self.vectorstore_path, shared=self.read_only):
+                stage("vectorstore")
+                self.vectorstore = self._load_or_create_vectorstore()
+                self._migrate_legacy_vectorstore()
+                stage("lexical_index")
+                self.lexical_index = self._load_or_create_lexical_index()
+
+        # QA 체인 생성 (검색 방식별로 필요할 때 추가 생성)
         print("⚙️ QA 체인 생성 중...")
+        stage("qa_chain")
         self.qa_chain = self._create_qa_chain()
+        self._qa_chains = {self.search_mode: self.qa_chain}
 
         print("✅ RAG 시스템 초기화 완료!\n")
 
-    def _load_or_create_vectorstore(self) -> Chroma:
+    def _load_or_create_vectorstore(self) -> VectorStore:
         """
         벡터 DB 로드 또는 생성
 
         Returns:
-            Chroma 벡터스토어 인스턴스
+            벡터스토어 인스턴스
+
+        Raises:
+            ValueError: 읽기 전용 모드에서 벡터 DB가 없거나, 디렉토리가 vector_backend
+                형식이 아닌 경우 (예: Chroma 벡터 DB를 flat으로 열기)
         """
-        if os.path.exists(self.vectorstore_path):
-            print("📂 기존 벡터 DB를 로드하는 중...")
-            return Chroma(
-                persist_directory=self.vectorstore_path,
-                embedding_function=self.embeddings
-            )
+        # 빈 디렉토리는 생성 전으로 봄 (예: 직접 만든 마운트 디렉토리)
+        if os.path.isdir(self.vectorstore_path) and os.listdir(self.vectorstore_path):
+            print(f"📂 기존 벡터 DB를 로드하는 중 ({self.vector_backend})...")
+            vectorstore = open_vectorstore(self.vector_backend, self.vectorstore_path,
+                                           self.embeddings, self.vector_precision,
+                                           self.vector_index_params)
+            # 정밀도/IVF 설정이 바뀌어 메모리에서 다시 만든 부분은 파일로 저장
+            # (읽기 전용 워커들이 각자 메모리에 만들지 않고 파일을 공유하도록)
+            if getattr(vectorstore, 'stale', False) and not self.read_only:
+                print("🔁 현재 설정으로 벡터 DB 파일을 다시 저장하는 중...")
+                vectorstore.rewrite()
+            return vectorstore
+        elif self.read_only:
+            raise ValueError(f"❌ 읽기 전용 모드에서는 벡터 DB를 생성할 수 없습니다: "
+                             f"{self.vectorstore_path} (먼저 색인을 생성하세요)")
         else:
             print("🔨 새로운 벡터 DB를 생성하는 중...")
             return self._create_vectorstore()
 
-    def _create_vectorstore(self) -> Chroma:
+    def _migrate_legacy_vectorstore(self) -> None:
+        """
+        예전 방식(Chroma.from_documents)으로 만든 벡터 DB를 청크 해시 ID로 변환
+
+        예전 Chroma 벡터 DB는 임의의 UUID를 ID로 쓰고 metadata['chunk_id']가 없어, 하이브리드 검색에서
+        벡터 검색 결과와 어휘 색인 결과의 ID가 맞지 않습니다. 저장된 ID와 chunk_id가 다른 청크가
+        있으면 증분 동기화로 다시 저장합니다 (바뀌지 않은 텍스트는 임베딩 캐시 사용).
+
+        flat/ivf 백엔드는 처음부터 청크 해시 ID로만 만들어지므로 확인하지 않습니다
+        (모든 메타데이터를 읽으면 워커마다 시작 시간이 청크 수에 비례해 늘어남).
+
+        Raises:
+            ValueError: 읽기 전용 모드에서 예전 벡터 DB를 연 경우
+        """
+        if self.vector_backend != "chroma":
+            return
+        stored = self.vectorstore.get(include=["metadatas"])
+        legacy = any((metadata or {}).get('chunk_id') != chunk_id
+                     for chunk_id, metadata in zip(stored['ids'], stored['metadatas']))
+        if not legacy:
+            return
+        if self.read_only:
+            raise ValueError(f"❌ 청크 ID가 없는 예전 형식의 벡터 DB입니다: {self.vectorstore_path} "
+                             f"(쓰기 가능한 프로세스에서 먼저 sync_vectorstore()로 변환하세요)")
+        print("🔁 예전 형식의 벡터 DB를 청크 해시 ID로 변환하는 중...")
+        self._sync_vectorstore()
+
+    def _open_snapshot(self, snapshot_path: str, verify: bool) -> IndexSnapshot:
         """
-        JSON 데이터로부터 벡터 DB 생성
+        스냅샷 파일의 벡터스토어 열기
+
+        Args:
+            snapshot_path: 스냅샷 파일 경로
+            verify: 모든 섹션의 체크섬 확인 여부
 
         Returns:
-            Chroma 벡터스토어 인스턴스
+            열린 스냅샷
+
+        Raises:
+            ValueError: 스냅샷이 손상되었거나 다른 임베딩 모델로 만든 경우
         """
-        # JSON 데이터 로드
-        print(f"📖 데이터 파일 로드 중: {self.data_path}")
-        with open(self.data_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        print(f"📦 색인 스냅샷을 여는 중: {snapshot_path}")
+        snapshot = IndexSnapshot(snapshot_path, verify=verify)
+        model = snapshot.metadata.get('embedding_model')
+        if model != self.EMBEDDING_MODEL:
+            raise ValueError(f"❌ 스냅샷의 임베딩 모델({model})이 "
+                             f"현재 모델({self.EMBEDDING_MODEL})과 다릅니다.")
+
+        self.vector_backend = snapshot.metadata['backend']
+        self.vector_precision = snapshot.metadata['precision']
+        self.vectorstore = open_snapshot_vectorstore(snapshot, self.embeddings,
+                                                     self.vector_index_params)
+        print(f"  ✓ {self.vectorstore.count()}개 청크 "
+              f"({self.vector_backend}/{self.vector_precision})")
+        return snapshot
+
+    def _load_snapshot_lexical_index(self, snapshot: IndexSnapshot) -> LexicalIndex:
+        """
+        스냅샷의 어휘 색인 로드 (없으면 메모리에서 생성)
+
+        Args:
+            snapshot: 열린 스냅샷
 
-        print(f"📊 총 {len(data)}개의 문서를 발견했습니다.")
+        Returns:
+            LexicalIndex 인스턴스
+        """
+        if 'lexical/ids' not in snapshot:
+            return self._build_lexical_index()
+        names = LexicalIndex.ARRAY_NAMES
+        return LexicalIndex(**{name: snapshot.array(f"lexical/{name}") for name in names})
+
+    def export_snapshot(self, path: str, backend: Optional[str] = None,
+                        precision: Optional[str] = None) -> Dict[str, Any]:
+        """
+        현재 색인을 단일 파일 스냅샷으로 저장
+
+        Args:
+            path: 저장 경로
+            backend: 스냅샷 백엔드 ("flat", "ivf") - None이면 현재 백엔드 (chroma면 flat)
+            precision: 검색용 벡터 정밀도 - None이면 현재 정밀도
+
+        Returns:
+            스냅샷 메타데이터
 
-        # Document 객체 생성
-        documents = []
-        for item in data:
-            doc = Document(
+        Raises:
+            ValueError: 색인이 비어 있거나 스냅샷으로 저장할 수 없는 백엔드/정밀도인 경우
+        """
+        print(f"📦 색인 스냅샷을 저장하는 중: {path}")
+        if backend is None:
+            backend = self.vector_backend if self.vector_backend != "chroma" else "flat"
+        stored = self.vectorstore.get(include=["documents", "metadatas", "embeddings"])
+        sections, metadata = snapshot_sections(stored, backend,
+                                               precision or self.vector_precision,
+                                               self.vector_index_params,
+                                               ivf=getattr(self.vectorstore, 'ivf_index', None))
+        for name, array in self.lexical_index.arrays().items():
+            sections[f"lexical/{name}"] = array
+        metadata.update({
+            'embedding_model': self.EMBEDDING_MODEL,
+            'data_path': self.data_path,
+            'created_at': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        })
+
+        write_snapshot(path, sections, metadata)
+        size_mb = os.path.getsize(path) / 2**20
+        print(f"✅ 스냅샷 저장 완료! ({metadata['chunks']}개 청크, {size_mb:.1f}MB)")
+        return metadata
+
+    def _load_documents(self) -> Iterator[Document]:
+        """
+        데이터 파일(JSONL 또는 JSON 배열)을 문서 단위로 읽어 Document로 변환
+
+        파일 전체를 메모리에 올리지 않고 필요한 필드만 남기므로
+        base64 이미지가 들어 있는 큰 파일도 일정한 메모리로 읽습니다.
+
+        Returns:
+            Document 이터레이터
+        """
+        print(f"📖 데이터 파일 로드 중: {self.data_path}")
+        count = 0
+        for item in iter_records(self.data_path):
+            count += 1
+            yield Document(
                 page_content=item['content'],
                 metadata={
                     'source': item['url'],
                     'title': item['title']
                 }
             )
-            documents.append(doc)
 
-        # 텍스트 분할
+        print(f"📊 총 {count}개의 문서를 읽었습니다.")
+
+    def _split_documents(self, documents: Iterable[Document]) -> List[Document]:
+        """
+        문서를 청크로 분할하고 청크마다 콘텐츠 해시 ID 부여
+
+        문서는 하나씩 분할하며(제너레이터), 같은 출처의 동일한 청크는
+        하나만 남깁니다 (ID 충돌 방지). 청크 metadata['start_index']는
+        컨텍스트 구성 시 인접 청크 병합에 사용됩니다.
+        중복 제거를 켜면 여러 페이지에 반복되는 근사 중복 청크를 대표 청크 하나로 합치고
+        보고서를 chunk_dedup_report에 남깁니다.
+
+        Args:
+            documents: 원본 Document 이터러블
+
+        Returns:
+            metadata['chunk_id']가 채워진 청크 리스트
+        """
         print("✂️ 텍스트를 청크로 분할하는 중...")
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=500,
-            chunk_overlap=100,
-            length_function=len
-        )
-        splits = text_splitter.split_documents(documents)
-        print(f"📝 총 {len(splits)}개의 청크가 생성되었습니다.")
+        unique_splits = []
+        seen_ids = set()
+        for split in self.chunker.iter_split_documents(documents):
+            chunk_id = compute_chunk_id(split)
+            if chunk_id in seen_ids:
+                continue
+            seen_ids.add(chunk_id)
+            split.metadata['chunk_id'] = chunk_id
+            unique_splits.append(split)
 
-        # ChromaDB에 배치로 저장 (OpenAI API 토큰 제한 회피)
-        print("💾 벡터 DB에 저장하는 중 (배치 처리)...")
+        if self.chunk_deduplicator is not None and unique_splits:
+            unique_splits, self.chunk_dedup_report = \
+                self.chunk_deduplicator.deduplicate(unique_splits)
+            print_dedup_report(self.chunk_dedup_report)
+            for split in unique_splits:
+                if 'duplicate_sources' in split.metadata:
+                    split.metadata['chunk_id'] = compute_chunk_id(split)
 
-        # 첫 번째 배치로 vectorstore 생성
-        batch_size = 100  # 한 번에 처리할 청크 수
+        print(f"📝 총 {len(unique_splits)}개의 청크가 생성되었습니다.")
+        return unique_splits
 
-        if len(splits) > 0:
-            # 첫 배치로 vectorstore 초기화
-            first_batch = splits[:batch_size]
-            vectorstore = Chroma.from_documents(
-                documents=first_batch,
-                embedding=self.embeddings,
-                persist_directory=self.vectorstore_path
-            )
-            print(f"  ✓ 배치 1/{(len(splits)-1)//batch_size + 1} 완료 ({len(first_batch)}개 청크)")
+    def _create_vectorstore(self) -> VectorStore:
+        """
+        데이터 파일로부터 벡터 DB 생성
+
+        Returns:
+            벡터스토어 인스턴스
+        """
+        splits = self._split_documents(self._load_documents())
 
-            # 나머지 배치 추가
-            for i in range(batch_size, len(splits), batch_size):
-                batch = splits[i:i+batch_size]
-                vectorstore.add_documents(batch)
-                batch_num = i//batch_size + 1
-                total_batches = (len(splits)-1)//batch_size + 1
-                print(f"  ✓ 배치 {batch_num}/{total_batches} 완료 ({len(batch)}개 청크)")
+        # 벡터 DB에 배치로 저장 (OpenAI API 토큰 제한 회피)
+        print("💾 벡터 DB에 저장하는 중 (배치 처리)...")
+        vectorstore = open_vectorstore(self.vector_backend, self.vectorstore_path,
+                                       self.embeddings, self.vector_precision,
+                                       self.vector_index_params)
+        self._add_documents(vectorstore, splits)
 
         print(f"✅ 벡터 DB 생성 완료! (저장 경로: {self.vectorstore_path})")
         print(f"📦 총 {len(splits)}개의 청크가 저장되었습니다.")
         return vectorstore
 
-    def _create_qa_chain(self) -> RetrievalQA:
+    def _add_documents(self, vectorstore: VectorStore, documents: List[Document]) -> None:
+        """
+        청크를 배치 단위로 임베딩하여 벡터 DB에 추가
+
+        배치 임베딩은 embedding_concurrency개의 워커에서 동시에 진행하고,
+        벡터 DB에는 배치 순서대로 기록합니다.
+
+        Args:
+            vectorstore: 대상 벡터스토어
+            documents: metadata['chunk_id']가 있는 청크 리스트
+        """
+        batch_size = self.BATCH_SIZE  # 한 번에 처리할 청크 수
+        batches = [documents[i:i+batch_size]
+                   for i in range(0, len(documents), batch_size)]
+
+        results = embed_batches_concurrently(
+            self.embeddings,
+            [[doc.page_content for doc in batch] for batch in batches],
+            max_workers=self.embedding_concurrency,
+            tokens_per_minute=self.embedding_tokens_per_minute
+        )
+        for batch_index, vectors in results:
+            batch = batches[batch_index]
+            # 임베딩은 이미 계산했으므로 컬렉션에 직접 기록
+            vectorstore.upsert_embeddings(
+                ids=[doc.metadata['chunk_id'] for doc in batch],
+                embeddings=vectors,
+                metadatas=[doc.metadata for doc in batch],
+                documents=[doc.page_content for doc in batch]
+            )
+            print(f"  ✓ 배치 {batch_index + 1}/{len(batches)} 완료 ({len(batch)}개 청크)")
+
+        vectorstore.persist()
+
+    @property
+    def lexical_index_path(self) -> str:
+        """어휘 색인 파일 경로 (벡터 DB 디렉토리 안)"""
+        return os.path.join(self.vectorstore_path, "lexical_index.npz")
+
+    def _build_lexical_index(self) -> LexicalIndex:
+        """
+        벡터 DB에 저장된 청크로 어휘 색인 생성 후 저장
+
+        Returns:
+            LexicalIndex 인스턴스
+        """
+        print("🔤 어휘 색인을 생성하는 중...")
+        stored = self.vectorstore.get(include=["documents", "metadatas"])
+        texts = [
+            f"{(metadata or {}).get('title', '')}\n{text}"
+            for text, metadata in zip(stored['documents'], stored['metadatas'])
+        ]
+        lexical_index = LexicalIndex.build(stored['ids'], texts)
+        if self.read_only:
+            print("⚠️ 읽기 전용 모드이므로 어휘 색인을 저장하지 않습니다.")
+        else:
+            lexical_index.save(self.lexical_index_path)
+        print(f"  ✓ {len(lexical_index)}개 청크 색인 완료")
+        return lexical_index
+
+    def _load_or_create_lexical_index(self) -> LexicalIndex:
+        """
+        어휘 색인 로드 (없거나 벡터 DB와 청크 수가 다르면 재생성)
+
+        Returns:
+            LexicalIndex 인스턴스
+        """
+        if os.path.exists(self.lexical_index_path):
+            lexical_index = LexicalIndex.load(self.lexical_index_path)
+            if len(lexical_index) == self.vectorstore.count():
+                print("📂 기존 어휘 색인을 로드했습니다.")
+                return lexical_index
+        return self._build_lexical_index()
+
+    def _create_retriever(self, search_mode: str) -> BaseRetriever:
+        """
+        검색 방식에 맞는 검색기 생성
+
+        Args:
+            search_mode: "vector", "lexical", "hybrid"
+
+        Returns:
+            HybridRetriever (컨텍스트 구성을 쓰면 PackedContextRetriever로 감쌈)
+        """
+        k = 3  # Top-3 문서 검색
+        if self.context_packer is not None:
+            k = self.context_fetch_k  # 후보를 넉넉히 가져온 뒤 토큰 예산에 맞춰 구성
+        fetch_k = max(10, k)  # 하이브리드 결합 전 각 검색기에서 가져올 후보 수
+
+        vector_retriever = None
+        if search_mode != "lexical":
+            vector_retriever = MemoizedRetriever(
+                vectorstore=self.vectorstore,
+                cache=self.retrieval_cache,
+                embed_query=self.query_embeddings.embed_query,
+                index_version=lambda: self.index_version,
+                k=fetch_k if search_mode == "hybrid" else k
+            )
+
+        retriever = HybridRetriever(
+            vectorstore=self.vectorstore,
+            lexical_index=self.lexical_index,
+            vector_retriever=vector_retriever,
+            mode=search_mode,
+            k=k,
+            fetch_k=fetch_k
+        )
+        if self.context_packer is None:
+            return retriever
+        return PackedContextRetriever(retriever=retriever, packer=self.context_packer)
+
+    def _get_qa_chain(self, search_mode: str) -> RetrievalQA:
+        """
+        검색 방식별 QA 체인 조회 (없으면 생성)
+
+        Args:
+            search_mode: "vector", "lexical", "hybrid"
+
+        Returns:
+            RetrievalQA 체인 인스턴스
+        """
+        if search_mode not in SEARCH_MODES:
+            raise ValueError(f"❌ 지원하지 않는 검색 방식입니다: {search_mode}")
+
+        qa_chain = self._qa_chains.get(search_mode)
+        if qa_chain is None:
+            qa_chain = self._create_qa_chain(search_mode)
+            self._qa_chains[search_mode] = qa_chain
+        return qa_chain
+
+    def _create_qa_chain(self, search_mode: Optional[str] = None) -> RetrievalQA:
         """
         QA 체인 생성
 
+        Args:
+            search_mode: 검색 방식 (None이면 기본 검색 방식)
+
         Returns:
             RetrievalQA 체인 인스턴스
         """
@@ -179,51 +647,326 @@ class RAGSystem:
         qa_chain = RetrievalQA.from_chain_type(
             llm=self.llm,
             chain_type="stuff",
-            retriever=self.vectorstore.as_retriever(
-                search_kwargs={"k": 3}  # Top-3 문서 검색
-            ),
+            retriever=self._create_retriever(search_mode or self.search_mode),
             return_source_documents=True,
             chain_type_kwargs={"prompt": PROMPT}
         )
 
         return qa_chain
 
-    def ask(self, question: str) -> Dict[str, Any]:
+    def ask(self, question: str, search_mode: Optional[str] = None) -> Dict[str, Any]:
         """
         질문에 대한 답변 생성
 
         Args:
             question: 사용자 질문
+            search_mode: 검색 방식 ("vector", "lexical", "hybrid"), None이면 기본값
 
         Returns:
-            답변과 출처를 포함한 딕셔너리
+            답변과 출처를 포함한 딕셔너리 (컨텍스트 구성을 쓰면 context 토큰 통계 포함)
+
+        Raises:
+            ValueError: 지원하지 않는 검색 방식인 경우
         """
+        search_mode = search_mode or self.search_mode
+
+        # 같은 질문이 이미 처리 중이면 그 결과를 함께 사용
+        response, shared = self.single_flight.do(
+            self._flight_key(question, search_mode),
+            lambda: self._ask(question, search_mode)
+        )
+        return copy.deepcopy(response) if shared else response
+
+    def _ask(self, question: str, search_mode: str) -> Dict[str, Any]:
+        """ask()의 실제 처리 (single-flight 밖에서 호출하지 않음)"""
+        qa_chain = self._get_qa_chain(search_mode)
+
         print(f"\n❓ 질문: {question}")
+
+        question_vector, cached = self._lookup_answer(question, search_mode)
+        if cached is not None:
+            return cached
+
         print("🔍 답변을 생성하는 중...")
 
         # QA 체인 실행
-        result = self.qa_chain.invoke({"query": question})
+        index_version = self.index_version
+        result = qa_chain.invoke({"query": question})
 
-        # 답변 추출
-        answer = result['result']
+        response = self._build_response(result['result'], result['source_documents'])
+        print(f"✅ 답변 생성 완료!\n")
+
+        self._store_answer(question_vector, question, response, index_version)
+        return response
+
+    def ask_stream(self, question: str,
+                   search_mode: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        질문에 대한 답변을 토큰 단위로 생성
+
+        검색이 끝나면 출처를 먼저 보내고, 이어서 LLM이 만드는 토큰을 바로 보냅니다.
+
+        Args:
+            question: 사용자 질문
+            search_mode: 검색 방식 ("vector", "lexical", "hybrid"), None이면 기본값
+
+        Yields:
+            {'type': 'sources', 'sources': [...], 'context': {...} 또는 None}
+            {'type': 'token', 'content': 답변 조각} (여러 번)
+            {'type': 'done', 'answer': 전체 답변}
+
+        Raises:
+            ValueError: 지원하지 않는 검색 방식인 경우
+        """
+        search_mode = search_mode or self.search_mode
+        qa_chain = self._get_qa_chain(search_mode)
+
+        print(f"\n❓ 질문(스트리밍): {question}")
+
+        question_vector, cached = self._lookup_answer(question, search_mode)
+        if cached is not None:
+            yield {'type': 'sources', 'sources': cached['sources'],
+                   'context': cached.get('context')}
+            yield {'type': 'token', 'content': cached['answer']}
+            yield {'type': 'done', 'answer': cached['answer']}
+            return
+
+        print("🔍 답변을 생성하는 중...")
+
+        # 체인과 같은 검색기/프롬프트로 검색 후 LLM만 스트리밍 호출
+        index_version = self.index_version
+        documents = qa_chain.retriever.invoke(question)
+        response = self._build_response("", documents)
+        yield {'type': 'sources', 'sources': response['sources'],
+               'context': response.get('context')}
+
+        prompt = self._format_prompt(qa_chain, question, documents)
+        parts = []
+        for chunk in self.llm.stream(prompt):
+            if chunk.content:
+                parts.append(chunk.content)
+                yield {'type': 'token', 'content': chunk.content}
+
+        response['answer'] = "".join(parts)
+        print(f"✅ 답변 생성 완료!\n")
+
+        self._store_answer(question_vector, question, response, index_version)
+        yield {'type': 'done', 'answer': response['answer']}
+
+    async def aask(self, question: str, search_mode: Optional[str] = None) -> Dict[str, Any]:
+        """
+        질문에 대한 답변 생성 (비동기)
+
+        질의 임베딩과 LLM 호출은 비동기 API로 기다리고, 검색은 크기가 제한된
+        스레드 풀에서 실행하므로 이벤트 루프가 다른 요청을 계속 처리할 수 있습니다.
+
+        Args:
+            question: 사용자 질문
+            search_mode: 검색 방식 ("vector", "lexical", "hybrid"), None이면 기본값
+
+        Returns:
+            ask()와 같은 형식의 딕셔너리
+
+        Raises:
+            ValueError: 지원하지 않는 검색 방식인 경우
+        """
+        search_mode = search_mode or self.search_mode
+
+        # 같은 질문이 이미 처리 중이면 그 결과를 함께 기다림
+        response, shared = await self.single_flight.ado(
+            self._flight_key(question, search_mode),
+            lambda: self._aask(question, search_mode)
+        )
+        return copy.deepcopy(response) if shared else response
 
+    async def _aask(self, question: str, search_mode: str) -> Dict[str, Any]:
+        """aask()의 실제 처리 (single-flight 밖에서 호출하지 않음)"""
+        qa_chain = self._get_qa_chain(search_mode)
+
+        print(f"\n❓ 질문: {question}")
+
+        # 질의 벡터를 미리 비동기로 계산해 두면 이후 답변 캐시 조회와
+        # 검색기는 메모이제이션된 벡터를 사용하므로 네트워크 호출이 없음
+        if search_mode != "lexical":
+            await self.retrieval_cache.aget_query_vector(
+                question, self.query_embeddings.aembed_query)
+
+        question_vector, cached = self._lookup_answer(question, search_mode)
+        if cached is not None:
+            return cached
+
+        print("🔍 답변을 생성하는 중...")
+
+        index_version = self.index_version
+        loop = asyncio.get_running_loop()
+        documents = await loop.run_in_executor(
+            self._search_executor, qa_chain.retriever.invoke, question)
+
+        message = await self.llm.ainvoke(self._format_prompt(qa_chain, question, documents))
+        response = self._build_response(message.content, documents)
+        print(f"✅ 답변 생성 완료!\n")
+
+        self._store_answer(question_vector, question, response, index_version)
+        return response
+
+    def _flight_key(self, question: str, search_mode: str) -> tuple:
+        """진행 중 요청을 합칠 키 (인덱스가 바뀐 뒤에는 이전 요청에 합류하지 않음)"""
+        return normalize_query(question), search_mode, self.index_version
+
+    @staticmethod
+    def _format_prompt(qa_chain: RetrievalQA, question: str,
+                       documents: List[Document]) -> str:
+        """QA 체인과 같은 프롬프트/문서 결합 방식("stuff")으로 LLM 입력 구성"""
+        return qa_chain.combine_documents_chain.llm_chain.prompt.format(
+            context="\n\n".join(doc.page_content for doc in documents),
+            question=question
+        )
+
+    def _lookup_answer(self, question: str, search_mode: str):
+        """
+        의미가 같은 이전 질문의 답변 조회
+
+        기본 검색 방식의 답변만 캐시합니다 (어휘 검색은 임베딩 호출을 하지 않으므로 제외).
+
+        Args:
+            question: 사용자 질문
+            search_mode: 이번 요청의 검색 방식
+
+        Returns:
+            (캐시에 저장할 때 쓸 질문 벡터 또는 None, 캐시된 응답 사본 또는 None)
+        """
+        use_answer_cache = (self.answer_cache is not None and
+                            search_mode == self.search_mode and
+                            search_mode != "lexical")
+        if not use_answer_cache:
+            return None, None
+
+        question_vector = self._embed_query(question)
+        cached = self.answer_cache.get(question_vector, question)
+        if cached is not None:
+            print("⚡ 캐시된 답변을 사용합니다.\n")
+            return question_vector, copy.deepcopy(cached)
+        return question_vector, None
+
+    def _store_answer(self, question_vector, question: str, response: Dict[str, Any],
+                      index_version: int) -> None:
+        """답변 캐시에 저장 (답변 생성 중 벡터 DB가 바뀌었다면 저장하지 않음)"""
+        if question_vector is not None and index_version == self.index_version:
+            self.answer_cache.put(question_vector, question, copy.deepcopy(response))
+
+    def _build_response(self, answer: str, documents: List[Document]) -> Dict[str, Any]:
+        """
+        답변과 검색 문서로 응답 딕셔너리 구성
+
+        Args:
+            answer: 답변
+            documents: 프롬프트에 사용한 문서
+
+        Returns:
+            answer, sources (컨텍스트 구성을 쓰면 context) 딕셔너리
+        """
         # 출처 문서 추출
         sources = []
-        for doc in result['source_documents']:
+        for doc in documents:
             sources.append({
                 'title': doc.metadata.get('title', 'Unknown'),
                 'source': doc.metadata.get('source', 'Unknown'),
                 'content': doc.page_content[:200] + '...' if len(doc.page_content) > 200 else doc.page_content
             })
 
-        print(f"✅ 답변 생성 완료!\n")
-
-        return {
+        response = {
             'answer': answer,
             'sources': sources
         }
 
+        # 컨텍스트 구성으로 절약한 프롬프트 토큰
+        context = packing_report(documents)
+        if context is not None:
+            response['context'] = context
+            print(f"✂️ 컨텍스트 {context['tokens']}토큰 "
+                  f"(중복/겹침 제거로 {context['saved_tokens']}토큰 절약)")
+        return response
+
+    def warm_up(self, question: str = "수강신청 일정") -> None:
+        """
+        첫 요청이 느리지 않도록 검색 경로를 미리 한 번 실행
+
+        임베딩 API 연결을 맺고, 메모리 매핑된 벡터/어휘 색인과 검색 체인을
+        한 번 읽어 둡니다. LLM은 비용이 들므로 호출하지 않습니다.
+
+        Args:
+            question: 예열에 사용할 질문
+        """
+        print("🔥 검색 경로 예열 중...")
+        self._get_qa_chain(self.search_mode).retriever.invoke(question)
+
+    def _embed_query(self, question: str):
+        """
+        질문 임베딩 (정규화된 질문 기준으로 메모이제이션)
+
+        Args:
+            question: 사용자 질문
+
+        Returns:
+            float32 질의 벡터
+        """
+        return self.retrieval_cache.get_query_vector(question,
+                                                     self.query_embeddings.embed_query)
+
+    def _on_index_changed(self) -> None:
+        """벡터 DB 변경 후 QA 체인 재생성 및 캐시 무효화"""
+        self.index_version += 1
+        self.lexical_index = self._build_lexical_index()
+
+        # QA 체인 재생성
+        self.qa_chain = self._create_qa_chain()
+        self._qa_chains = {self.search_mode: self.qa_chain}
+
+        self.retrieval_cache.clear_results()
+        if self.answer_cache is not None:
+            self.answer_cache.clear()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        캐시 통계
+
+        Returns:
+            캐시 이름별 통계 딕셔너리 (사용하지 않는 캐시는 제외,
+            single_flight는 동시 요청 합치기 통계)
+        """
+        stats = {
+            'retrieval': self.retrieval_cache.stats(),
+            'single_flight': self.single_flight.stats(),
+        }
+        if self.answer_cache is not None:
+            stats['answer'] = self.answer_cache.stats()
+        if isinstance(self.embeddings, CachedEmbeddings):
+            stats['embedding'] = self.embeddings.stats()
+        if isinstance(self.query_embeddings, QueryEmbeddingBatcher):
+            stats['query_batching'] = self.query_embeddings.stats()
+        return stats
+
+    def _collapsed_chunks(self) -> int:
+        """마지막 분할에서 대표 청크로 합쳐진 근사 중복 청크 수"""
+        return self.chunk_dedup_report['collapsed'] if self.chunk_dedup_report else 0
+
+    def _check_writable(self) -> None:
+        """읽기 전용 인스턴스에서 색인을 바꾸려 하면 오류"""
+        if self.read_only:
+            raise ValueError("❌ 읽기 전용 모드에서는 벡터 DB를 변경할 수 없습니다.")
+
     def reset_vectorstore(self) -> None:
+        """
+        벡터 DB 재생성 (다른 프로세스의 생성/로드와 겹치지 않도록 잠금)
+
+        Raises:
+            ValueError: 읽기 전용 모드인 경우
+        """
+        self._check_writable()
+        with index_lock(self.vectorstore_path):
+            self._reset_vectorstore()
+
+    def _reset_vectorstore(self) -> None:
         """벡터 DB 재생성"""
         print("🔄 벡터 DB를 재생성하는 중...")
 
@@ -235,12 +978,96 @@ class RAGSystem:
 
         # 새로운 벡터 DB 생성
         self.vectorstore = self._create_vectorstore()
-
-        # QA 체인 재생성
-        self.qa_chain = self._create_qa_chain()
+        self._on_index_changed()
 
         print("✅ 벡터 DB 재생성 완료!\n")
 
+    def sync_vectorstore(self) -> Dict[str, int]:
+        """
+        벡터 DB 증분 동기화 (다른 프로세스의 생성/로드와 겹치지 않도록 잠금)
+
+        Returns:
+            _sync_vectorstore()의 통계
+
+        Raises:
+            ValueError: 읽기 전용 모드인 경우
+        """
+        self._check_writable()
+        with index_lock(self.vectorstore_path):
+            return self._sync_vectorstore()
+
+    def _sync_vectorstore(self) -> Dict[str, int]:
+        """
+        벡터 DB 증분 동기화
+
+        데이터 파일을 다시 분할해 청크 해시 ID를 계산한 뒤
+        새로 생기거나 바뀐 청크만 임베딩하고, 더 이상 존재하지 않는
+        청크는 삭제합니다. 전체 재생성과 달리 바뀌지 않은 청크의
+        임베딩 비용이 들지 않습니다.
+
+        Returns:
+            added(새로 생긴 청크), updated(같은 출처의 예전 청크를 대신한 바뀐 청크),
+            removed(대신할 청크 없이 삭제된 청크), unchanged(유지된 청크),
+            collapsed(근사 중복이라 대표 청크로 합쳐진 청크) 개수
+        """
+        print("🔄 벡터 DB를 증분 동기화하는 중...")
+
+        if not os.path.exists(self.vectorstore_path):
+            self.vectorstore = self._create_vectorstore()
+            self._on_index_changed()
+            count = len(self.vectorstore.get(include=[])['ids'])
+            print("✅ 벡터 DB 동기화 완료!\n")
+            return {'added': count, 'updated': 0, 'removed': 0, 'unchanged': 0,
+                    'collapsed': self._collapsed_chunks()}
+
+        splits = self._split_documents(self._load_documents())
+        target = {doc.metadata['chunk_id']: doc for doc in splits}
+
+        # 현재 저장된 청크 ID와 출처
+        existing = self.vectorstore.get(include=["metadatas"])
+        existing_sources = {
+            chunk_id: (metadata or {}).get('source')
+            for chunk_id, metadata in zip(existing['ids'], existing['metadatas'])
+        }
+
+        to_add = [doc for chunk_id, doc in target.items()
+                  if chunk_id not in existing_sources]
+        to_remove = [chunk_id for chunk_id in existing_sources
+                     if chunk_id not in target]
+
+        # 내용이 바뀐 청크는 새 ID 추가 + 예전 ID 삭제로 나타나므로, 같은 출처 안에서
+        # 추가/삭제를 짝지어 변경 하나로만 셈
+        added_by_source = Counter(doc.metadata['source'] for doc in to_add)
+        removed_by_source = Counter(existing_sources[chunk_id] for chunk_id in to_remove)
+        updated = sum(min(count, removed_by_source[source])
+                      for source, count in added_by_source.items())
+
+        stats = {
+            'added': len(to_add) - updated,
+            'updated': updated,
+            'removed': len(to_remove) - updated,
+            'unchanged': len(target) - len(to_add),
+            'collapsed': self._collapsed_chunks(),
+        }
+
+        batch_size = self.BATCH_SIZE
+
+        for i in range(0, len(to_remove), batch_size):
+            self.vectorstore.delete(ids=to_remove[i:i+batch_size])
+        if to_remove:
+            print(f"  🗑️ {len(to_remove)}개 청크 삭제")
+
+        self._add_documents(self.vectorstore, to_add)
+
+        if to_add or to_remove:
+            self._on_index_changed()
+
+        print(f"📊 추가 {stats['added']}개 | 변경 {stats['updated']}개 | "
+              f"삭제 {stats['removed']}개 | 유지 {stats['unchanged']}개")
+        print("✅ 벡터 DB 동기화 완료!\n")
+
+        return stats
+
 
 def main():
     """대화형 인터페이스 (터미널)"""
@@ -0,0 +1,235 @@
+"""
+질의 임베딩 및 검색 결과 메모이제이션
+
+/chat 요청마다 같은 질문을 다시 임베딩하고 다시 검색하지 않도록
+프로세스 내부에 두 단계의 LRU 캐시를 둡니다.
+
+1. 정규화된 질문 텍스트 → 질의 벡터
+2. (질의 벡터, k, 인덱스 버전) → 검색된 청크 ID 리스트
+
+인덱스 버전이 키에 포함되므로 벡터 DB를 다시 만든 뒤에는
+이전 검색 결과가 절대 사용되지 않습니다.
+"""
+
+import hashlib
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.vectorstores import VectorStore
+
+
+def normalize_query(text: str) -> str:
+    """
+    질문 텍스트 정규화 (유니코드 NFKC, 소문자, 공백 정리)
+
+    Args:
+        text: 원본 질문
+
+    Returns:
+        정규화된 질문
+    """
+    text = unicodedata.normalize('NFKC', text).lower()
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def get_documents_by_ids(vectorstore: VectorStore, ids: List[str]) -> List[Document]:
+    """
+    청크 ID로 문서 조회 (주어진 ID 순서 유지)
+
+    Args:
+        vectorstore: 벡터스토어 (get(ids=...) 지원)
+        ids: 청크 ID 리스트
+
+    Returns:
+        Document 리스트 (벡터스토어에 없는 ID는 제외)
+    """
+    if not ids:
+        return []
+    result = vectorstore.get(ids=ids, include=["documents", "metadatas"])
+    by_id = {
+        chunk_id: Document(page_content=text, metadata=metadata or {})
+        for chunk_id, text, metadata in zip(
+            result['ids'], result['documents'], result['metadatas'])
+    }
+    return [by_id[chunk_id] for chunk_id in ids if chunk_id in by_id]
+
+
+class _LRU:
+    """스레드 안전하지 않은 단순 LRU (RetrievalCache의 락 안에서만 사용)"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.data: "OrderedDict[Any, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value) -> None:
+        if self.max_entries <= 0:
+            return
+        self.data[key] = value
+        self.data.move_to_end(key)
+        while len(self.data) > self.max_entries:
+            self.data.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': len(self.data),
+        }
+
+
+class RetrievalCache:
+    """질의 벡터 캐시 + 검색 결과 캐시"""
+
+    def __init__(self, max_queries: int = 1024, max_results: int = 4096):
+        """
+        초기화
+
+        Args:
+            max_queries: 보관할 질의 벡터 수
+            max_results: 보관할 검색 결과 수
+        """
+        self._lock = threading.Lock()
+        self._vectors = _LRU(max_queries)
+        self._results = _LRU(max_results)
+
+    def get_query_vector(self, text: str,
+                         compute: Callable[[str], List[float]]) -> np.ndarray:
+        """
+        정규화된 질문의 벡터 조회 (없으면 compute로 계산 후 저장)
+
+        Args:
+            text: 질문
+            compute: 임베딩 함수 (예: embeddings.embed_query)
+
+        Returns:
+            float32 질의 벡터
+        """
+        key = normalize_query(text)
+        with self._lock:
+            vector = self._vectors.get(key)
+        if vector is not None:
+            return vector
+
+        vector = np.asarray(compute(text), dtype=np.float32)
+        vector.setflags(write=False)
+        with self._lock:
+            self._vectors.put(key, vector)
+        return vector
+
+    async def aget_query_vector(self, text: str,
+                                acompute: Callable[[str], Awaitable[List[float]]]) -> np.ndarray:
+        """
+        get_query_vector의 비동기 버전 (없으면 acompute를 await해 계산 후 저장)
+
+        Args:
+            text: 질문
+            acompute: 비동기 임베딩 함수 (예: embeddings.aembed_query)
+
+        Returns:
+            float32 질의 벡터
+        """
+        key = normalize_query(text)
+        with self._lock:
+            vector = self._vectors.get(key)
+        if vector is not None:
+            return vector
+
+        vector = np.asarray(await acompute(text), dtype=np.float32)
+        vector.setflags(write=False)
+        with self._lock:
+            self._vectors.put(key, vector)
+        return vector
+
+    @staticmethod
+    def _result_key(vector: np.ndarray, k: int, index_version: Any) -> tuple:
+        """(벡터 해시, k, 인덱스 버전) 키"""
+        digest = hashlib.blake2b(vector.tobytes(), digest_size=16).digest()
+        return digest, k, index_version
+
+    def get_result_ids(self, vector: np.ndarray, k: int,
+                       index_version: Any) -> Optional[List[str]]:
+        """
+        캐시된 검색 결과 청크 ID 조회
+
+        Args:
+            vector: 질의 벡터
+            k: 검색 개수
+            index_version: 현재 인덱스 버전
+
+        Returns:
+            청크 ID 리스트, 없으면 None
+        """
+        with self._lock:
+            return self._results.get(self._result_key(vector, k, index_version))
+
+    def put_result_ids(self, vector: np.ndarray, k: int, index_version: Any,
+                       ids: List[str]) -> None:
+        """검색 결과 청크 ID 저장"""
+        with self._lock:
+            self._results.put(self._result_key(vector, k, index_version), list(ids))
+
+    def clear_results(self) -> None:
+        """검색 결과 캐시 비우기 (인덱스 변경 시, 질의 벡터는 유지)"""
+        with self._lock:
+            self._results.data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        캐시 통계
+
+        Returns:
+            query_vectors, results 각각의 hits/misses/hit_rate/entries
+        """
+        with self._lock:
+            return {
+                'query_vectors': self._vectors.stats(),
+                'results': self._results.stats(),
+            }
+
+
+class MemoizedRetriever(BaseRetriever):
+    """RetrievalCache를 거치는 벡터스토어 검색기"""
+
+    vectorstore: VectorStore
+    cache: RetrievalCache
+    embed_query: Callable[[str], List[float]]
+    index_version: Callable[[], Any]
+    k: int = 3
+
+    def _get_relevant_documents(
+            self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        vector = self.cache.get_query_vector(query, self.embed_query)
+        version = self.index_version()
+
+        ids = self.cache.get_result_ids(vector, self.k, version)
+        if ids is not None:
+            return get_documents_by_ids(self.vectorstore, ids)
+
+        docs = self.vectorstore.similarity_search_by_vector(vector.tolist(), k=self.k)
+
+        # chunk_id가 없는 예전 인덱스는 캐시하지 않음
+        ids = [doc.metadata.get('chunk_id') for doc in docs]
+        if all(ids):
+            self.cache.put_result_ids(vector, self.k, version, ids)
+        return docs
@@ -0,0 +1,108 @@
+"""
+운영용 멀티 워커 서버 실행
+
+python main.py는 개발용(reload, 단일 프로세스)입니다. 여러 워커로 서비스할 때는
+이 스크립트를 사용합니다.
+
+1. 워커를 띄우기 전에 별도 프로세스가 잠금을 잡고 벡터 DB와 어휘 색인을
+   생성(없으면)하거나 검증한 뒤 종료 (마스터 프로세스는 가볍게 유지)
+2. uvicorn 워커들은 RAG_READ_ONLY=1로 시작해 이미 만들어진 파일을 읽기만 함
+3. flat/ivf 백엔드는 벡터 파일을 읽기 전용 메모리 매핑으로 열므로
+   워커가 몇 개든 벡터는 OS 페이지 캐시에 한 번만 올라감
+   (chroma는 워커마다 색인을 메모리에 따로 올리므로 권장하지 않음)
+
+옵션을 생략하면 main.py와 같은 환경 변수(RAG_VECTOR_BACKEND 등, .env 포함) 값을 쓰고,
+환경 변수도 없으면 main.py와 같은 기본값(chroma 백엔드, vectorstore/)을 씁니다.
+flat/ivf는 Chroma 벡터 DB 디렉토리를 열 수 없으므로 다른 경로에 새로 만듭니다.
+
+사용 예 (backend 디렉토리에서):
+    python serve.py --workers 4   # 기존 vectorstore/ (chroma) 그대로
+    python serve.py --workers 4 --vector-backend flat --vector-precision int8 \
+        --vectorstore-path vectorstore_flat
+    python serve.py --build-only   # 색인만 생성/검증 (배포 전 단계 등)
+    python serve.py --workers 4 --snapshot-path index.ragsnap   # 미리 만든 스냅샷으로 실행
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+
+from dotenv import load_dotenv
+
+# backend 디렉토리를 Python 경로에 추가
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(BACKEND_DIR)
+
+
+def _prepare_index() -> None:
+    """환경 변수 설정대로 색인 생성/검증 (워커를 띄우기 전 한 번 실행)"""
+    from main import rag_settings_from_env
+    from rag_system import RAGSystem
+
+    settings = rag_settings_from_env()
+    settings['read_only'] = False
+    RAGSystem(**settings)
+
+
+def main():
+    """색인 준비 후 워커 실행"""
+    load_dotenv()  # .env의 RAG_* 설정도 기본값으로 사용 (main.py와 같게)
+    parser = argparse.ArgumentParser(description="동양대학교 AI 도우미 API 서버 (멀티 워커)")
+    parser.add_argument('--host', default="0.0.0.0")
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=4)
+    # 기본값은 main.rag_settings_from_env와 같음 (main을 import하면 마스터가 무거워지므로 직접 읽음)
+    parser.add_argument('--data-path', default=os.getenv("RAG_DATA_PATH", "data/111_cleaned.jsonl"))
+    parser.add_argument('--vectorstore-path', default=os.getenv("RAG_VECTORSTORE_PATH", "vectorstore"))
+    parser.add_argument('--vector-backend', default=os.getenv("RAG_VECTOR_BACKEND", "chroma"),
+                        choices=["chroma", "flat", "ivf"])
+    parser.add_argument('--vector-precision', default=os.getenv("RAG_VECTOR_PRECISION", "float32"),
+                        choices=["float32", "float16", "int8"])
+    parser.add_argument('--snapshot-path', default=os.getenv("RAG_SNAPSHOT_PATH") or None,
+                        help="단일 파일 색인 스냅샷 (주어지면 벡터 DB 디렉토리 대신 사용)")
+    parser.add_argument('--build-only', action='store_true',
+                        help="색인만 생성/검증하고 종료")
+    args = parser.parse_args()
+
+    # 워커 프로세스는 환경 변수를 물려받아 같은 설정으로 RAG 시스템 생성
+    os.environ['RAG_DATA_PATH'] = args.data_path
+    os.environ['RAG_VECTORSTORE_PATH'] = args.vectorstore_path
+    os.environ['RAG_VECTOR_BACKEND'] = args.vector_backend
+    os.environ['RAG_VECTOR_PRECISION'] = args.vector_precision
+    if args.snapshot_path:
+        os.environ['RAG_SNAPSHOT_PATH'] = args.snapshot_path
+
+    if args.vector_backend == "chroma" and args.workers > 1 and not args.snapshot_path:
+        print("⚠️ chroma 백엔드는 워커마다 색인을 메모리에 따로 올립니다. "
+              "메모리를 공유하려면 flat 또는 ivf를 사용하세요.")
+
+    # 색인 준비는 별도 프로세스에서 (무거운 모듈과 색인이 마스터 메모리에 남지 않도록)
+    print("🔨 색인을 준비하는 중...")
+    builder = multiprocessing.get_context("spawn").Process(target=_prepare_index)
+    builder.start()
+    builder.join()
+    if builder.exitcode != 0:
+        print(f"❌ 색인 준비 실패 (종료 코드 {builder.exitcode})")
+        sys.exit(1)
+    print("✅ 색인 준비 완료!")
+
+    if args.build_only:
+        return
+
+    import uvicorn
+
+    os.environ['RAG_READ_ONLY'] = "1"
+    os.environ['RAG_VERIFY_SNAPSHOT'] = "0"  # 체크섬은 준비 단계에서 이미 확인
+    print(f"🌐 워커 {args.workers}개로 서버를 시작합니다: http://{args.host}:{args.port}")
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        app_dir=BACKEND_DIR
+    )
+
+
+if __name__ == "__main__":
+    main()
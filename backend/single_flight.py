@@ -0,0 +1,149 @@
+"""
+진행 중인 동일 요청 합치기 (single-flight)
+
+수강신청 시작 직후처럼 같은 질문이 몇 초 안에 수백 번 들어오면
+각 요청이 임베딩 + 검색 + LLM 호출을 따로 수행합니다.
+같은 키의 작업이 이미 진행 중이면 새로 시작하지 않고 그 결과를 기다립니다.
+
+- 결과는 완료 즉시 잊음 (캐시가 아님, 캐시는 answer_cache가 담당)
+- 먼저 시작한 작업이 실패하면 기다리던 호출도 같은 예외를 받고,
+  키는 바로 비워지므로 이후 요청은 새로 시도함
+- 스레드(동기)와 asyncio(비동기) 호출을 각각 지원
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    """진행 중인 동기 작업 하나"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """키별로 진행 중인 작업을 하나로 합치는 도우미"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Hashable, "asyncio.Task"] = {}
+
+        self.leaders = 0      # 실제로 실행한 호출 수
+        self.coalesced = 0    # 진행 중인 작업에 합류한 호출 수
+        self.failures = 0     # 실패한 실행 수
+        self.shared_failures = 0  # 합류했다가 실패를 전달받은 호출 수
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        동기 실행 (같은 키가 진행 중이면 완료까지 대기)
+
+        Args:
+            key: 요청 키
+            fn: 실행할 함수
+
+        Returns:
+            (결과, 다른 호출의 결과를 공유했는지 여부)
+
+        Raises:
+            fn이 던진 예외 (합류한 호출도 같은 예외를 받음)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                with self._lock:
+                    self.shared_failures += 1
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self.failures += 1
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result, False
+
+    async def ado(self, key: Hashable,
+                  afn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        비동기 실행 (같은 키가 진행 중이면 같은 태스크를 대기)
+
+        작업은 별도 태스크로 실행하므로 먼저 요청한 호출이 취소되어도
+        기다리는 다른 호출에는 결과가 전달됩니다.
+
+        Args:
+            key: 요청 키
+            afn: 코루틴을 반환하는 함수
+
+        Returns:
+            (결과, 다른 호출의 결과를 공유했는지 여부)
+
+        Raises:
+            afn이 던진 예외 (합류한 호출도 같은 예외를 받음)
+        """
+        with self._lock:
+            task = self._tasks.get(key)
+            shared = task is not None
+            if shared:
+                self.coalesced += 1
+            else:
+                task = asyncio.ensure_future(afn())
+                self._tasks[key] = task
+                self.leaders += 1
+                task.add_done_callback(lambda done: self._finish_task(key, done))
+
+        try:
+            return await asyncio.shield(task), shared
+        except asyncio.CancelledError:
+            raise
+        except BaseException:
+            if shared:
+                with self._lock:
+                    self.shared_failures += 1
+            raise
+
+    def _finish_task(self, key: Hashable, task: "asyncio.Task") -> None:
+        """비동기 작업 완료 시 키 정리 및 실패 집계"""
+        with self._lock:
+            if self._tasks.get(key) is task:
+                del self._tasks[key]
+            if not task.cancelled() and task.exception() is not None:
+                self.failures += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        통계
+
+        Returns:
+            leaders, coalesced, coalesced_ratio, failures, shared_failures, in_flight
+        """
+        with self._lock:
+            total = self.leaders + self.coalesced
+            return {
+                'leaders': self.leaders,
+                'coalesced': self.coalesced,
+                'coalesced_ratio': self.coalesced / total if total else 0.0,
+                'failures': self.failures,
+                'shared_failures': self.shared_failures,
+                'in_flight': len(self._calls) + len(self._tasks),
+            }
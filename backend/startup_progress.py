@@ -0,0 +1,92 @@
+"""
+서버 시작 진행 상황 기록
+
+RAG 시스템은 포트를 연 뒤 백그라운드에서 로드하므로, 로드가 끝나기 전에도
+/ready가 지금 어느 단계인지와 단계별 소요 시간을 알려줄 수 있도록 기록합니다.
+단계는 순서대로 진행되며 begin()으로 다음 단계를 시작하면 이전 단계가 끝납니다.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class StartupProgress:
+    """시작 단계와 단계별 소요 시간 기록 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.perf_counter()
+        self.status = "starting"  # starting / ready / failed
+        self.stage: Optional[str] = None
+        self._stage_started = self.started_at
+        self.timings: Dict[str, float] = {}
+        self.error: Optional[str] = None
+        self.ready_after: Optional[float] = None
+
+    def _end_stage(self, now: float) -> None:
+        if self.stage is not None:
+            self.timings[self.stage] = self.timings.get(self.stage, 0.0) + \
+                (now - self._stage_started)
+        self.stage = None
+
+    def begin(self, stage: str) -> None:
+        """
+        다음 단계 시작 (진행 중인 단계는 종료)
+
+        Args:
+            stage: 단계 이름
+        """
+        now = time.perf_counter()
+        with self._lock:
+            self._end_stage(now)
+            self.stage = stage
+            self._stage_started = now
+
+    def finish(self) -> None:
+        """마지막 단계 종료 및 준비 완료 표시"""
+        now = time.perf_counter()
+        with self._lock:
+            self._end_stage(now)
+            self.status = "ready"
+            self.ready_after = now - self.started_at
+
+    def fail(self, error: BaseException) -> None:
+        """
+        실패 표시 (실패한 단계 이름은 유지)
+
+        Args:
+            error: 발생한 예외
+        """
+        with self._lock:
+            self.status = "failed"
+            self.error = str(error)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        현재 상태
+
+        Returns:
+            status, stage(진행 중인 단계), completed(끝난 단계),
+            timings(단계별 초), elapsed(시작 후 초), ready_after(준비까지 걸린 초), error
+        """
+        now = time.perf_counter()
+        with self._lock:
+            completed: List[str] = list(self.timings)
+            return {
+                'status': self.status,
+                'stage': self.stage,
+                'completed': completed,
+                'timings': {name: round(seconds, 3) for name, seconds in self.timings.items()},
+                'elapsed': round(now - self.started_at, 3),
+                'ready_after': None if self.ready_after is None else round(self.ready_after, 3),
+                'error': self.error,
+            }
+
+    def summary(self) -> str:
+        """단계별 소요 시간 한 줄 요약"""
+        snapshot = self.snapshot()
+        parts = [f"{name} {seconds:.2f}s" for name, seconds in snapshot['timings'].items()]
+        total = snapshot['ready_after'] if snapshot['ready_after'] is not None \
+            else snapshot['elapsed']
+        return " | ".join(parts + [f"전체 {total:.2f}s"])
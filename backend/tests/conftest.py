@@ -0,0 +1,19 @@
+"""
+테스트 공통 설정
+
+backend 모듈, 가짜 서버(benchmarks), 데이터 스크립트(data)를 벤치마크 스크립트와 같은 방식으로
+import할 수 있도록 Python 경로에 추가합니다.
+
+실행 (backend 디렉토리에서):
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+for path in (BACKEND_DIR, os.path.join(BACKEND_DIR, 'benchmarks'),
+             os.path.join(BACKEND_DIR, 'data')):
+    if path not in sys.path:
+        sys.path.append(path)
@@ -0,0 +1,40 @@
+"""청크 중복 제거 (chunk_dedup) 와 문서 중복 탐지 (data/near_duplicates) - 같은 MinHash/LSH"""
+
+from langchain.schema import Document
+
+from chunk_dedup import ChunkDeduplicator
+from near_duplicates import NearDuplicateDetector
+
+MENU = "대학소개 입학안내 학사안내 수강신청 장학안내 대학생활 기숙사 도서관 공지사항 " * 4
+NOTICE = "{year}학년도 {semester}학기 수강신청 일정을 다음과 같이 안내합니다. " * 8
+
+
+def test_boilerplate_collapsed_into_first_chunk():
+    """반복되는 메뉴 청크는 처음 나온 청크 하나로 합치고 사본 출처를 기록"""
+    chunks = [Document(page_content=MENU, metadata={'source': f"page{i}"}) for i in range(5)]
+    chunks.append(Document(page_content="기숙사 입사 신청은 포털에서 가능합니다.",
+                           metadata={'source': "page0"}))
+
+    kept, report = ChunkDeduplicator().deduplicate(chunks)
+
+    assert kept == [chunks[0], chunks[5]]
+    assert kept[0].metadata['duplicate_count'] == 4
+    assert kept[0].metadata['duplicate_sources'].split("\n") == [f"page{i}" for i in range(1, 5)]
+    assert report['collapsed'] == 4 and report['clusters'] == 1
+
+
+def test_chunks_differing_only_in_numbers_kept():
+    """숫자만 다른 공지는 유사도가 높아도 합치지 않음"""
+    chunks = [Document(page_content=NOTICE.format(year=2024, semester=semester),
+                       metadata={'source': f"notice{semester}"}) for semester in (1, 2)]
+
+    kept, report = ChunkDeduplicator().deduplicate(chunks)
+
+    assert len(kept) == 2 and report['collapsed'] == 0
+
+
+def test_documents_keep_longest_as_canonical():
+    """문서 중복 탐지는 가장 긴 문서를 대표로 고름 (숫자 규칙 없음)"""
+    texts = [NOTICE.format(year=2024, semester=1), MENU, NOTICE.format(year=2024, semester=1) + "끝"]
+
+    assert NearDuplicateDetector().find_duplicates(texts) == [2, 1, 2]
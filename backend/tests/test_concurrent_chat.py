@@ -0,0 +1,81 @@
+"""/chat 동시 요청 (RAGSystem.aask + SingleFlight) - 가짜 OpenAI 서버 상대"""
+
+import asyncio
+import functools
+import time
+
+import httpx
+import pytest
+from langchain_openai import OpenAIEmbeddings
+
+from bench_concurrent_chat import write_sample_data
+from fake_openai_server import start_fake_server
+
+CHAT_LATENCY = 1.0
+CLIENTS = 10
+
+
+@pytest.fixture(scope="module")
+def api(tmp_path_factory):
+    """작은 데이터로 RAG 시스템을 만들어 main.rag_system에 넣음 → (main 모듈, 가짜 서버 통계)"""
+    server, fake_url = start_fake_server(latency=0.0, per_item_latency=0.0, dim=64,
+                                         chat_latency=CHAT_LATENCY)
+    workdir = tmp_path_factory.mktemp("concurrent_chat")
+    data_path = str(workdir / "data.json")
+    write_sample_data(data_path)
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv('OPENAI_BASE_URL', fake_url)
+        patch.setenv('OPENAI_API_KEY', 'fake')
+
+        import main
+        import rag_system
+        # 길이 검사는 tiktoken 인코딩 파일을 내려받아야 하므로 끔 (네트워크 없이 실행)
+        patch.setattr(rag_system, 'OpenAIEmbeddings',
+                      functools.partial(OpenAIEmbeddings, check_embedding_ctx_length=False))
+        patch.setattr(main, 'rag_system', rag_system.RAGSystem(
+            data_path=data_path,
+            vectorstore_path=str(workdir / "vectorstore"),
+            embedding_cache_path=None,
+            answer_cache_size=0,  # 요청마다 검색 + LLM 호출 (답변 캐시가 합치지 않도록)
+            vector_backend="flat"
+        ))
+        yield main, server.RequestHandlerClass.stats
+    server.shutdown()
+
+
+async def post_concurrently(app, questions):
+    """질문들을 동시에 /chat으로 보냄 → (응답 리스트, 전체 시간)"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test",
+                                 timeout=60) as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(
+            *(client.post("/chat", json={"question": question}) for question in questions))
+        return responses, time.perf_counter() - start
+
+
+def test_distinct_questions_finish_in_about_one_llm_latency(api):
+    """서로 다른 질문 N개가 LLM 지연 N번이 아니라 1번 정도에 끝남 (이벤트 루프를 막지 않음)"""
+    main, stats = api
+    before = stats['chat_requests']
+    questions = [f"{i}번 공지 수강신청 기간은?" for i in range(CLIENTS)]
+
+    responses, total = asyncio.run(post_concurrently(main.app, questions))
+
+    assert [response.status_code for response in responses] == [200] * CLIENTS
+    assert stats['chat_requests'] - before == CLIENTS
+    assert total < 2 * CHAT_LATENCY
+
+
+def test_identical_questions_share_one_upstream_call(api):
+    """같은 질문 N개는 LLM 호출 1번을 함께 기다림 (single-flight)"""
+    main, stats = api
+    before = stats['chat_requests']
+
+    responses, total = asyncio.run(post_concurrently(main.app, ["장학금 신청 기간은?"] * CLIENTS))
+
+    assert [response.status_code for response in responses] == [200] * CLIENTS
+    assert len({response.json()['answer'] for response in responses}) == 1
+    assert stats['chat_requests'] - before == 1
+    assert total < 2 * CHAT_LATENCY
@@ -0,0 +1,126 @@
+"""비동기 크롤러 (crawl_client, crawl_cache, crawl_with_images) - 가짜 홈페이지 서버 상대"""
+
+import asyncio
+import bisect
+import random
+
+import pytest
+
+from bench_crawler import max_requests_per_second
+from crawl_cache import HttpCache
+from crawl_client import CrawlClient, is_not_modified
+from crawl_with_images import iter_crawl_pages
+from fake_site_server import IMAGES_PER_PAGE, page_html, start_fake_site
+
+
+@pytest.fixture
+def site():
+    """가짜 홈페이지 서버 시작 함수 → (핸들러 클래스, base_url), 테스트가 끝나면 종료"""
+    servers = []
+
+    def start(**kwargs):
+        server, base_url = start_fake_site(**kwargs)
+        servers.append(server)
+        return server.RequestHandlerClass, base_url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+def test_results_in_url_order(site):
+    """응답 순서가 섞여도 결과는 입력 URL 순서대로"""
+    handler, base_url = site(latency=0.01, jitter=0.1)
+    urls = [f"{base_url}/page/{i}" for i in range(16)]
+    random.Random(1).shuffle(urls)
+
+    pages = list(iter_crawl_pages(urls, concurrency=8, per_host_rate=100,
+                                  per_host_concurrency=8))
+
+    assert [page['url'] for page in pages] == urls
+    assert all('error' not in page for page in pages)
+    # 마지막 이미지는 10KB 미만 아이콘이라 제외
+    assert all(page['image_count'] == IMAGES_PER_PAGE - 1 for page in pages)
+
+
+def test_per_host_limits_respected(site):
+    """한 호스트에 보내는 동시 요청 수와 초당 요청 수가 설정을 넘지 않음"""
+    handler, base_url = site(latency=0.05)
+    urls = [f"{base_url}/page/{i}" for i in range(6)]
+    per_host_rate, per_host_concurrency = 10.0, 2
+
+    pages = list(iter_crawl_pages(urls, concurrency=8, per_host_rate=per_host_rate,
+                                  per_host_concurrency=per_host_concurrency))
+
+    assert all('error' not in page for page in pages)
+    assert handler.stats['requests'] == len(urls) * (1 + IMAGES_PER_PAGE)
+    assert handler.stats['max_active'] <= per_host_concurrency
+    # 1초 구간의 양 끝이 모두 포함되므로 최대 rate + 1회
+    assert max_requests_per_second(handler.request_times) <= per_host_rate + 1
+
+
+def test_429_backs_off_and_honours_retry_after(site):
+    """429를 받으면 속도를 줄이고 Retry-After 동안 그 호스트에 요청하지 않은 뒤 다시 시도"""
+    retry_after = 1.0
+    handler, base_url = site(latency=0.01, max_rate=3, retry_after=retry_after)
+    urls = [f"{base_url}/page/{i}" for i in range(10)]
+    per_host_rate = 20.0
+
+    async def fetch_all():
+        async with CrawlClient(concurrency=1, per_host_rate=per_host_rate,
+                               per_host_concurrency=1) as client:
+            statuses = [(await client.get(url)).status_code for url in urls]
+            return statuses, client.stats()
+
+    statuses, stats = asyncio.run(fetch_all())
+
+    assert statuses == [200] * len(urls)
+    assert handler.stats['throttled'] > 0
+    host_stats = next(iter(stats.values()))
+    assert host_stats['backoffs'] > 0
+    assert host_stats['rate'] < per_host_rate
+
+    # 429를 받은 뒤 다음 요청은 Retry-After가 지나서 도착 (동시 요청 1개라 순서대로)
+    times = sorted(handler.request_times)
+    for throttled in handler.throttled_times:
+        following = times[bisect.bisect_right(times, throttled):]
+        assert following and following[0] >= throttled + retry_after
+
+
+def test_304_served_from_cache(site, tmp_path):
+    """다시 크롤링하면 바뀌지 않은 페이지/이미지는 304 → 저장된 본문의 200으로 바뀌고 unchanged 표시"""
+    handler, base_url = site(latency=0.0)
+    urls = [f"{base_url}/page/{i}" for i in range(4)]
+    http_cache = HttpCache(str(tmp_path / "crawl_cache.sqlite3"))
+    settings = dict(concurrency=8, per_host_rate=100, per_host_concurrency=8,
+                    http_cache=http_cache)
+    try:
+        first = list(iter_crawl_pages(urls, **settings))
+        handler.revisions[1] += 1
+        requests_before = handler.stats['requests']
+        second = list(iter_crawl_pages(urls, **settings))
+        requests = handler.stats['requests'] - requests_before
+        not_modified = handler.stats['not_modified']
+
+        async def fetch(url):
+            async with CrawlClient(http_cache=http_cache) as client:
+                return await client.get(url)
+
+        response = asyncio.run(fetch(urls[0]))
+    finally:
+        http_cache.close()
+
+    assert [page['unchanged'] for page in first] == [False] * len(urls)
+    assert [page['unchanged'] for page in second] == [i != 1 for i in range(len(urls))]
+    for i, (before, after) in enumerate(zip(first, second)):
+        assert after['images'] == before['images']
+        assert (after['text'] == before['text']) == (i != 1)
+    assert "수정 1" in second[1]['text']
+
+    # 두 번째 크롤링에서 본문을 다시 받은 요청은 수정한 페이지 하나뿐
+    assert requests == len(urls) * (1 + IMAGES_PER_PAGE)
+    assert not_modified == requests - 1
+
+    assert response.status_code == 200
+    assert is_not_modified(response)
+    assert response.content == page_html(0).encode('utf-8')
@@ -0,0 +1,52 @@
+"""한국어 문장 단위 토큰 청커 (korean_chunker) - 청크 토큰 예산"""
+
+import random
+import re
+
+import pytest
+
+from bench_chunker import make_document
+from korean_chunker import KoreanSentenceChunker
+from tokenizer import count_tokens
+
+WORDS = ["수강신청", "기간은", "다음과", "같습니다", "장학금", "학생지원팀", "2024.", "3.",
+         "(화)", "10:00", "~", "https://www.dyu.ac.kr/notice?id=1234", "A"]
+
+
+def make_hard_document(rng: random.Random) -> str:
+    """공백 없는 긴 줄, 이어지는 제목, 구분선, 짧은 표가 섞인 문서 (예산 경계가 자주 걸림)"""
+    parts = []
+    for _ in range(rng.randrange(2, 12)):
+        kind = rng.randrange(5)
+        if kind == 0:
+            parts.append(" ".join(rng.choices(WORDS, k=rng.randrange(1, 40))) + " 바랍니다.")
+        elif kind == 1:
+            parts.append("".join(rng.choices(WORDS, k=rng.randrange(5, 80))))
+        elif kind == 2:
+            parts.append(f"## {rng.choice(WORDS)}")
+        elif kind == 3:
+            parts.append("=" * rng.randrange(3, 10))
+        else:
+            parts.append("\n".join("| " + " | ".join(rng.choices(WORDS, k=rng.randrange(1, 6))) + " |"
+                                   for _ in range(rng.randrange(1, 6))))
+    return rng.choice(["\n\n", "\n", " "]).join(parts)
+
+
+def documents(count: int):
+    rng = random.Random(0)
+    for i in range(count):
+        text = make_document(rng, i)
+        yield text
+        yield re.sub(r'\s+', ' ', text)  # clean_html 결과처럼 공백 압축
+        yield make_hard_document(rng)
+
+
+@pytest.mark.parametrize("chunk_tokens", [20, 40, 100, 400])
+def test_chunks_within_token_budget(chunk_tokens):
+    """조각 사이 공백/줄바꿈까지 포함한 청크 토큰 수가 chunk_tokens를 넘지 않음"""
+    chunker = KoreanSentenceChunker(chunk_tokens=chunk_tokens,
+                                    chunk_overlap_tokens=chunk_tokens // 5)
+    for text in documents(200):
+        for start, chunk in chunker.split_text_spans(text):
+            assert text[start:start + len(chunk)] == chunk  # 원문의 연속 구간
+            assert count_tokens(chunk) <= chunk_tokens, chunk
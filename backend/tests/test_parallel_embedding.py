@@ -0,0 +1,95 @@
+"""병렬 배치 임베딩 (parallel_embedding) - 가짜 OpenAI 서버 상대"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import Embeddings
+from langchain_openai import OpenAIEmbeddings
+
+from fake_openai_server import fake_vector, start_fake_server
+from parallel_embedding import TokenRateLimiter, embed_batches_concurrently
+
+DIM = 16
+
+
+class CountingEmbeddings(Embeddings):
+    """embed_documents 호출 시작 수를 세는 래퍼"""
+
+    def __init__(self, embeddings: Embeddings):
+        self.embeddings = embeddings
+        self.started = 0
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts):
+        with self._lock:
+            self.started += 1
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text):
+        return self.embeddings.embed_query(text)
+
+
+def make_embeddings(base_url: str) -> OpenAIEmbeddings:
+    # 길이 검사(tiktoken 인코딩 다운로드 필요)를 끄면 텍스트마다 그대로 전송되어
+    # 기대 벡터를 fake_vector로 계산할 수 있음
+    return OpenAIEmbeddings(model="text-embedding-3-small", base_url=base_url, api_key="fake",
+                            check_embedding_ctx_length=False, max_retries=10)
+
+
+def make_batches(count: int, size: int):
+    return [[f"{b}번 배치 {i}번 청크: 수강신청 기간 안내" for i in range(size)]
+            for b in range(count)]
+
+
+@pytest.fixture
+def fake_server():
+    server, base_url = start_fake_server(latency=0.02, per_item_latency=0.0, dim=DIM,
+                                         rate_limit_rate=0.3)
+    yield server, base_url
+    server.shutdown()
+
+
+def test_results_in_input_order_with_429_retries(fake_server):
+    """429를 재시도해도 벡터가 빠지거나 중복되지 않고 입력 순서대로 나옴"""
+    server, base_url = fake_server
+    stats = server.RequestHandlerClass.stats
+    batches = make_batches(24, 5)
+
+    results = list(embed_batches_concurrently(make_embeddings(base_url), batches, max_workers=4))
+
+    assert [index for index, _ in results] == list(range(len(batches)))
+    for (_, vectors), texts in zip(results, batches):
+        expected = [fake_vector(text, DIM) for text in texts]
+        np.testing.assert_allclose(vectors, expected, atol=1e-6)
+    assert stats['rate_limited'] > 0
+    # 처리된 요청은 텍스트마다 정확히 한 번 (429로 거절된 요청은 rate_limited에만 집계)
+    assert stats['requests'] == stats['inputs'] == sum(len(batch) for batch in batches)
+
+
+def test_max_in_flight_respected(fake_server):
+    """동시 요청은 max_workers개, 받아 가지 않은 배치는 max_workers * 2개까지만 진행"""
+    server, base_url = fake_server
+    stats = server.RequestHandlerClass.stats
+    embeddings = CountingEmbeddings(make_embeddings(base_url))
+    max_workers = 3
+
+    consumed = 0
+    for _ in embed_batches_concurrently(embeddings, make_batches(30, 2), max_workers=max_workers):
+        consumed += 1
+        # 소비가 느려도 결과를 기다리는 배치는 제한됨
+        assert embeddings.started - consumed < max_workers * 2
+        time.sleep(0.01)
+
+    assert consumed == 30
+    assert stats['max_active'] <= max_workers
+
+
+def test_token_rate_limiter_waits_when_bucket_empty():
+    """버킷을 다 쓰면 충전될 때까지 대기"""
+    limiter = TokenRateLimiter(tokens_per_minute=6000)  # 초당 100토큰
+    limiter.acquire(6000)
+    start = time.monotonic()
+    limiter.acquire(20)
+    assert time.monotonic() - start >= 0.15
@@ -0,0 +1,46 @@
+"""flat 벡터 백엔드 (vector_backends) - 저장 디렉토리 확인"""
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from vector_backends import FlatVectorStore
+
+
+class ConstantEmbeddings(Embeddings):
+    """차원 4의 고정 벡터 (디렉토리 확인만 하므로 값은 상관없음)"""
+
+    def embed_documents(self, texts):
+        return [[1.0, 0.0, 0.0, 0.0] for _ in texts]
+
+    def embed_query(self, text):
+        return [1.0, 0.0, 0.0, 0.0]
+
+
+def test_new_or_empty_directory_opens_empty(tmp_path):
+    """디렉토리가 없거나 비어 있으면 빈 저장소"""
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    for path in (tmp_path / "missing", empty):
+        assert FlatVectorStore(str(path), ConstantEmbeddings()).count() == 0
+
+
+def test_chroma_directory_is_rejected(tmp_path):
+    """Chroma 벡터 DB를 flat으로 열면 빈 색인 대신 오류"""
+    (tmp_path / "chroma.sqlite3").write_bytes(b"")
+    with pytest.raises(ValueError, match="Chroma"):
+        FlatVectorStore(str(tmp_path), ConstantEmbeddings())
+
+
+def test_directory_without_manifest_is_rejected(tmp_path):
+    """manifest 없이 파일만 남은 디렉토리 (저장 중 중단) 는 오류"""
+    (tmp_path / "vectors-0001.npy").write_bytes(b"")
+    with pytest.raises(ValueError, match="manifest.json"):
+        FlatVectorStore(str(tmp_path), ConstantEmbeddings())
+
+
+def test_persisted_store_reopens(tmp_path):
+    """저장한 저장소는 manifest로 다시 열림"""
+    store = FlatVectorStore(str(tmp_path), ConstantEmbeddings())
+    store.add_texts(["수강신청 안내"], metadatas=[{'chunk_id': 'a'}], ids=['a'])
+    store.persist()
+    assert FlatVectorStore(str(tmp_path), ConstantEmbeddings()).count() == 1
@@ -0,0 +1,65 @@
+"""
+토큰 수 계산 유틸리티
+
+OpenAI 모델과 같은 인코딩(cl100k_base)으로 토큰 수를 셉니다.
+tiktoken을 불러올 수 없는 환경에서는 UTF-8 바이트 길이로 근사하며, 이 경우 컨텍스트 예산과
+청크 크기 계산이 달라지므로 처음 사용할 때 경고를 출력합니다.
+"""
+
+from functools import lru_cache
+from typing import List
+
+try:
+    import tiktoken
+except ImportError:  # requirements.txt에 있지만 없는 환경도 지원
+    tiktoken = None
+
+
+@lru_cache(maxsize=None)
+def _get_encoding():
+    """cl100k_base 인코딩 (최초 1회만 로드, 실패하면 경고 후 None)"""
+    if tiktoken is None:
+        reason = "tiktoken이 설치되어 있지 않습니다 (pip install -r requirements.txt)"
+    else:
+        try:
+            return tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            # 인코딩 파일 다운로드 실패 등 (오프라인 환경)
+            reason = f"cl100k_base 인코딩을 불러오지 못했습니다 ({e.__class__.__name__}: {e})"
+    print(f"⚠️ {reason}\n"
+          f"⚠️ 토큰 수를 UTF-8 바이트 길이로 근사합니다 - 컨텍스트 예산과 청크 크기가 "
+          f"실제 토큰 수와 달라질 수 있습니다.")
+    return None
+
+
+def count_tokens(text: str) -> int:
+    """
+    텍스트의 토큰 수 계산
+
+    Args:
+        text: 입력 텍스트
+
+    Returns:
+        토큰 수 (tiktoken이 없으면 근사값)
+    """
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    # 한글 1글자(3바이트)가 대략 1~2토큰, 영문은 4글자당 1토큰 정도
+    return max(1, len(text.encode('utf-8')) // 3) if text else 0
+
+
+def count_tokens_batch(texts: List[str]) -> List[int]:
+    """
+    여러 텍스트의 토큰 수 계산 (tiktoken이 있으면 여러 스레드로 한 번에 인코딩)
+
+    Args:
+        texts: 입력 텍스트 리스트
+
+    Returns:
+        텍스트별 토큰 수
+    """
+    encoding = _get_encoding()
+    if encoding is not None:
+        return [len(tokens) for tokens in encoding.encode_ordinary_batch(texts)]
+    return [max(1, len(text.encode('utf-8')) // 3) if text else 0 for text in texts]
@@ -0,0 +1,835 @@
+"""
+벡터스토어 백엔드
+
+RAGSystem이 사용하는 벡터스토어 구현을 모아 둔 모듈입니다.
+모든 백엔드는 LangChain VectorStore 인터페이스에 더해 다음 메서드를 제공합니다.
+
+- upsert_embeddings(ids, embeddings, metadatas, documents): 미리 계산한 벡터 저장
+- persist(): 변경 내용을 디스크에 반영
+- get(ids=None, include=...): Chroma와 같은 형식의 딕셔너리 반환
+- delete(ids): 삭제
+- count(): 저장된 청크 수
+
+백엔드 종류:
+- "chroma": ChromaDB (기본값)
+- "flat": 메모리 매핑된 .npy 행렬 + 메타데이터 사이드카, 정확한 전수 검색
+  (precision="float16"/"int8"이면 압축 벡터로 후보를 찾고 float32로 재채점)
+- "ivf": flat과 같은 파일 + IVF 색인(ann_index), nlist/nprobe로 recall과 지연 조절
+"""
+
+import json
+import mmap
+import os
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from langchain_community.vectorstores import Chroma
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from ann_index import IVFIndex
+from index_snapshot import IndexSnapshot, Section
+
+# 지원하는 백엔드
+VECTOR_BACKENDS = ("chroma", "flat", "ivf")
+
+# flat 백엔드의 검색용 벡터 정밀도
+VECTOR_PRECISIONS = ("float32", "float16", "int8")
+
+# 압축 벡터로 점수를 계산할 때 한 번에 float32로 변환할 행 수
+_SCAN_BLOCK_ROWS = 8192
+
+
+def quantize(vectors: np.ndarray, precision: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    벡터 압축
+
+    Args:
+        vectors: (N, D) float32 정규화 벡터
+        precision: "float16" 또는 "int8" (벡터별 스케일을 쓰는 대칭 스칼라 양자화)
+
+    Returns:
+        (압축 벡터, int8인 경우 벡터별 float32 스케일 / 그 외 None)
+    """
+    if precision == "float16":
+        return vectors.astype(np.float16), None
+
+    max_abs = np.abs(vectors).max(axis=1) if len(vectors) else np.zeros(0, dtype=np.float32)
+    scales = np.where(max_abs > 0, max_abs / 127.0, 1.0).astype(np.float32)
+    codes = np.rint(vectors / scales[:, None]).clip(-127, 127).astype(np.int8)
+    return codes, scales
+
+
+class ChromaStore(Chroma):
+    """공통 백엔드 메서드를 추가한 Chroma"""
+
+    def upsert_embeddings(self, ids: List[str], embeddings: List[List[float]],
+                          metadatas: List[dict], documents: List[str]) -> None:
+        """미리 계산한 임베딩을 컬렉션에 직접 기록"""
+        self._collection.upsert(
+            ids=ids,
+            embeddings=embeddings,
+            metadatas=metadatas,
+            documents=documents
+        )
+
+    def count(self) -> int:
+        """저장된 청크 수"""
+        return self._collection.count()
+
+    def persist(self) -> None:
+        """Chroma 0.4부터는 쓰기와 동시에 저장되므로 할 일 없음"""
+
+
+class FlatVectorStore(VectorStore):
+    """
+    NumPy 전수 검색 벡터스토어
+
+    정규화된 임베딩을 (N, D) float32 .npy 파일에 저장하고 읽기 전용
+    메모리 매핑으로 엽니다. 청크 ID, 본문, 메타데이터는 JSONL 사이드카에 두고
+    검색 결과에 필요한 줄만 읽습니다. 여러 프로세스가 같은 파일을 열면
+    OS 페이지 캐시를 공유하므로 메모리를 한 번만 사용합니다.
+
+    변경(upsert/delete)은 메모리에 모았다가 persist()에서 새 파일로 기록하고
+    manifest.json을 원자적으로 교체합니다.
+
+    precision이 "float16"(절반) 또는 "int8"(약 1/4)이면 압축 벡터 파일을 함께 저장하고,
+    전체 검색은 압축 벡터로 한 뒤 상위 후보만 float32 벡터로 다시 채점합니다.
+    float32 파일은 후보 행만 읽히므로 상주 메모리는 압축 벡터 크기에 가깝습니다.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, persist_directory: str, embedding_function: Embeddings,
+                 precision: str = "float32", rescore_factor: int = 10,
+                 snapshot: Optional[IndexSnapshot] = None):
+        """
+        초기화 (디렉토리에 저장된 인덱스가 있으면 로드, 없거나 빈 디렉토리면 빈 저장소)
+
+        Args:
+            persist_directory: 저장 디렉토리
+            embedding_function: 질의/문서 임베딩 모델
+            precision: 검색용 벡터 정밀도 ("float32", "float16", "int8")
+            rescore_factor: 압축 검색 시 k * rescore_factor개 후보를 float32로 재채점 (0이면 재채점 안 함)
+            snapshot: 주어지면 디렉토리 대신 스냅샷 파일에서 읽기 전용으로 로드
+
+        Raises:
+            ValueError: 지원하지 않는 정밀도이거나, 디렉토리에 manifest 없이 다른 파일이 있는 경우
+        """
+        if precision not in VECTOR_PRECISIONS:
+            raise ValueError(f"❌ 지원하지 않는 벡터 정밀도입니다: {precision}")
+
+        self.persist_directory = persist_directory
+        self._embedding_function = embedding_function
+        self.precision = precision
+        self.rescore_factor = rescore_factor
+        self._snapshot = snapshot
+
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        self._ids: List[str] = []
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._records: Any = b""  # JSONL 사이드카 (mmap 또는 bytes)
+        self._row_of_id: Optional[Dict[str, int]] = None
+        self._pending: Optional[Dict[str, Any]] = None  # 저장 전 변경 내용
+        self._compact: Optional[np.ndarray] = None  # 압축 벡터 (float16/int8)
+        self._scales: Optional[np.ndarray] = None   # int8 벡터별 스케일
+        # 저장된 파일이 현재 설정(정밀도 등)과 달라 메모리에서 다시 만든 부분이 있는지
+        self.stale = False
+
+        self._load()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding_function
+
+    # ---------- 저장/로드 ----------
+
+    def _load(self) -> None:
+        """manifest가 가리키는 파일을 메모리 매핑으로 열기"""
+        self.stale = False
+        if self._snapshot is not None:
+            self._load_snapshot(self._snapshot)
+            return
+
+        manifest_path = os.path.join(self.persist_directory, self.MANIFEST)
+        if not os.path.exists(manifest_path):
+            self._check_new_directory()
+            return
+
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+        def path(name: str) -> str:
+            return os.path.join(self.persist_directory, manifest[name])
+
+        self._vectors = np.load(path('vectors'), mmap_mode='r')
+        self._offsets = np.load(path('offsets'))
+        with open(path('ids'), 'r', encoding='utf-8') as f:
+            self._ids = json.load(f)
+
+        with open(path('records'), 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            self._records = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._row_of_id = None
+
+        self._use_compact(
+            manifest.get('precision'),
+            lambda: (np.load(path('compact'), mmap_mode='r'),
+                     np.load(path('scales')) if 'scales' in manifest else None))
+
+        self._load_extra(manifest)
+
+    def _check_new_directory(self) -> None:
+        """
+        manifest가 없을 때 새 저장소로 써도 되는 디렉토리인지 확인 (없거나 비어 있어야 함)
+
+        Raises:
+            ValueError: 다른 백엔드(Chroma)의 벡터 DB이거나 저장 중 중단된 디렉토리인 경우
+        """
+        if not os.path.isdir(self.persist_directory) or not os.listdir(self.persist_directory):
+            return
+        if os.path.exists(os.path.join(self.persist_directory, 'chroma.sqlite3')):
+            raise ValueError(f"❌ {self.persist_directory}는 Chroma 벡터 DB입니다. "
+                             f"vector_backend='chroma'로 열거나 다른 경로에 새로 생성하세요.")
+        raise ValueError(f"❌ {self.persist_directory}에 {self.MANIFEST}가 없습니다 "
+                         f"(저장 중 중단되었거나 다른 형식의 디렉토리). "
+                         f"디렉토리를 지우고 다시 생성하세요.")
+
+    def _load_snapshot(self, snapshot: IndexSnapshot) -> None:
+        """스냅샷 섹션을 복사 없이 사용 (본문은 파일 전체 매핑에서 바로 읽음)"""
+        self._vectors = snapshot.array('vectors')
+        self._offsets = snapshot.array('offsets') + snapshot.sections['records']['offset']
+        self._ids = json.loads(snapshot.section_bytes('ids'))
+        self._records = snapshot.buffer()
+        self._row_of_id = None
+
+        self._use_compact(
+            snapshot.metadata.get('precision'),
+            lambda: (snapshot.array('compact'),
+                     snapshot.array('scales') if 'scales' in snapshot else None))
+
+        self._load_snapshot_extra(snapshot)
+
+    def _use_compact(self, stored_precision: Optional[str],
+                     load: Callable[[], Tuple[np.ndarray, Optional[np.ndarray]]]) -> None:
+        """
+        검색용 압축 벡터 설정
+
+        Args:
+            stored_precision: 저장된 압축 벡터의 정밀도
+            load: 저장된 (압축 벡터, 스케일)을 여는 함수
+        """
+        self._compact, self._scales = None, None
+        if self.precision == "float32":
+            return
+        if stored_precision == self.precision:
+            self._compact, self._scales = load()
+        else:
+            # 다른 정밀도로 저장된 인덱스는 메모리에서 압축 (다음 persist부터 파일로 저장)
+            self._compact, self._scales = quantize(np.asarray(self._vectors), self.precision)
+            self.stale = True
+
+    def _load_snapshot_extra(self, snapshot: IndexSnapshot) -> None:
+        """하위 클래스가 스냅샷의 추가 색인 섹션을 여는 지점"""
+
+    def _load_extra(self, manifest: Dict[str, str]) -> None:
+        """하위 클래스가 추가 색인 파일을 여는 지점"""
+
+    def _persist_extra(self, vectors: np.ndarray, suffix: str) -> Dict[str, str]:
+        """
+        하위 클래스가 추가 색인 파일을 기록하는 지점
+
+        Args:
+            vectors: 저장할 (N, D) float32 행렬
+            suffix: 이번 저장의 파일 이름 접미사
+
+        Returns:
+            manifest에 추가할 {키: 파일 이름}
+        """
+        return {}
+
+    def persist(self) -> None:
+        """메모리의 변경 내용을 새 파일로 기록하고 manifest 교체"""
+        if self._pending is None:
+            return
+
+        os.makedirs(self.persist_directory, exist_ok=True)
+        suffix = uuid.uuid4().hex[:8]
+        names = {
+            'vectors': f"vectors-{suffix}.npy",
+            'offsets': f"offsets-{suffix}.npy",
+            'ids': f"ids-{suffix}.json",
+            'records': f"records-{suffix}.jsonl",
+        }
+
+        ids = self._pending['ids']
+        records = self._pending['records']
+        vectors = self._matrix()
+        offsets = np.zeros(len(records) + 1, dtype=np.int64)
+        np.cumsum([len(record) for record in records], out=offsets[1:])
+
+        def path(name: str) -> str:
+            return os.path.join(self.persist_directory, names[name])
+
+        np.save(path('vectors'), vectors)
+        np.save(path('offsets'), offsets)
+        if self.precision != "float32":
+            names['precision'] = self.precision
+            names['compact'] = f"vectors-{self.precision}-{suffix}.npy"
+            compact, scales = quantize(vectors, self.precision)
+            np.save(path('compact'), compact)
+            if scales is not None:
+                names['scales'] = f"scales-{suffix}.npy"
+                np.save(path('scales'), scales)
+        names.update(self._persist_extra(vectors, suffix))
+        with open(path('ids'), 'w', encoding='utf-8') as f:
+            json.dump(ids, f)
+        with open(path('records'), 'wb') as f:
+            f.writelines(records)
+
+        # manifest 교체 후 이전 파일 삭제 (이미 열려 있는 매핑은 계속 유효)
+        manifest_path = os.path.join(self.persist_directory, self.MANIFEST)
+        old_files = []
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                old_files = [name for key, name in json.load(f).items() if key != 'precision']
+        tmp_path = manifest_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(names, f)
+        os.replace(tmp_path, manifest_path)
+        for name in old_files:
+            try:
+                os.remove(os.path.join(self.persist_directory, name))
+            except OSError:
+                pass
+
+        self._pending = None
+        self._load()
+
+    def rewrite(self) -> None:
+        """
+        현재 설정으로 파일을 다시 기록
+
+        stale일 때 호출하면 이후 로드하는 프로세스는 메모리에서 다시 만들지 않고
+        파일을 그대로 메모리 매핑합니다.
+        """
+        self._begin_write()
+        self.persist()
+
+    def _record(self, row: int) -> Tuple[str, dict]:
+        """행 번호의 (본문, 메타데이터)"""
+        if self._pending is not None:
+            record = self._pending['records'][row]
+        else:
+            record = self._records[self._offsets[row]:self._offsets[row + 1]]
+        data = json.loads(record)
+        return data['document'], data['metadata']
+
+    def _rows(self) -> Dict[str, int]:
+        """청크 ID → 행 번호 (처음 필요할 때 생성)"""
+        if self._row_of_id is None:
+            self._row_of_id = {chunk_id: row for row, chunk_id in enumerate(self._ids)}
+        return self._row_of_id
+
+    def _begin_write(self) -> Dict[str, Any]:
+        """변경을 위해 현재 내용을 메모리로 복사"""
+        if self._snapshot is not None:
+            raise ValueError("❌ 스냅샷으로 연 벡터스토어는 변경할 수 없습니다.")
+        if self._pending is None:
+            self._pending = {
+                'ids': list(self._ids),
+                'records': [self._records[self._offsets[i]:self._offsets[i + 1]]
+                            for i in range(len(self._ids))],
+                'appended': [],  # 추가된 벡터 배치 (필요할 때 한 번에 합침)
+            }
+            self._vectors = np.array(self._vectors, dtype=np.float32)
+            self._ids = self._pending['ids']
+        return self._pending
+
+    def _matrix(self) -> np.ndarray:
+        """(N, D) 벡터 행렬 (추가 대기 중인 배치가 있으면 합침)"""
+        if self._pending is not None and self._pending['appended']:
+            parts = self._pending['appended']
+            if self._vectors.size:
+                parts = [self._vectors] + parts
+            self._vectors = np.concatenate(parts)
+            self._pending['appended'] = []
+        return self._vectors
+
+    # ---------- 공통 백엔드 메서드 ----------
+
+    def upsert_embeddings(self, ids: List[str], embeddings: List[List[float]],
+                          metadatas: List[dict], documents: List[str]) -> None:
+        """
+        미리 계산한 임베딩 저장 (같은 ID는 덮어씀)
+
+        변경 내용은 persist() 호출 시 파일에 기록됩니다.
+        """
+        if not ids:
+            return
+        pending = self._begin_write()
+        rows = self._rows()
+
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms > 0, norms, 1)
+
+        new_rows = []
+        for i, chunk_id in enumerate(ids):
+            record = (json.dumps({'document': documents[i], 'metadata': metadatas[i] or {}},
+                                 ensure_ascii=False) + "\n").encode('utf-8')
+            row = rows.get(chunk_id)
+            if row is None:
+                rows[chunk_id] = len(pending['ids'])
+                pending['ids'].append(chunk_id)
+                pending['records'].append(record)
+                new_rows.append(i)
+            else:
+                pending['records'][row] = record
+                self._matrix()[row] = vectors[i]
+
+        if new_rows:
+            pending['appended'].append(vectors[new_rows])
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> None:
+        """청크 삭제"""
+        if not ids:
+            return
+        pending = self._begin_write()
+        rows = self._rows()
+
+        drop = {rows[chunk_id] for chunk_id in ids if chunk_id in rows}
+        if not drop:
+            return
+        keep = [row for row in range(len(pending['ids'])) if row not in drop]
+        pending['ids'] = [pending['ids'][row] for row in keep]
+        pending['records'] = [pending['records'][row] for row in keep]
+
+        self._ids = pending['ids']
+        self._vectors = self._matrix()[keep]
+        self._row_of_id = None
+
+    def count(self) -> int:
+        """저장된 청크 수"""
+        return len(self._ids)
+
+    def get(self, ids: Optional[List[str]] = None,
+            include: Iterable[str] = ("documents", "metadatas")) -> Dict[str, Any]:
+        """
+        청크 조회 (Chroma.get과 같은 형식)
+
+        Args:
+            ids: 조회할 청크 ID (None이면 전체)
+            include: "documents", "metadatas", "embeddings" 중 포함할 항목
+
+        Returns:
+            ids와 include에 지정한 항목 리스트를 담은 딕셔너리
+        """
+        if ids is None:
+            rows = list(range(len(self._ids)))
+        else:
+            row_of_id = self._rows()
+            rows = [row_of_id[chunk_id] for chunk_id in ids if chunk_id in row_of_id]
+
+        result: Dict[str, Any] = {'ids': [self._ids[row] for row in rows]}
+        include = set(include)
+        if include & {"documents", "metadatas"}:
+            records = [self._record(row) for row in rows]
+            if "documents" in include:
+                result['documents'] = [document for document, _ in records]
+            if "metadatas" in include:
+                result['metadatas'] = [metadata for _, metadata in records]
+        if "embeddings" in include:
+            result['embeddings'] = np.asarray(self._matrix()[rows])
+        return result
+
+    # ---------- VectorStore 인터페이스 ----------
+
+    def add_texts(self, texts: Iterable[str], metadatas: Optional[List[dict]] = None,
+                  ids: Optional[List[str]] = None, **kwargs: Any) -> List[str]:
+        texts = list(texts)
+        ids = ids or [uuid.uuid4().hex for _ in texts]
+        metadatas = metadatas or [{} for _ in texts]
+        self.upsert_embeddings(ids, self._embedding_function.embed_documents(texts),
+                               metadatas, texts)
+        self.persist()
+        return ids
+
+    @classmethod
+    def from_texts(cls, texts: List[str], embedding: Embeddings,
+                   metadatas: Optional[List[dict]] = None,
+                   persist_directory: str = "vectorstore", **kwargs: Any) -> "FlatVectorStore":
+        store = cls(persist_directory=persist_directory, embedding_function=embedding)
+        store.add_texts(texts, metadatas, ids=kwargs.get('ids'))
+        return store
+
+    def _compact_scores(self, query: np.ndarray,
+                        rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """압축 벡터로 근사 점수 계산 (rows가 None이면 전체, 블록 단위로 float32 변환)"""
+        n_rows = len(self._compact) if rows is None else len(rows)
+        scores = np.empty(n_rows, dtype=np.float32)
+        for start in range(0, n_rows, _SCAN_BLOCK_ROWS):
+            if rows is None:
+                block = self._compact[start:start + _SCAN_BLOCK_ROWS]
+            else:
+                block = self._compact[rows[start:start + _SCAN_BLOCK_ROWS]]
+            scores[start:start + len(block)] = block.astype(np.float32) @ query
+        if self._scales is not None:
+            scores *= self._scales if rows is None else self._scales[rows]
+        return scores
+
+    def search_vector(self, embedding: List[float], k: int = 4) -> List[Tuple[int, float]]:
+        """
+        top-k 검색 (행렬곱 + argpartition)
+
+        float32에서는 정확 검색, 압축 정밀도에서는 압축 벡터로
+        k * rescore_factor개 후보를 고른 뒤 float32 벡터로 재채점합니다.
+
+        Args:
+            embedding: 질의 벡터
+            k: 결과 수
+
+        Returns:
+            (행 번호, 코사인 유사도) 리스트 - 유사도 내림차순
+        """
+        if len(self._ids) == 0:
+            return []
+        return self._search_rows(self._query_vector(embedding), k)
+
+    @staticmethod
+    def _query_vector(embedding: List[float]) -> np.ndarray:
+        """정규화된 float32 질의 벡터"""
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        return query / norm if norm > 0 else query
+
+    def _search_rows(self, query: np.ndarray, k: int,
+                     rows: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """
+        주어진 행 중에서 top-k 검색
+
+        Args:
+            query: 정규화된 질의 벡터
+            k: 결과 수
+            rows: 정렬된 후보 행 번호 (None이면 전체)
+
+        Returns:
+            (행 번호, 코사인 유사도) 리스트 - 유사도 내림차순
+        """
+        k = min(k, len(self._ids) if rows is None else len(rows))
+        if k <= 0:
+            return []
+
+        # 저장 전 변경 중에는 압축 벡터가 없으므로 float32로 검색
+        if self._compact is not None and self._pending is None:
+            approx = self._compact_scores(query, rows)
+            if self.rescore_factor <= 0:
+                top = np.argpartition(approx, len(approx) - k)[-k:]
+                top = top[np.argsort(-approx[top], kind='stable')]
+                row_of = top if rows is None else rows[top]
+                return [(int(row), float(score)) for row, score in zip(row_of, approx[top])]
+
+            n_candidates = min(len(approx), k * self.rescore_factor)
+            candidates = np.argpartition(approx, len(approx) - n_candidates)[-n_candidates:]
+            candidates.sort()  # 메모리 매핑 파일을 순서대로 읽도록 정렬
+            if rows is not None:
+                candidates = rows[candidates]
+            exact = self._vectors[candidates] @ query
+            top = np.argpartition(exact, len(exact) - k)[-k:]
+            top = top[np.argsort(-exact[top], kind='stable')]
+            return [(int(candidates[i]), float(exact[i])) for i in top]
+
+        if rows is None:
+            rows = np.arange(len(self._ids))
+            scores = self._matrix() @ query
+        else:
+            scores = self._matrix()[rows] @ query
+        top = np.argpartition(scores, len(scores) - k)[-k:]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(int(rows[i]), float(scores[i])) for i in top]
+
+    def memory_usage(self) -> Dict[str, Any]:
+        """
+        벡터 메모리 사용량
+
+        Returns:
+            precision, full_bytes(float32 행렬), search_bytes(검색 시 전체를 읽는 행렬),
+            saved_bytes, saved_ratio
+        """
+        full_bytes = int(self._matrix().nbytes)
+        search_bytes = full_bytes
+        if self._compact is not None:
+            search_bytes = int(self._compact.nbytes)
+            if self._scales is not None:
+                search_bytes += int(self._scales.nbytes)
+        return {
+            'precision': self.precision,
+            'full_bytes': full_bytes,
+            'search_bytes': search_bytes,
+            'saved_bytes': full_bytes - search_bytes,
+            'saved_ratio': 1 - search_bytes / full_bytes if full_bytes else 0.0,
+        }
+
+    def similarity_search_by_vector_with_score(
+            self, embedding: List[float], k: int = 4) -> List[Tuple[Document, float]]:
+        results = []
+        for row, score in self.search_vector(embedding, k):
+            document, metadata = self._record(row)
+            results.append((Document(page_content=document, metadata=metadata), score))
+        return results
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4,
+                                    **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k)]
+
+    def similarity_search_with_score(self, query: str, k: int = 4,
+                                     **kwargs: Any) -> List[Tuple[Document, float]]:
+        embedding = self._embedding_function.embed_query(query)
+        return self.similarity_search_by_vector_with_score(embedding, k)
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def _select_relevance_score_fn(self):
+        # 코사인 유사도(-1~1)를 0~1로 변환
+        return lambda score: (score + 1) / 2
+
+
+class IVFVectorStore(FlatVectorStore):
+    """
+    IVF 근사 검색 벡터스토어
+
+    FlatVectorStore와 같은 파일에 IVF 색인(ivf-*.npz)을 함께 저장하고,
+    질의와 가까운 nprobe개 리스트의 벡터만 채점합니다.
+    precision 압축/재채점은 후보 행에 그대로 적용됩니다.
+    저장 전 변경 중이거나 후보가 k개보다 적으면 전수 검색으로 대체합니다.
+    """
+
+    def __init__(self, persist_directory: str, embedding_function: Embeddings,
+                 precision: str = "float32", rescore_factor: int = 10,
+                 nlist: Optional[int] = None, nprobe: int = 8,
+                 train_iters: int = 10, sample_size: Optional[int] = None,
+                 snapshot: Optional[IndexSnapshot] = None):
+        """
+        초기화 (디렉토리에 저장된 인덱스가 있으면 로드)
+
+        Args:
+            persist_directory: 저장 디렉토리
+            embedding_function: 질의/문서 임베딩 모델
+            precision: 검색용 벡터 정밀도 ("float32", "float16", "int8")
+            rescore_factor: 압축 검색 시 k * rescore_factor개 후보를 float32로 재채점
+            nlist: IVF 리스트 수 (None이면 약 4 * sqrt(N))
+            nprobe: 검색 시 조회할 리스트 수
+            train_iters: k-means 반복 횟수
+            sample_size: k-means 학습 표본 수 (None이면 nlist * 32)
+            snapshot: 주어지면 디렉토리 대신 스냅샷 파일에서 읽기 전용으로 로드
+        """
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_iters = train_iters
+        self.sample_size = sample_size
+        self._ivf: Optional[IVFIndex] = None
+        super().__init__(persist_directory, embedding_function, precision, rescore_factor,
+                         snapshot)
+
+    @property
+    def ivf_index(self) -> Optional[IVFIndex]:
+        """저장된 행 순서와 일치하는 IVF 색인 (저장 전 변경 중이면 None)"""
+        return self._ivf if self._pending is None else None
+
+    def _build_ivf(self, vectors: np.ndarray) -> IVFIndex:
+        return IVFIndex.build(vectors, nlist=self.nlist, train_iters=self.train_iters,
+                              sample_size=self.sample_size, nprobe=self.nprobe)
+
+    def _load_extra(self, manifest: Dict[str, str]) -> None:
+        ivf = None
+        if 'ivf' in manifest:
+            ivf = IVFIndex.load(os.path.join(self.persist_directory, manifest['ivf']),
+                                self.nprobe)
+        self._use_ivf(ivf)
+
+    def _load_snapshot_extra(self, snapshot: IndexSnapshot) -> None:
+        ivf = None
+        if 'ivf/centroids' in snapshot:
+            ivf = IVFIndex(snapshot.array('ivf/centroids'), snapshot.array('ivf/list_offsets'),
+                           snapshot.array('ivf/list_rows'), self.nprobe)
+        self._use_ivf(ivf)
+
+    def _use_ivf(self, ivf: Optional[IVFIndex]) -> None:
+        """저장된 IVF 색인이 현재 설정과 맞으면 사용, 아니면 메모리에서 생성"""
+        self._ivf = None
+        if not self._ids:
+            return
+        if ivf is not None:
+            wanted = ivf.nlist if self.nlist is None else min(self.nlist, len(self._ids))
+            if ivf.nlist == wanted and len(ivf) == len(self._ids):
+                self._ivf = ivf
+                return
+        # 색인이 없거나 다른 nlist로 저장된 경우 메모리에서 생성 (다음 persist부터 파일로 저장)
+        self._ivf = self._build_ivf(self._vectors)
+        self.stale = True
+
+    def _persist_extra(self, vectors: np.ndarray, suffix: str) -> Dict[str, str]:
+        if len(vectors) == 0:
+            return {}
+        name = f"ivf-{suffix}.npz"
+        self._build_ivf(vectors).save(os.path.join(self.persist_directory, name))
+        return {'ivf': name}
+
+    def search_vector(self, embedding: List[float], k: int = 4) -> List[Tuple[int, float]]:
+        """
+        IVF 근사 top-k 검색
+
+        Args:
+            embedding: 질의 벡터
+            k: 결과 수
+
+        Returns:
+            (행 번호, 코사인 유사도) 리스트 - 유사도 내림차순
+        """
+        if len(self._ids) == 0:
+            return []
+        query = self._query_vector(embedding)
+        if self._ivf is None or self._pending is not None:
+            return self._search_rows(query, k)
+
+        rows = self._ivf.candidates(query, self.nprobe)
+        if len(rows) < k:
+            return self._search_rows(query, k)
+        return self._search_rows(query, k, rows)
+
+
+def open_vectorstore(backend: str, persist_directory: str,
+                     embedding_function: Embeddings,
+                     precision: str = "float32",
+                     index_params: Optional[Dict[str, Any]] = None) -> VectorStore:
+    """
+    백엔드 이름으로 벡터스토어 열기 (없으면 빈 저장소 생성)
+
+    Args:
+        backend: "chroma", "flat" 또는 "ivf"
+        persist_directory: 저장 디렉토리
+        embedding_function: 임베딩 모델
+        precision: flat/ivf 백엔드의 검색용 벡터 정밀도 ("float32", "float16", "int8")
+        index_params: ivf 백엔드의 빌드/검색 파라미터
+            (nlist, nprobe, train_iters, sample_size)
+
+    Returns:
+        벡터스토어 인스턴스
+
+    Raises:
+        ValueError: 지원하지 않는 백엔드이거나 백엔드가 지원하지 않는 정밀도인 경우
+    """
+    if backend == "chroma":
+        if precision != "float32":
+            raise ValueError("❌ chroma 백엔드는 float32 정밀도만 지원합니다.")
+        return ChromaStore(
+            persist_directory=persist_directory,
+            embedding_function=embedding_function
+        )
+    if backend == "flat":
+        return FlatVectorStore(
+            persist_directory=persist_directory,
+            embedding_function=embedding_function,
+            precision=precision
+        )
+    if backend == "ivf":
+        return IVFVectorStore(
+            persist_directory=persist_directory,
+            embedding_function=embedding_function,
+            precision=precision,
+            **(index_params or {})
+        )
+    raise ValueError(f"❌ 지원하지 않는 벡터스토어 백엔드입니다: {backend}")
+
+
+def open_snapshot_vectorstore(snapshot: IndexSnapshot, embedding_function: Embeddings,
+                              index_params: Optional[Dict[str, Any]] = None) -> VectorStore:
+    """
+    스냅샷 파일의 벡터스토어 열기 (백엔드와 정밀도는 스냅샷에 저장된 값 사용)
+
+    Args:
+        snapshot: 열린 스냅샷
+        embedding_function: 임베딩 모델
+        index_params: ivf 백엔드의 검색 파라미터 (예: {"nprobe": 16})
+
+    Returns:
+        읽기 전용 벡터스토어 인스턴스
+    """
+    backend = snapshot.metadata['backend']
+    precision = snapshot.metadata['precision']
+    if backend == "ivf":
+        params = dict(index_params or {})
+        params.setdefault('nlist', snapshot.metadata.get('nlist'))
+        return IVFVectorStore(snapshot.path, embedding_function, precision,
+                              snapshot=snapshot, **params)
+    return FlatVectorStore(snapshot.path, embedding_function, precision, snapshot=snapshot)
+
+
+def snapshot_sections(stored: Dict[str, Any], backend: str, precision: str,
+                      index_params: Optional[Dict[str, Any]] = None,
+                      ivf: Optional[IVFIndex] = None
+                      ) -> Tuple[Dict[str, Section], Dict[str, Any]]:
+    """
+    벡터스토어 내용을 스냅샷 섹션으로 변환 (FlatVectorStore 파일과 같은 형식)
+
+    Args:
+        stored: vectorstore.get(include=["documents", "metadatas", "embeddings"]) 결과
+        backend: 스냅샷 백엔드 ("flat" 또는 "ivf")
+        precision: 검색용 벡터 정밀도
+        index_params: ivf 백엔드의 빌드 파라미터 (nlist, train_iters, sample_size)
+        ivf: stored와 같은 행 순서로 이미 만든 IVF 색인 (있으면 다시 학습하지 않음)
+
+    Returns:
+        (섹션, 메타데이터)
+
+    Raises:
+        ValueError: 스냅샷으로 저장할 수 없는 백엔드/정밀도이거나 벡터스토어가 빈 경우
+    """
+    if not stored['ids']:
+        # 빈 스냅샷도 체크섬은 맞으므로 배포 전에 막음 (예: 다른 백엔드 경로를 잘못 지정)
+        raise ValueError("❌ 벡터스토어가 비어 있어 스냅샷을 만들 수 없습니다. "
+                         "벡터 DB 경로와 백엔드를 확인하세요.")
+    if backend not in ("flat", "ivf"):
+        raise ValueError(f"❌ 스냅샷은 flat/ivf 백엔드만 지원합니다: {backend}")
+    if precision not in VECTOR_PRECISIONS:
+        raise ValueError(f"❌ 지원하지 않는 벡터 정밀도입니다: {precision}")
+
+    vectors = np.asarray(stored['embeddings'], dtype=np.float32)
+    if vectors.ndim != 2:
+        vectors = vectors.reshape(len(stored['ids']), -1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = vectors / np.where(norms > 0, norms, 1)
+
+    records = [(json.dumps({'document': document, 'metadata': metadata or {}},
+                           ensure_ascii=False) + "\n").encode('utf-8')
+               for document, metadata in zip(stored['documents'], stored['metadatas'])]
+    offsets = np.zeros(len(records) + 1, dtype=np.int64)
+    np.cumsum([len(record) for record in records], out=offsets[1:])
+
+    sections: Dict[str, Section] = {
+        'vectors': vectors,
+        'offsets': offsets,
+        'ids': json.dumps(list(stored['ids'])).encode('utf-8'),
+        'records': b"".join(records),
+    }
+    metadata: Dict[str, Any] = {'backend': backend, 'precision': precision,
+                                'chunks': len(records),
+                                'dimension': int(vectors.shape[1]) if vectors.size else 0}
+    if precision != "float32":
+        compact, scales = quantize(vectors, precision)
+        sections['compact'] = compact
+        if scales is not None:
+            sections['scales'] = scales
+    if backend == "ivf" and len(vectors):
+        if ivf is None or len(ivf) != len(vectors):
+            params = {key: value for key, value in (index_params or {}).items()
+                      if key in ('nlist', 'train_iters', 'sample_size')}
+            ivf = IVFIndex.build(vectors, **params)
+        sections['ivf/centroids'] = ivf.centroids
+        sections['ivf/list_offsets'] = ivf.list_offsets
+        sections['ivf/list_rows'] = ivf.list_rows
+        metadata['nlist'] = ivf.nlist
+    return sections, metadata
@@ -6,7 +6,8 @@
 
 import streamlit as st
 import requests
-from typing import Dict, List, Any
+from typing import Dict, Iterator, List, Any, Tuple
+import json
 import time
 import os
 
@@ -20,45 +21,74 @@ st.set_page_config(
 
 # API 엔드포인트 (환경변수에서 읽기, 기본값은 localhost)
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
-API_URL = f"{API_BASE_URL}/chat"
-HEALTH_URL = f"{API_BASE_URL}/health"
+STREAM_URL = f"{API_BASE_URL}/chat/stream"
+READY_URL = f"{API_BASE_URL}/ready"
 
 
 def check_api_health() -> bool:
     """
-    API 서버 상태 확인
+    API 서버 상태 확인 (RAG 시스템 로드까지 끝났는지)
 
     Returns:
-        서버가 정상 작동하면 True, 아니면 False
+        서버가 질문을 받을 수 있으면 True, 아니면 False
     """
     try:
-        response = requests.get(HEALTH_URL, timeout=5)
+        response = requests.get(READY_URL, timeout=5)
         return response.status_code == 200
     except:
         return False
 
 
-def get_answer(question: str) -> Dict[str, Any]:
+def _parse_sse(response: requests.Response) -> Iterator[Tuple[str, Dict[str, Any]]]:
     """
-    API를 통해 답변 받기
+    server-sent events 응답을 (이벤트 이름, 데이터) 단위로 분리
+
+    Args:
+        response: stream=True로 받은 응답
+
+    Yields:
+        (이벤트 이름, JSON 데이터)
+    """
+    event, data_lines = "message", []
+    for line in response.iter_lines(decode_unicode=True):
+        if line:
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                data_lines.append(line[len("data:"):].strip())
+            continue
+        # 빈 줄 = 이벤트 끝
+        if data_lines:
+            yield event, json.loads("\n".join(data_lines))
+        event, data_lines = "message", []
+
+
+def stream_answer(question: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    API를 통해 답변을 스트리밍으로 받기
 
     Args:
         question: 사용자 질문
 
-    Returns:
-        답변과 출처를 포함한 딕셔너리
+    Yields:
+        ("sources", {"sources": [...]}) 다음 ("token", {"content": ...}) 여러 번,
+        마지막으로 ("done", {"answer": ...})
 
     Raises:
-        Exception: API 호출 실패 시
+        Exception: API 호출 실패 또는 서버가 error 이벤트를 보낸 경우
     """
     try:
-        response = requests.post(
-            API_URL,
+        with requests.post(
+            STREAM_URL,
             json={"question": question},
-            timeout=30
-        )
-        response.raise_for_status()
-        return response.json()
+            stream=True,
+            timeout=(5, 60)  # (연결, 토큰 사이 대기) 시간 제한
+        ) as response:
+            response.raise_for_status()
+            for event, data in _parse_sse(response):
+                if event == "error":
+                    raise Exception(f"API 오류: {data.get('detail')}")
+                yield event, data
     except requests.exceptions.ConnectionError:
         raise Exception("API 서버에 연결할 수 없습니다. FastAPI 서버가 실행 중인지 확인해주세요.")
     except requests.exceptions.Timeout:
@@ -66,8 +96,17 @@ def get_answer(question: str) -> Dict[str, Any]:
     except requests.exceptions.HTTPError as e:
         error_detail = e.response.json().get("detail", str(e))
         raise Exception(f"API 오류: {error_detail}")
-    except Exception as e:
-        raise Exception(f"알 수 없는 오류: {str(e)}")
+
+
+def render_sources(sources: List[Dict[str, Any]]) -> None:
+    """출처 문서 목록 표시"""
+    with st.expander("📚 참고 문서"):
+        for i, source in enumerate(sources, 1):
+            st.markdown(f"**{i}. {source['title']}**")
+            st.markdown(f"🔗 [{source['source']}]({source['source']})")
+            st.caption(source['content'])
+            if i < len(sources):
+                st.divider()
 
 
 def initialize_session_state():
@@ -130,21 +169,16 @@ def main():
             st.markdown(message["content"])
 
             # 출처 표시 (봇 메시지인 경우)
-            if message["role"] == "assistant" and "sources" in message:
-                with st.expander("📚 참고 문서"):
-                    for i, source in enumerate(message["sources"], 1):
-                        st.markdown(f"**{i}. {source['title']}**")
-                        st.markdown(f"🔗 [{source['source']}]({source['source']})")
-                        st.caption(source['content'])
-                        if i < len(message["sources"]):
-                            st.divider()
+            if message["role"] == "assistant" and message.get("sources"):
+                render_sources(message["sources"])
 
     # 사용자 입력
     if prompt := st.chat_input("질문을 입력하세요..."):
 
         # API 서버 상태 재확인
         if not check_api_health():
-            st.error("❌ API 서버에 연결할 수 없습니다. FastAPI 서버를 먼저 실행해주세요.")
+            st.error("❌ API 서버에 연결할 수 없거나 아직 준비 중입니다. "
+                     "FastAPI 서버가 실행 중인지 확인하고 잠시 후 다시 시도해주세요.")
             return
 
         # 사용자 메시지 표시
@@ -163,25 +197,23 @@ def main():
             message_placeholder.markdown("🤔 답변을 생성하는 중...")
 
             try:
-                # API 호출
-                with st.spinner("처리 중..."):
-                    result = get_answer(prompt)
-
-                # 답변 표시
-                answer = result["answer"]
-                sources = result["sources"]
+                # 스트리밍 API 호출 - 토큰이 도착할 때마다 답변 갱신
+                answer, sources = "", []
+                for event, data in stream_answer(prompt):
+                    if event == "sources":
+                        sources = data["sources"]
+                        message_placeholder.markdown("✍️ 답변을 작성하는 중...")
+                    elif event == "token":
+                        answer += data["content"]
+                        message_placeholder.markdown(answer + "▌")
+                    elif event == "done":
+                        answer = data["answer"]
 
                 message_placeholder.markdown(answer)
 
                 # 출처 표시
                 if sources:
-                    with st.expander("📚 참고 문서"):
-                        for i, source in enumerate(sources, 1):
-                            st.markdown(f"**{i}. {source['title']}**")
-                            st.markdown(f"🔗 [{source['source']}]({source['source']})")
-                            st.caption(source['content'])
-                            if i < len(sources):
-                                st.divider()
+                    render_sources(sources)
 
                 # 봇 메시지 저장
                 st.session_state.messages.append({